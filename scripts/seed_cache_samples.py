@@ -11,6 +11,9 @@ This makes LIVE Exa API calls (costs ~$0.30-0.50).
 Results are saved to cache_samples/<case_key>/ for offline demo.
 
 Do NOT run this in CI — it's a manual, one-time step.
+
+To warm another machine from an already-seeded cache without live calls,
+use `python -m war_room cache export` / `cache import` instead.
 """
 
 import json
@@ -126,7 +129,8 @@ def main():
     RELEVANT_PREFIXES = ("weather_", "carrier_", "caselaw_", "citecheck_")
     cache_dir_path = Path(cache_dir)
     if cache_dir_path.exists():
-        for f in cache_dir_path.glob("*.json"):
+        # Runtime entries live in hash-prefix shard dirs; samples stay flat.
+        for f in cache_dir_path.rglob("*.json"):
             if not any(f.name.startswith(p) for p in RELEVANT_PREFIXES):
                 continue
             dest = samples_dir / f.name
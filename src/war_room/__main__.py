@@ -1,7 +1,26 @@
-"""CLI entrypoint for `python -m war_room`."""
+"""CLI entrypoint for `python -m war_room`.
 
+    python -m war_room [--json]          resolve and print runtime settings
+    python -m war_room run <intake.json> run one intake end to end (see runner)
+    python -m war_room batch <dir|jsonl> run many intakes on a process pool (see batch)
+    python -m war_room cache <command>   cache maintenance (see cache_admin)
+"""
+
+import sys
+
+from war_room import cache_admin
 from war_room.bootstrap import main
 
 
 if __name__ == "__main__":
+    if sys.argv[1:2] == ["cache"]:
+        sys.exit(cache_admin.main(sys.argv[2:]))
+    if sys.argv[1:2] == ["run"]:
+        from war_room import runner
+
+        sys.exit(runner.main(sys.argv[2:]))
+    if sys.argv[1:2] == ["batch"]:
+        from war_room import batch
+
+        sys.exit(batch.main(sys.argv[2:]))
     main()
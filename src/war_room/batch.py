@@ -0,0 +1,431 @@
+"""Batch runs: every intake in a directory or JSONL file, on a process pool.
+
+    python -m war_room batch eval/intakes/ [--workers 4] [--budget 300] [--offline]
+    python -m war_room batch milton_claims.jsonl --batch-id milton-week1
+
+A directory contributes each `*.json` intake (names starting with `_`, such
+as the template, are skipped). A JSONL file contributes one intake per
+line; a line may carry a `case_key` next to the intake fields, otherwise
+the key is `<file stem>_<line number>`.
+
+Each intake runs in a worker process exactly as `python -m war_room run`
+would (see runner). Each worker keeps an EventWorkspace, so weather and
+carrier evidence is fetched once per scope per worker and reused by its
+later claimants. Workers share the runtime cache, and, with --budget,
+one SQLite budget ledger caps Exa searches across the whole batch. A bad
+or failing intake is recorded as a failure; the batch goes on. Intakes
+that hit the budget fail too, so a memo is never silently under-researched.
+
+State lives in RUNS_DIR/batch_<batch id>/:
+
+- results.jsonl: one summary row per finished intake, appended as it lands
+- records/: the full run record of each intake
+- budget.sqlite: the shared ledger, kept across resumes
+- summary.json: the consolidated summary, rewritten at the end of each run
+
+With --portfolio, the batch first merges the query plans of its pending
+intakes and runs each unique query once (see portfolio), so workers find
+shared hits in the cache; --plan-only prints that dedup report and stops.
+
+Rerunning the same batch resumes it: intakes that already succeeded are
+skipped, failed and unfinished ones run again, and their earlier searches
+are answered from the cache. --budget on a resume sets a new batch-wide
+limit; spend so far still counts against it. --restart starts over.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from war_room.cache_io import normalize_key
+from war_room.metrics import EXA_COUNTERS, collect
+from war_room.portfolio import execute_portfolio, plan_portfolio
+from war_room.query_plan import CaseIntake, load_case_intake, validate_case_intake_payload
+from war_room.rate_limit import SQLiteBudgetLedger
+from war_room.runner import DEFAULT_MAX_SEARCH_CALLS, make_client, run_intake, write_run_record
+from war_room.settings import WarRoomSettings
+from war_room.workspace import EventWorkspace
+
+DEFAULT_WORKERS = 4
+_SPEND_COUNTERS = ("exa_searches", "exa_contents", "exa_bytes", "workspace_reused")
+_worker_workspace: EventWorkspace | None = None
+
+
+@dataclass(frozen=True)
+class BatchItem:
+    """One intake to run: read from `source` when payload is None."""
+
+    case_key: str
+    source: str
+    payload: Any = None
+    error: str | None = None
+
+
+@dataclass(frozen=True)
+class _WorkerOptions:
+    settings: WarRoomSettings
+    records_dir: Path
+    offline: bool
+    max_search_calls: int
+    budget_path: Path | None
+    budget_limit: int | None
+
+
+def load_batch_items(source: str | Path) -> list[BatchItem]:
+    """Intakes from a directory of JSON files or a JSONL file, unvalidated.
+
+    Validation happens per intake in the worker, so one bad intake fails
+    alone. Raises ValueError if the source is missing or two intakes share
+    a case key.
+    """
+    path = Path(source)
+    if path.is_dir():
+        items = [
+            BatchItem(case_key=normalize_key(file.stem), source=str(file))
+            for file in sorted(path.glob("*.json"))
+            if not file.name.startswith("_")
+        ]
+    elif path.is_file():
+        items = list(_jsonl_items(path))
+    else:
+        raise ValueError(f"Batch source not found: {path}")
+
+    seen: set[str] = set()
+    for item in items:
+        if item.case_key in seen:
+            raise ValueError(f"Duplicate case key in {path}: {item.case_key}")
+        seen.add(item.case_key)
+    return items
+
+
+def _jsonl_items(path: Path):
+    with path.open(encoding="utf-8") as handle:
+        for lineno, line in enumerate(handle, start=1):
+            if not line.strip():
+                continue
+            source = f"{path}:{lineno}"
+            default_key = normalize_key(f"{path.stem}_{lineno}")
+            try:
+                payload = json.loads(line)
+            except json.JSONDecodeError as exc:
+                yield BatchItem(case_key=default_key, source=source, error=f"Invalid JSON: {exc}")
+                continue
+            case_key = default_key
+            if isinstance(payload, dict) and "case_key" in payload:
+                payload = dict(payload)
+                case_key = normalize_key(str(payload.pop("case_key"))) or default_key
+            yield BatchItem(case_key=case_key, source=source, payload=payload)
+
+
+def read_results(results_path: str | Path) -> dict[str, dict[str, Any]]:
+    """Latest result row per case key; a torn last line is ignored."""
+    path = Path(results_path)
+    rows: dict[str, dict[str, Any]] = {}
+    if not path.exists():
+        return rows
+    for line in path.read_text(encoding="utf-8").splitlines():
+        try:
+            row = json.loads(line)
+        except json.JSONDecodeError:
+            continue
+        rows[row["case_key"]] = row
+    return rows
+
+
+def _init_worker(schema_version: str) -> None:
+    # Spawned workers do not inherit the parent's bootstrap.
+    from war_room.retrieval import configure_schema_version
+
+    global _worker_workspace
+    configure_schema_version(schema_version)
+    _worker_workspace = EventWorkspace()
+
+
+def _load_intake(item: BatchItem) -> CaseIntake:
+    if item.error is not None:
+        raise ValueError(item.error)
+    if item.payload is None:
+        return load_case_intake(item.source)
+    return validate_case_intake_payload(item.payload)
+
+
+def _run_item(item: BatchItem, options: _WorkerOptions) -> dict[str, Any]:
+    """Worker entry point: run one intake, write its record, return its row."""
+    started = time.perf_counter()
+    try:
+        intake = _load_intake(item)
+    except ValueError as exc:
+        return {
+            "case_key": item.case_key,
+            "source": item.source,
+            "status": "invalid",
+            "error": str(exc),
+            "wall_seconds": round(time.perf_counter() - started, 4),
+            **{name: 0 for name in _SPEND_COUNTERS},
+        }
+
+    ledger = None
+    if options.budget_path is not None and options.budget_limit is not None:
+        ledger = SQLiteBudgetLedger(options.budget_path, options.budget_limit, scope="batch")
+    client = make_client(
+        options.settings,
+        offline=options.offline,
+        max_search_calls=options.max_search_calls,
+        budget_ledger=ledger,
+    )
+    record = run_intake(
+        intake,
+        client,
+        settings=options.settings,
+        case_key=item.case_key,
+        intake_path=item.source,
+        workspace=_worker_workspace,
+    )
+    record_path = write_run_record(options.records_dir, record)
+    return {
+        "case_key": item.case_key,
+        "source": item.source,
+        "status": record["status"],
+        "error": record["error"],
+        "wall_seconds": record["wall_seconds"],
+        **{name: record["totals"].get(name, 0) for name in _SPEND_COUNTERS},
+        "run_id": record["run_id"],
+        "memo_path": record["memo_path"],
+        "record_path": str(record_path),
+    }
+
+
+def run_batch(
+    items: list[BatchItem],
+    *,
+    settings: WarRoomSettings,
+    batch_dir: str | Path,
+    workers: int = DEFAULT_WORKERS,
+    offline: bool = False,
+    budget: int | None = None,
+    max_search_calls: int = DEFAULT_MAX_SEARCH_CALLS,
+    restart: bool = False,
+    portfolio: bool = False,
+    on_result: Callable[[dict[str, Any]], None] | None = None,
+) -> dict[str, Any]:
+    """Run every item not yet done in batch_dir; returns the batch summary.
+
+    With `portfolio`, the queries of all pending intakes are deduplicated
+    and each unique one is run once, in this process, before the workers
+    start; they then read its hits from the runtime cache. The summary's
+    "portfolio" section reports the dedup ratio and the prefetch spend.
+    `on_result` is called in this process with each row as it lands.
+    """
+    if workers < 1:
+        raise ValueError("workers must be at least 1")
+    out = Path(batch_dir)
+    records_dir = out / "records"
+    records_dir.mkdir(parents=True, exist_ok=True)
+    results_path = out / "results.jsonl"
+    budget_path = out / "budget.sqlite"
+    if restart:
+        results_path.unlink(missing_ok=True)
+        budget_path.unlink(missing_ok=True)
+
+    done = {key for key, row in read_results(results_path).items() if row["status"] == "ok"}
+    todo = [item for item in items if item.case_key not in done]
+    options = _WorkerOptions(
+        settings=settings,
+        records_dir=records_dir,
+        offline=offline,
+        max_search_calls=max_search_calls,
+        budget_path=budget_path if budget is not None else None,
+        budget_limit=budget,
+    )
+    if budget is not None:
+        # A resumed batch keeps its earlier spend under the new limit.
+        SQLiteBudgetLedger(budget_path, budget, scope="batch").set_limit(budget)
+
+    started = time.perf_counter()
+    portfolio_report = _prefetch_portfolio(todo, options) if portfolio else None
+    if todo:
+        with ProcessPoolExecutor(
+            max_workers=min(workers, len(todo)),
+            initializer=_init_worker,
+            initargs=(settings.schema_version,),
+        ) as pool, results_path.open("a", encoding="utf-8") as results:
+            futures = {pool.submit(_run_item, item, options): item for item in todo}
+            for future in as_completed(futures):
+                item = futures[future]
+                try:
+                    row = future.result()
+                except Exception as exc:
+                    # The worker itself died (e.g. BrokenProcessPool); the intake is retried on resume.
+                    row = {
+                        "case_key": item.case_key,
+                        "source": item.source,
+                        "status": "error",
+                        "error": f"{type(exc).__name__}: {exc}",
+                        **{name: 0 for name in _SPEND_COUNTERS},
+                    }
+                results.write(json.dumps(row) + "\n")
+                results.flush()
+                if on_result is not None:
+                    on_result(row)
+
+    summary = summarize_batch(items, read_results(results_path), budget_path=options.budget_path)
+    if portfolio_report is not None:
+        summary["portfolio"] = portfolio_report
+    summary["ran"] = len(todo)
+    summary["skipped"] = len(items) - len(todo)
+    summary["wall_seconds"] = round(time.perf_counter() - started, 4)
+    (out / "summary.json").write_text(json.dumps(summary, indent=2), encoding="utf-8")
+    return summary
+
+
+def _prefetch_portfolio(items: list[BatchItem], options: _WorkerOptions) -> dict[str, Any]:
+    """Run each unique query of `items` once, warming the per-query cache tier."""
+    settings = options.settings
+    if not settings.use_cache:
+        raise ValueError("A portfolio batch needs the runtime cache (USE_CACHE=true) to share hits")
+    intakes: dict[str, CaseIntake] = {}
+    for item in items:
+        try:
+            intakes[item.case_key] = _load_intake(item)
+        except ValueError:
+            # Reported by its worker.
+            continue
+    plan = plan_portfolio(intakes)
+    report: dict[str, Any] = plan.report()
+
+    ledger = None
+    if options.budget_path is not None and options.budget_limit is not None:
+        ledger = SQLiteBudgetLedger(options.budget_path, options.budget_limit, scope="batch")
+    client = make_client(
+        settings,
+        offline=options.offline,
+        max_search_calls=len(plan.queries),
+        budget_ledger=ledger,
+    )
+    if client is None:
+        report.update(executed=0, failed=0)
+        return report
+    with collect() as tally:
+        hits = execute_portfolio(
+            plan,
+            client,
+            use_cache=True,
+            cache_dir=str(settings.cache_dir),
+            cache_samples_dir=str(settings.cache_samples_dir),
+        )
+    counts = tally.as_dict()
+    report.update(
+        executed=len(hits.hits),
+        failed=len(hits.errors),
+        **{name: counts[name] for name in EXA_COUNTERS},
+    )
+    return report
+
+
+def summarize_batch(
+    items: list[BatchItem],
+    rows: dict[str, dict[str, Any]],
+    *,
+    budget_path: Path | None = None,
+) -> dict[str, Any]:
+    """Per-intake rows in item order, with status counts and spend totals."""
+    intakes = [
+        rows.get(item.case_key, {"case_key": item.case_key, "source": item.source, "status": "pending"})
+        for item in items
+    ]
+    statuses: dict[str, int] = {}
+    for row in intakes:
+        statuses[row["status"]] = statuses.get(row["status"], 0) + 1
+    summary: dict[str, Any] = {
+        "total": len(items),
+        "ok": statuses.get("ok", 0),
+        "failed": len(items) - statuses.get("ok", 0) - statuses.get("pending", 0),
+        "statuses": statuses,
+        "spend": {name: sum(row.get(name, 0) for row in intakes) for name in _SPEND_COUNTERS},
+        "intakes": intakes,
+    }
+    if budget_path is not None and budget_path.exists():
+        ledger = SQLiteBudgetLedger(budget_path, 0, scope="batch")
+        summary["budget"] = {"limit": ledger.limit, "spent": ledger.spent(), "remaining": ledger.remaining()}
+    return summary
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m war_room batch", description="Run many intakes.")
+    parser.add_argument("source", type=Path, help="Directory of intake JSON files, or a JSONL file.")
+    parser.add_argument("--batch-id", help="Names the batch state directory (default: the source name).")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS)
+    parser.add_argument("--budget", type=int, help="Exa searches shared by the whole batch.")
+    parser.add_argument("--max-search-calls", type=int, default=DEFAULT_MAX_SEARCH_CALLS, help="Per intake.")
+    parser.add_argument("--offline", action="store_true", help="Never call Exa; answer from caches only.")
+    parser.add_argument("--restart", action="store_true", help="Forget earlier results and spend.")
+    parser.add_argument(
+        "--portfolio", action="store_true", help="Run each query shared by several intakes once, up front."
+    )
+    parser.add_argument(
+        "--plan-only", action="store_true", help="Print the portfolio dedup report and exit without running."
+    )
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    from war_room.bootstrap import bootstrap_runtime
+
+    settings = bootstrap_runtime().settings
+    try:
+        items = load_batch_items(args.source)
+    except ValueError as exc:
+        print(f"error: {exc}")
+        return 2
+
+    if args.plan_only:
+        intakes: dict[str, CaseIntake] = {}
+        for item in items:
+            try:
+                intakes[item.case_key] = _load_intake(item)
+            except ValueError as exc:
+                print(f"skipped {item.case_key}: {exc}")
+        print(json.dumps(plan_portfolio(intakes).report(), indent=2))
+        return 0
+
+    batch_id = normalize_key(args.batch_id or args.source.stem) or "batch"
+    batch_dir = settings.runs_dir / f"batch_{batch_id}"
+
+    def _progress(row: dict[str, Any]) -> None:
+        detail = f"{row.get('wall_seconds', 0):.2f}s, {row['exa_searches']} searches"
+        print(f"{row['status']:<8} {row['case_key']} ({detail}){': ' + row['error'] if row['error'] else ''}")
+
+    try:
+        summary = run_batch(
+            items,
+            settings=settings,
+            batch_dir=batch_dir,
+            workers=args.workers,
+            offline=args.offline,
+            budget=args.budget,
+            max_search_calls=args.max_search_calls,
+            restart=args.restart,
+            portfolio=args.portfolio,
+            on_result=_progress,
+        )
+    except ValueError as exc:
+        print(f"error: {exc}")
+        return 2
+    if "portfolio" in summary:
+        report = summary["portfolio"]
+        print(
+            f"portfolio: {report['total_queries']} queries, {report['unique_queries']} unique "
+            f"(dedup {report['dedup_ratio']}x), {report['executed']} prefetched"
+        )
+    print(
+        f"{summary['ok']}/{summary['total']} ok, {summary['failed']} failed, {summary['skipped']} skipped; "
+        f"{summary['spend']['exa_searches']} searches; summary {batch_dir / 'summary.json'}"
+    )
+    return 0 if summary["ok"] == summary["total"] else 1
@@ -7,6 +7,7 @@ import json
 from dataclasses import dataclass
 from pathlib import Path
 
+from war_room.cache_io import is_sqlite_location
 from war_room.settings import WarRoomSettings, load_settings
 
 
@@ -42,9 +43,17 @@ def bootstrap_runtime(
     repo_root = discover_repo_root(start_path)
     settings = load_settings(repo_root=repo_root, env_file=env_file)
 
+    # Imported here: retrieval -> exa_client -> bootstrap would be circular.
+    from war_room.retrieval import configure_schema_version
+
+    # Cached packs are namespaced by schema version; see retrieval.versioned_key.
+    configure_schema_version(settings.schema_version)
+
     if ensure_dirs:
         for path in (settings.cache_dir, settings.cache_samples_dir, settings.output_dir, settings.runs_dir):
-            path.mkdir(parents=True, exist_ok=True)
+            # A SQLite runtime cache (CACHE_DIR=cache/war_room.sqlite) is a file, not a directory.
+            target = path.parent if path is settings.cache_dir and is_sqlite_location(path) else path
+            target.mkdir(parents=True, exist_ok=True)
 
     return BootstrapContext(repo_root=repo_root, settings=settings)
 
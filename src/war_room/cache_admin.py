@@ -0,0 +1,288 @@
+"""Cache maintenance: stats, listing, garbage collection, migration, bundles.
+
+    python -m war_room cache stats
+    python -m war_room cache ls --module weather --limit 20
+    python -m war_room cache gc [--max-mb 512] [--max-age-days 30] [--dry-run]
+    python -m war_room cache migrate --compact --compression gzip
+    python -m war_room cache export milton.bundle.tgz --event "Hurricane Milton"
+    python -m war_room cache import milton.bundle.tgz [--overwrite]
+
+Commands default to the runtime cache and limits from settings (CACHE_DIR,
+CACHE_MAX_MB, CACHE_MAX_AGE_DAYS). Garbage collection first drops entries
+fetched longer ago than the age limit, then evicts the least recently read
+entries until the cache fits the size cap. Committed cache_samples/
+fixtures are never evicted: gc refuses to run against them. Bundles are
+described in cache_bundle.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any
+
+from war_room.cache_bundle import export_bundle, import_bundle, intake_cache_keys, select_entries
+from war_room.cache_io import (
+    CacheEncoding,
+    CacheLocation,
+    StoredEntry,
+    clear_memory_cache,
+    get_backend,
+    migrate_cache,
+)
+
+_DAY = 24 * 60 * 60
+
+
+def list_entries(cache_dir: CacheLocation, *, module: str | None = None) -> list[StoredEntry]:
+    """Entries in a cache location, most recently read first."""
+    entries = [
+        entry for entry in get_backend(cache_dir).iter_entries()
+        if module is None or entry.module == module
+    ]
+    entries.sort(key=lambda entry: entry.accessed_at, reverse=True)
+    return entries
+
+
+def cache_stats(cache_dir: CacheLocation) -> dict[str, Any]:
+    """Entry counts and bytes, overall and per module prefix."""
+    modules: dict[str, dict[str, int]] = {}
+    total_entries = total_bytes = 0
+    oldest: float | None = None
+    for entry in get_backend(cache_dir).iter_entries():
+        bucket = modules.setdefault(entry.module, {"entries": 0, "bytes": 0})
+        bucket["entries"] += 1
+        bucket["bytes"] += entry.size
+        total_entries += 1
+        total_bytes += entry.size
+        oldest = entry.fetched_at if oldest is None else min(oldest, entry.fetched_at)
+    return {
+        "entries": total_entries,
+        "bytes": total_bytes,
+        "oldest_fetched_at": oldest,
+        "modules": dict(sorted(modules.items())),
+    }
+
+
+def gc_cache(
+    cache_dir: CacheLocation,
+    *,
+    max_bytes: int | None = None,
+    max_age: float | None = None,
+    cache_samples_dir: CacheLocation = "cache_samples",
+    dry_run: bool = False,
+) -> dict[str, int]:
+    """Evict expired entries, then least recently read ones down to max_bytes.
+
+    `max_age` is in seconds since the entry was fetched. Entries rewritten
+    while gc runs are kept. Raises ValueError if cache_dir is the committed
+    samples location.
+    """
+    if _same_location(cache_dir, cache_samples_dir):
+        raise ValueError(f"Refusing to garbage-collect committed samples at {cache_dir}")
+
+    backend = get_backend(cache_dir)
+    entries = sorted(backend.iter_entries(), key=lambda entry: entry.accessed_at)
+    total = sum(entry.size for entry in entries)
+    cutoff = time.time() - max_age if max_age is not None else None
+
+    victims = [entry for entry in entries if cutoff is not None and entry.fetched_at < cutoff]
+    expired = {entry.name for entry in victims}
+    remaining = total - sum(entry.size for entry in victims)
+    for entry in entries:
+        if max_bytes is None or remaining <= max_bytes:
+            break
+        if entry.name not in expired:
+            victims.append(entry)
+            remaining -= entry.size
+
+    evicted = freed = 0
+    if not dry_run:
+        for entry in victims:
+            if backend.evict(entry):
+                evicted += 1
+                freed += entry.size
+        if evicted:
+            clear_memory_cache()
+            compact = getattr(backend, "compact_manifest", None)
+            if compact is not None:
+                # Drop the journal's delete lines along with the entries.
+                compact()
+    else:
+        evicted, freed = len(victims), total - remaining
+
+    sweep = getattr(backend, "sweep_temp_files", None)
+    temp_files = sweep() if sweep is not None and not dry_run else 0
+    return {
+        "entries_before": len(entries),
+        "bytes_before": total,
+        "evicted": evicted,
+        "bytes_freed": freed,
+        "entries_after": len(entries) - evicted,
+        "bytes_after": total - freed,
+        "temp_files_removed": temp_files,
+    }
+
+
+def _same_location(a: CacheLocation, b: CacheLocation) -> bool:
+    try:
+        return Path(os.fspath(a)).resolve() == Path(os.fspath(b)).resolve()
+    except TypeError:
+        # Backend instances have no path to compare.
+        return False
+
+
+def _settings():
+    from war_room.bootstrap import bootstrap_runtime
+
+    return bootstrap_runtime(ensure_dirs=False).settings
+
+
+def _default_cache_dir() -> Path:
+    return _settings().cache_dir
+
+
+def _cmd_stats(args: argparse.Namespace) -> int:
+    cache_dir = args.cache_dir or _default_cache_dir()
+    print(json.dumps({"cache_dir": str(cache_dir), **cache_stats(cache_dir)}, indent=2))
+    return 0
+
+
+def _cmd_ls(args: argparse.Namespace) -> int:
+    cache_dir = args.cache_dir or _default_cache_dir()
+    now = time.time()
+    for entry in list_entries(cache_dir, module=args.module)[: args.limit]:
+        age_days = (now - entry.fetched_at) / _DAY
+        read_days = (now - entry.accessed_at) / _DAY
+        print(f"{entry.module:<10} {entry.size:>10}  fetched {age_days:6.1f}d  read {read_days:6.1f}d  {entry.name}")
+    return 0
+
+
+def _cmd_gc(args: argparse.Namespace) -> int:
+    settings = _settings()
+    cache_dir = args.cache_dir or settings.cache_dir
+    max_bytes = settings.cache_max_bytes if args.max_mb is None else int(args.max_mb * 1024 * 1024) or None
+    max_age_days = settings.cache_max_age_days if args.max_age_days is None else args.max_age_days or None
+    report = gc_cache(
+        cache_dir,
+        max_bytes=max_bytes,
+        max_age=max_age_days * _DAY if max_age_days is not None else None,
+        cache_samples_dir=settings.cache_samples_dir,
+        dry_run=args.dry_run,
+    )
+    print(json.dumps({"cache_dir": str(cache_dir), "dry_run": args.dry_run, **report}, indent=2))
+    return 0
+
+
+def _cmd_migrate(args: argparse.Namespace) -> int:
+    cache_dir = args.cache_dir or _default_cache_dir()
+    encoding = CacheEncoding(
+        compact=args.compact,
+        compression=None if args.compression == "none" else args.compression,
+        fast_json=args.fast_json,
+    )
+    counts = migrate_cache(cache_dir, encoding)
+    print(json.dumps({"cache_dir": str(cache_dir), **counts}, indent=2))
+    return 0
+
+
+def _cmd_export(args: argparse.Namespace) -> int:
+    keys = None
+    if args.intake is not None:
+        from war_room.query_plan import load_case_intake
+
+        # Even with --cache-dir: loading settings sets the schema version pack keys are namespaced by.
+        settings = _settings()
+        cache_dir = args.cache_dir or settings.cache_dir
+        keys = intake_cache_keys(load_case_intake(args.intake), cache_dir=cache_dir)
+    else:
+        cache_dir = args.cache_dir or _default_cache_dir()
+    selection = {
+        "modules": args.module,
+        "event": args.event,
+        "intake": str(args.intake) if args.intake is not None else None,
+        "max_age_days": args.max_age_days,
+    }
+    entries = select_entries(
+        cache_dir,
+        modules=args.module,
+        event=args.event,
+        keys=keys,
+        max_age=args.max_age_days * _DAY if args.max_age_days is not None else None,
+    )
+    manifest = export_bundle(cache_dir, args.bundle, entries, selection=selection)
+    print(json.dumps({
+        "cache_dir": str(cache_dir),
+        "bundle": str(args.bundle),
+        "entries": len(manifest["entries"]),
+        "bytes": sum(record["size"] for record in manifest["entries"]),
+        "bundle_bytes": args.bundle.stat().st_size,
+    }, indent=2))
+    return 0
+
+
+def _cmd_import(args: argparse.Namespace) -> int:
+    cache_dir = args.cache_dir or _default_cache_dir()
+    counts = import_bundle(args.bundle, cache_dir, overwrite=args.overwrite)
+    print(json.dumps({"cache_dir": str(cache_dir), "bundle": str(args.bundle), **counts}, indent=2))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m war_room cache", description="Maintain the runtime cache.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    cache_dir_help = "Cache directory or SQLite file (default: CACHE_DIR)."
+
+    stats = commands.add_parser("stats", help="Entry counts and bytes per module.")
+    stats.add_argument("--cache-dir", type=Path, help=cache_dir_help)
+    stats.set_defaults(handler=_cmd_stats)
+
+    ls = commands.add_parser("ls", help="List entries, most recently read first.")
+    ls.add_argument("--cache-dir", type=Path, help=cache_dir_help)
+    ls.add_argument("--module", help="Only entries for this key prefix, e.g. weather.")
+    ls.add_argument("--limit", type=int, default=50)
+    ls.set_defaults(handler=_cmd_ls)
+
+    gc = commands.add_parser("gc", help="Evict expired and least recently read entries down to the cap.")
+    gc.add_argument("--cache-dir", type=Path, help=cache_dir_help)
+    gc.add_argument("--max-mb", type=float, help="Size cap in MB; 0 = none (default: CACHE_MAX_MB).")
+    gc.add_argument("--max-age-days", type=float, help="Age limit; 0 = none (default: CACHE_MAX_AGE_DAYS).")
+    gc.add_argument("--dry-run", action="store_true", help="Report what would be evicted.")
+    gc.set_defaults(handler=_cmd_gc)
+
+    migrate = commands.add_parser("migrate", help="Rewrite every entry in a new encoding, in place.")
+    migrate.add_argument("--cache-dir", type=Path, help=cache_dir_help)
+    migrate.add_argument("--compact", action="store_true", help="Drop indentation.")
+    migrate.add_argument("--compression", choices=["none", "gzip", "zstd"], default="none")
+    migrate.add_argument("--fast-json", action="store_true", help="Serialize with orjson when installed.")
+    migrate.set_defaults(handler=_cmd_migrate)
+
+    export = commands.add_parser("export", help="Write selected entries to a portable bundle.")
+    export.add_argument("bundle", type=Path, help="Bundle file to write, e.g. milton.bundle.tgz.")
+    export.add_argument("--cache-dir", type=Path, help=cache_dir_help)
+    export.add_argument("--module", action="append", help="Only this key prefix; repeatable.")
+    export.add_argument("--event", help="Only entries whose key mentions this event.")
+    export.add_argument("--intake", type=Path, help="Only entries a run of this intake JSON reads.")
+    export.add_argument("--max-age-days", type=float, help="Only entries fetched within this many days.")
+    export.set_defaults(handler=_cmd_export)
+
+    import_ = commands.add_parser("import", help="Merge a bundle into a cache.")
+    import_.add_argument("bundle", type=Path)
+    import_.add_argument("--cache-dir", type=Path, help=cache_dir_help)
+    import_.add_argument("--overwrite", action="store_true", help="Replace entries even if the cache's copy is newer.")
+    import_.set_defaults(handler=_cmd_import)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.handler(args)
+    except ValueError as exc:
+        # Bad choices: zstd without zstandard, gc pointed at cache_samples/,
+        # an invalid intake or bundle.
+        print(f"error: {exc}")
+        return 2
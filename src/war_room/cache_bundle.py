@@ -0,0 +1,232 @@
+"""Portable cache bundles: export selected entries, import them elsewhere.
+
+    python -m war_room cache export milton.bundle.tgz --event "Hurricane Milton"
+    python -m war_room cache export demo.bundle.tgz --intake eval/intakes/milton.json
+    python -m war_room cache import milton.bundle.tgz [--cache-dir cache_samples]
+
+A bundle is one gzip-compressed tar: `manifest.json` (format version,
+source layout, selection, and per-entry size, fetched-at time and sha256)
+followed by each entry's stored bytes under `entries/`. Bytes are copied
+as stored, whatever their encoding, and each checksum is verified before
+an entry is imported; a damaged entry is skipped, not written.
+
+Import merges: an entry already in the target that was fetched at the same
+time or later is kept unless `overwrite=True`. Imported entries keep their
+original fetched-at time, so TTLs behave as they did at the source. This
+warms an air-gapped demo laptop or a new batch worker without Exa calls.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import io
+import json
+import tarfile
+import time
+from pathlib import Path
+from typing import Any, Iterable
+
+from war_room.cache_io import (
+    CacheLocation,
+    SQLiteCacheBackend,
+    StoredEntry,
+    cache_get,
+    clear_memory_cache,
+    get_backend,
+    normalize_key,
+)
+
+BUNDLE_VERSION = 1
+_MANIFEST_MEMBER = "manifest.json"
+_ENTRY_PREFIX = "entries/"
+
+
+def _layout(backend: Any) -> str:
+    return "sqlite" if isinstance(backend, SQLiteCacheBackend) else "json"
+
+
+def intake_cache_keys(intake: Any, *, cache_dir: CacheLocation | None = None) -> list[str]:
+    """Cache keys a pipeline run for `intake` reads: packs, per-query hits, citation checks.
+
+    Citation-check keys depend on the caselaw pack, so they are only
+    included when that pack is found in `cache_dir`.
+    """
+    from war_room.carrier_module import carrier_case_key, carrier_pack_key
+    from war_room.caselaw_module import CASELAW_EXCLUDE_DOMAINS, caselaw_case_key, caselaw_pack_key
+    from war_room.citation_verify import citation_check_keys
+    from war_room.query_plan import generate_query_plan
+    from war_room.retrieval import query_cache_key
+    from war_room.weather_module import weather_case_key, weather_pack_key
+
+    plan = generate_query_plan(intake)
+    modules = {
+        "weather": (weather_case_key, weather_pack_key, None),
+        "carrier_docs": (carrier_case_key, carrier_pack_key, None),
+        "caselaw": (caselaw_case_key, caselaw_pack_key, CASELAW_EXCLUDE_DOMAINS),
+    }
+    keys: list[str] = []
+    caselaw_pack = None
+    for module, (case_key_of, pack_key_of, exclude_domains) in modules.items():
+        queries = [query for query in plan if query.module == module]
+        case_key, pack_key = case_key_of(intake), pack_key_of(intake, queries)
+        keys.extend([case_key, pack_key])
+        keys.extend(query_cache_key(query, exclude_domains=exclude_domains) for query in queries)
+        if module == "caselaw" and cache_dir is not None:
+            caselaw_pack = cache_get(pack_key, cache_dir) or cache_get(case_key, cache_dir)
+    if caselaw_pack is not None:
+        keys.extend(citation_check_keys(caselaw_pack))
+    return keys
+
+
+def select_entries(
+    cache_dir: CacheLocation,
+    *,
+    modules: Iterable[str] | None = None,
+    event: str | None = None,
+    keys: Iterable[str] | None = None,
+    max_age: float | None = None,
+) -> list[StoredEntry]:
+    """Entries matching every given filter, by name.
+
+    `event` matches entries whose key mentions the event; `keys` limits the
+    selection to those cache keys; `max_age` is in seconds since fetch.
+    """
+    backend = get_backend(cache_dir)
+    wanted_modules = set(modules) if modules else None
+    event_part = normalize_key(event) if event else None
+    wanted_names = {backend.entry_name(key) for key in keys} if keys is not None else None
+    cutoff = time.time() - max_age if max_age is not None else None
+    selected = [
+        entry for entry in backend.iter_entries()
+        if (wanted_modules is None or entry.module in wanted_modules)
+        and (event_part is None or event_part in normalize_key(entry.name))
+        and (wanted_names is None or entry.name in wanted_names)
+        and (cutoff is None or entry.fetched_at >= cutoff)
+    ]
+    selected.sort(key=lambda entry: entry.name)
+    return selected
+
+
+def export_bundle(
+    cache_dir: CacheLocation,
+    bundle_path: str | Path,
+    entries: list[StoredEntry],
+    *,
+    selection: dict[str, Any] | None = None,
+) -> dict[str, Any]:
+    """Write `entries` from cache_dir into a bundle; returns its manifest.
+
+    `selection` is recorded in the manifest to say how the entries were chosen.
+    """
+    backend = get_backend(cache_dir)
+    records: list[dict[str, Any]] = []
+    payloads: list[bytes] = []
+    for entry in entries:
+        data = backend.read_raw(entry.name)
+        if data is None:
+            # Evicted since it was listed.
+            continue
+        records.append({
+            "name": entry.name,
+            "module": entry.module,
+            "size": len(data),
+            "fetched_at": entry.fetched_at,
+            "sha256": hashlib.sha256(data).hexdigest(),
+        })
+        payloads.append(data)
+
+    manifest = {
+        "bundle_version": BUNDLE_VERSION,
+        "created_at": time.time(),
+        "layout": _layout(backend),
+        "selection": selection or {},
+        "entries": records,
+    }
+    path = Path(bundle_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with tarfile.open(path, "w:gz", compresslevel=6) as bundle:
+        _add_member(bundle, _MANIFEST_MEMBER, json.dumps(manifest, indent=2).encode("utf-8"))
+        for record, data in zip(records, payloads):
+            _add_member(bundle, _ENTRY_PREFIX + record["name"], data, mtime=record["fetched_at"])
+    return manifest
+
+
+def _add_member(bundle: tarfile.TarFile, name: str, data: bytes, *, mtime: float | None = None) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = len(data)
+    info.mtime = int(mtime if mtime is not None else time.time())
+    bundle.addfile(info, io.BytesIO(data))
+
+
+def read_bundle_manifest(bundle_path: str | Path) -> dict[str, Any]:
+    """The manifest of a bundle, without reading its entries."""
+    with _open_bundle(bundle_path) as bundle:
+        return _load_manifest(bundle, bundle_path)
+
+
+def _open_bundle(bundle_path: str | Path) -> tarfile.TarFile:
+    try:
+        # Stream mode: members are read in order, never by seeking back.
+        return tarfile.open(bundle_path, "r|gz")
+    except (tarfile.TarError, OSError) as exc:
+        raise ValueError(f"Unreadable cache bundle {bundle_path}: {exc}") from exc
+
+
+def _load_manifest(bundle: tarfile.TarFile, bundle_path: str | Path) -> dict[str, Any]:
+    member = bundle.next()
+    handle = bundle.extractfile(member) if member is not None and member.name == _MANIFEST_MEMBER else None
+    if handle is None:
+        raise ValueError(f"Not a cache bundle (no leading {_MANIFEST_MEMBER}): {bundle_path}")
+    manifest = json.loads(handle.read())
+    if manifest.get("bundle_version") != BUNDLE_VERSION:
+        raise ValueError(f"Unsupported cache bundle version in {bundle_path}: {manifest.get('bundle_version')!r}")
+    return manifest
+
+
+def import_bundle(
+    bundle_path: str | Path,
+    cache_dir: CacheLocation,
+    *,
+    overwrite: bool = False,
+) -> dict[str, int]:
+    """Merge a bundle into cache_dir; returns counts per outcome.
+
+    Raises ValueError for an unreadable bundle or one exported from a
+    different cache layout (JSON directory vs SQLite file).
+    """
+    backend = get_backend(cache_dir)
+    counts = {"imported": 0, "kept_newer": 0, "corrupt": 0}
+    try:
+        with _open_bundle(bundle_path) as bundle:
+            manifest = _load_manifest(bundle, bundle_path)
+            if manifest.get("layout") != _layout(backend):
+                raise ValueError(
+                    f"Bundle {bundle_path} holds {manifest.get('layout')} entries; "
+                    f"{cache_dir} is a {_layout(backend)} cache"
+                )
+            records = {record["name"]: record for record in manifest["entries"]}
+            existing = {entry.name: entry.fetched_at for entry in backend.iter_entries()}
+            for member in bundle:
+                if not member.name.startswith(_ENTRY_PREFIX):
+                    continue
+                record = records.pop(member.name[len(_ENTRY_PREFIX):], None)
+                if record is None:
+                    continue
+                if not overwrite and existing.get(record["name"], float("-inf")) >= record["fetched_at"]:
+                    counts["kept_newer"] += 1
+                    continue
+                handle = bundle.extractfile(member)
+                data = handle.read() if handle is not None else b""
+                if hashlib.sha256(data).hexdigest() != record["sha256"]:
+                    counts["corrupt"] += 1
+                    continue
+                backend.write_raw(record["name"], data, fetched_at=record["fetched_at"])
+                counts["imported"] += 1
+    except (tarfile.TarError, EOFError, OSError) as exc:
+        raise ValueError(f"Damaged cache bundle {bundle_path}: {exc}") from exc
+    finally:
+        if counts["imported"]:
+            clear_memory_cache()
+    # Listed in the manifest but absent from the archive.
+    counts["corrupt"] += len(records)
+    return counts
@@ -1,16 +1,134 @@
 """Cache-first data access.
 
 Lookup order: cache_samples/ -> cache/ -> live call -> save to cache/.
+
+Storage is pluggable. A cache location is either a directory, served by the
+one-JSON-file-per-key backend (always used for committed cache_samples/
+fixtures), or a `*.sqlite` / `*.sqlite3` / `*.db` path, served by a SQLite
+(WAL) backend that keeps the runtime cache in one file. A CacheBackend
+instance may also be passed wherever a cache directory is accepted.
+
+Hot lookups are served from a bounded in-process LRU (by entry count and
+approximate bytes) keyed on the entry's resolved cache path, so repeated
+reads skip disk and JSON parsing. Values handed out by the LRU are shared:
+copy before mutating. cache_set invalidates the entry.
+
+Entries carry a fetched-at time (file mtime for JSON, a column in SQLite).
+`cached_call(..., ttl=...)` serves an entry older than its TTL immediately
+and refreshes it on a background pool (stale-while-revalidate), so runs
+never block on freshness. Committed samples never expire.
+
+Failed and empty lookups are cached as negative entries: fn() returns a
+NegativeResult (or, with `classify_error`, raises) and the outcome is kept
+for NEGATIVE_TTLS[reason] seconds whatever the call's own TTL, so known-empty
+queries are not re-run every time and transient errors thaw quickly.
+Negative entries are never served stale and never replace a good entry.
+
+Entries are pretty-printed JSON by default. configure_cache_writes() can
+switch new writes to a CacheEncoding that is compact, gzip- or
+zstd-compressed, and serialized with orjson when it is installed. Reads
+detect the format from the payload's magic bytes, so old and new entries
+mix freely and migrate_cache() can rewrite a cache in place.
+
+Writes are atomic: JSON entries are written to a temp file beside the
+target and renamed over it (optionally fsynced), under a short per-key
+write lock, so a crash or a second worker process can never leave a
+truncated entry behind. Entries that still fail to parse (written by an
+older version, or damaged on disk) are treated as misses and moved aside
+to a `_quarantine/` directory (a quarantine table for SQLite).
+
+JSON entries live in two-character hash-prefix shard directories
+(`cache/3f/<key>_<hash>.json`) so no directory grows past a few thousand
+files; flat entries from older layouts are still read, and migrate_cache()
+moves them into shards. Each directory is indexed once per process by a
+manifest (name -> path, size, fetched-at, module), persisted as an
+append-only `_manifest.jsonl` journal that every writer extends. Lookups
+consult the manifest instead of probing the filesystem, so misses cost a
+dict lookup; other processes' writes are picked up by replaying the
+journal's new tail at most every MANIFEST_REFRESH_SECONDS. Files added
+without a journal line (samples copied in, a `git pull`) are found when
+the manifest loads and, after that, by re-listing only the directories
+whose mtime changed, at most every MANIFEST_RESCAN_SECONDS.
+
+Concurrent misses on the same key are coalesced (single-flight): one caller
+runs the live call while the others wait and receive its result. With
+``cross_process=True`` a lock file next to the cache entry extends this to
+other worker processes sharing the same cache directory.
 """
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import copy
+import gzip
 import hashlib
 import json
 import os
 import re
+import sqlite3
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import wait as wait_futures
+from contextlib import contextmanager
+from dataclasses import dataclass, replace
 from pathlib import Path
-from typing import Any, Callable, Optional
+from typing import Any, Awaitable, Callable, Iterator, Optional, Protocol, runtime_checkable
+
+from war_room.metrics import count
+
+try:  # Optional: faster JSON codec.
+    import orjson
+except ImportError:
+    orjson = None
+
+try:  # Optional: zstd compression.
+    import zstandard
+except ImportError:
+    zstandard = None
+
+LOCK_TIMEOUT_SECONDS = 120.0
+LOCK_STALE_SECONDS = 300.0
+# Write locks only cover the rename, so they are short-lived; a writer that
+# cannot get one proceeds anyway since the rename itself is atomic.
+WRITE_LOCK_TIMEOUT_SECONDS = 10.0
+WRITE_LOCK_STALE_SECONDS = 60.0
+_LOCK_POLL_SECONDS = 0.05
+
+SQLITE_SUFFIXES = (".sqlite", ".sqlite3", ".db")
+# Reads refresh accessed_at at most this often, so hot keys do not turn every
+# lookup into a write.
+ACCESS_TOUCH_SECONDS = 60.0
+
+MEMORY_CACHE_MAX_ENTRIES = 1024
+MEMORY_CACHE_MAX_BYTES = 64 * 1024 * 1024
+
+REFRESH_WORKERS = 2
+
+# How long a negative entry is trusted, by reason code. Zero means "return
+# it but do not store it".
+NEGATIVE_TTLS: dict[str, float] = {
+    "empty": 6 * 60 * 60,  # the lookup ran and matched nothing
+    "error": 10 * 60,  # provider or network failure, after retries
+    "skipped": 0,  # never attempted (e.g. budget exhausted): nothing learned
+}
+_NEGATIVE_FIELD = "__negative__"
+
+QUARANTINE_DIRNAME = "_quarantine"
+MANIFEST_NAME = "_manifest.jsonl"
+MANIFEST_REFRESH_SECONDS = 1.0
+MANIFEST_RESCAN_SECONDS = 30.0
+SHARD_CHARS = 2
+# Readable part of an entry file name; the rest is a hash of the full key.
+MAX_KEY_PREFIX = 160
+_ENTRY_FILE_RE = re.compile(r"^[a-z0-9_]*_[0-9a-f]{16}\.json$")
+
+COMPRESSIONS = (None, "gzip", "zstd")
+_GZIP_MAGIC = b"\x1f\x8b"
+_ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
 
 
 def normalize_key(raw: str) -> str:
@@ -26,53 +144,1394 @@ def _hash_key(key: str) -> str:
     return hashlib.sha256(key.encode()).hexdigest()[:16]
 
 
+def _entry_name(key: str) -> str:
+    """File name for a key: readable prefix plus a hash for uniqueness.
+
+    The prefix is capped so that names, and the temp files written beside
+    them, stay under the usual 255-byte file name limit for long keys.
+    """
+    return f"{normalize_key(key)[:MAX_KEY_PREFIX]}_{_hash_key(key)}.json"
+
+
 def _cache_path(directory: str | Path, key: str) -> Path:
-    """Build the JSON file path for a normalized key."""
-    return Path(directory) / f"{normalize_key(key)}_{_hash_key(key)}.json"
+    """Flat path for a key: pre-sharding entries, and the lock files beside them."""
+    return Path(directory) / _entry_name(key)
+
+
+def _shard_path(directory: str | Path, name: str) -> Path:
+    """Sharded path for an entry file name, by the first hash characters."""
+    # Names end in _<16 hex>.json; shard on the hash, not the readable prefix.
+    digest = name[-21:-5]
+    return Path(directory) / digest[:SHARD_CHARS] / name
+
+
+@dataclass(frozen=True)
+class NegativeResult:
+    """A failed or empty lookup, cached for NEGATIVE_TTLS[reason] seconds.
+
+    Return one from a cached_call fn(); callers receive `value` (e.g. a
+    not-found placeholder). `raised` marks entries recorded from an
+    exception, which are re-raised as CachedFailure while fresh.
+    """
+
+    reason: str
+    value: Any = None
+    detail: str | None = None
+    raised: bool = False
+
+    @property
+    def ttl(self) -> float:
+        # A reason since dropped from NEGATIVE_TTLS reads as expired.
+        return NEGATIVE_TTLS.get(self.reason, 0.0)
+
+    def to_payload(self) -> dict[str, Any]:
+        marker = {"reason": self.reason, "detail": self.detail, "raised": self.raised}
+        return {_NEGATIVE_FIELD: marker, "value": self.value}
+
+    @classmethod
+    def from_payload(cls, payload: Any) -> Optional[NegativeResult]:
+        if not isinstance(payload, dict) or not isinstance(payload.get(_NEGATIVE_FIELD), dict):
+            return None
+        marker = payload[_NEGATIVE_FIELD]
+        return cls(
+            str(marker.get("reason")),
+            payload.get("value"),
+            marker.get("detail"),
+            bool(marker.get("raised")),
+        )
+
+
+class CachedFailure(Exception):
+    """Raised by cached_call while a failure recorded for the key is still fresh."""
+
+    def __init__(self, key: str, negative: NegativeResult):
+        super().__init__(f"{key}: cached {negative.reason} ({negative.detail or 'no detail'})")
+        self.key = key
+        self.reason = negative.reason
+        self.detail = negative.detail
+
+
+@dataclass(frozen=True)
+class CacheEntry:
+    """A stored value with the metadata needed for freshness decisions.
+
+    For negative entries `value` is the NegativeResult's value and its
+    reason's TTL replaces the caller's.
+    """
+
+    value: Any
+    fetched_at: float
+    size: int
+    negative: Optional[NegativeResult] = None
+
+    @property
+    def age(self) -> float:
+        return max(0.0, time.time() - self.fetched_at)
+
+    def is_fresh(self, ttl: float | None) -> bool:
+        if self.negative is not None:
+            return self.age <= self.negative.ttl
+        return ttl is None or self.age <= ttl
+
+
+@dataclass(frozen=True)
+class StoredEntry:
+    """Listing metadata for one stored entry, used by cache maintenance.
+
+    `name` is the file name for JSON directories and the key for SQLite.
+    """
+
+    name: str
+    size: int
+    fetched_at: float
+    accessed_at: float
+
+    @property
+    def module(self) -> str:
+        """Key prefix: weather, carrier, caselaw, citecheck, query, contents, ..."""
+        return normalize_key(self.name).split("_", 1)[0]
+
+
+@dataclass(frozen=True)
+class CacheEncoding:
+    """How new entries are serialized; reads detect the format on their own.
+
+    `fast_json` uses orjson when it is installed and falls back silently.
+    """
+
+    compact: bool = False
+    compression: Optional[str] = None
+    fast_json: bool = False
+
+    def __post_init__(self) -> None:
+        if self.compression not in COMPRESSIONS:
+            raise ValueError(f"compression must be one of {COMPRESSIONS}, got {self.compression!r}")
+        if self.compression == "zstd" and zstandard is None:
+            raise ValueError("zstd compression needs the 'zstandard' package")
+
+
+# What every entry was written as before encodings were configurable.
+LEGACY_ENCODING = CacheEncoding()
+COMPACT_ENCODING = CacheEncoding(compact=True, compression="gzip", fast_json=True)
+
+_fsync_writes = False
+_write_encoding = LEGACY_ENCODING
+
+
+def encode_payload(value: Any, encoding: CacheEncoding = LEGACY_ENCODING) -> bytes:
+    """Serialize a value as JSON bytes in the given encoding."""
+    data = None
+    if encoding.fast_json and orjson is not None:
+        try:
+            data = orjson.dumps(value, default=str, option=0 if encoding.compact else orjson.OPT_INDENT_2)
+        except TypeError:
+            # e.g. non-string dict keys, which the stdlib codec coerces.
+            data = None
+    if data is None:
+        if encoding.compact:
+            text = json.dumps(value, separators=(",", ":"), default=str)
+        else:
+            text = json.dumps(value, indent=2, default=str)
+        data = text.encode("utf-8")
+    if encoding.compression == "gzip":
+        return gzip.compress(data, compresslevel=6, mtime=0)
+    if encoding.compression == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return data
+
+
+def decode_payload(raw: bytes) -> Any:
+    """Parse JSON bytes in any supported encoding.
+
+    Raises ValueError for damaged payloads and ImportError for zstd entries
+    when the 'zstandard' package is not installed.
+    """
+    if raw.startswith(_GZIP_MAGIC):
+        try:
+            raw = gzip.decompress(raw)
+        except (OSError, EOFError) as exc:
+            raise ValueError(f"Damaged gzip cache payload: {exc}") from exc
+    elif raw.startswith(_ZSTD_MAGIC):
+        if zstandard is None:
+            raise ImportError("Reading zstd cache entries needs the 'zstandard' package")
+        try:
+            raw = zstandard.ZstdDecompressor().decompress(raw)
+        except zstandard.ZstdError as exc:
+            raise ValueError(f"Damaged zstd cache payload: {exc}") from exc
+    if orjson is not None:
+        try:
+            return orjson.loads(raw)
+        except ValueError:
+            # orjson is stricter (NaN, lone surrogates); let json decide.
+            pass
+    return json.loads(raw)
+
+
+@runtime_checkable
+class CacheBackend(Protocol):
+    """Key/value storage behind cache_get, cache_set, and cached_call."""
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the stored value, or None if the key is absent."""
+        ...
+
+    def set(self, key: str, value: Any, *, fetched_at: float | None = None) -> Path:
+        """Store a JSON-serializable value; return the file it lives in.
+
+        `fetched_at` backdates the entry (default: now), e.g. when an old
+        entry is rewritten rather than refetched.
+        """
+        ...
+
+    def lock_path(self, key: str) -> Path:
+        """Advisory lock file used to serialize misses across processes."""
+        ...
+
+    def flight_key(self, key: str) -> str:
+        """Process-wide identity of the entry, for single-flight coalescing."""
+        ...
+
+
+class _Manifest:
+    """Index of one JSON cache directory: entry name -> location and metadata.
+
+    Loaded once per process, from the `_manifest.jsonl` journal when there
+    is one and by scanning the directory otherwise (e.g. committed samples,
+    which never get a journal unless something writes to them). Writers
+    append a line per change; readers replay new lines on a miss, at most
+    every MANIFEST_REFRESH_SECONDS. A torn last line is ignored until it
+    is completed. Files added without a journal line are indexed by
+    _reconcile(), on load and then at most every MANIFEST_RESCAN_SECONDS.
+    """
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self.path = directory / MANIFEST_NAME
+        self._lock = threading.Lock()
+        self._entries: dict[str, dict[str, Any]] | None = None
+        self._offset = 0
+        self._inode: int | None = None
+        self._checked = 0.0
+        self._dir_mtimes: dict[str, int] = {}
+        self._reconciled = 0.0
+
+    def lookup(self, name: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            entries = self._loaded()
+            record = entries.get(name)
+            if record is None and time.monotonic() - self._checked > MANIFEST_REFRESH_SECONDS:
+                self._replay()
+                record = entries.get(name)
+            if record is None and time.monotonic() - self._reconciled > MANIFEST_RESCAN_SECONDS:
+                self._reconcile()
+                record = self._entries.get(name)
+            return record
+
+    def note(self, name: str, record: dict[str, Any]) -> None:
+        """Index an entry found by probing, without journaling it."""
+        with self._lock:
+            self._loaded()[name] = record
+
+    def record(self, name: str, record: dict[str, Any]) -> None:
+        with self._lock:
+            self._loaded()[name] = record
+            self._append({"n": name, **record})
+
+    def forget(self, name: str) -> None:
+        with self._lock:
+            if self._loaded().pop(name, None) is not None:
+                self._append({"n": name, "x": 1})
+
+    def compact(self) -> None:
+        """Rewrite the journal as one line per live entry, from a fresh scan."""
+        with self._lock, _file_lock(
+            self.path.with_suffix(".lock"),
+            timeout=WRITE_LOCK_TIMEOUT_SECONDS,
+            stale_after=WRITE_LOCK_STALE_SECONDS,
+        ):
+            self._entries = self._scan()
+            self._write_snapshot()
+
+    def _loaded(self) -> dict[str, dict[str, Any]]:
+        if self._entries is None:
+            self._entries = {}
+            if self.path.exists():
+                self._replay()
+                self._reconcile()
+            else:
+                self._dir_mtimes = self._dir_signature()
+                self._entries = self._scan()
+                self._reconciled = time.monotonic()
+        return self._entries
+
+    def _dir_signature(self) -> dict[str, int]:
+        """mtime of the cache directory and of each shard directory in it."""
+        try:
+            signature = {str(self.directory): os.stat(self.directory).st_mtime_ns}
+            for item in os.scandir(self.directory):
+                if item.is_dir() and len(item.name) == SHARD_CHARS:
+                    signature[item.path] = item.stat().st_mtime_ns
+        except FileNotFoundError:
+            return {}
+        return signature
+
+    def _reconcile(self) -> None:
+        """Index entry files the journal does not know, in directories changed since the last pass."""
+        self._reconciled = time.monotonic()
+        signature = self._dir_signature()
+        for directory, mtime in signature.items():
+            if self._dir_mtimes.get(directory) == mtime:
+                continue
+            try:
+                items = [item for item in os.scandir(directory) if item.name.endswith(".json")]
+            except FileNotFoundError:
+                continue
+            for item in items:
+                if item.name in self._entries or not item.is_file():
+                    continue
+                try:
+                    stat = item.stat()
+                except FileNotFoundError:
+                    continue
+                self._entries[item.name] = _manifest_record(self.directory, Path(item.path), stat.st_size, stat.st_mtime)
+        self._dir_mtimes = signature
+
+    def _scan(self) -> dict[str, dict[str, Any]]:
+        entries: dict[str, dict[str, Any]] = {}
+        for path in _iter_entry_files(self.directory):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            record = _manifest_record(self.directory, path, stat.st_size, stat.st_mtime)
+            # A sharded copy supersedes a flat one left from the old layout.
+            if path.parent != self.directory or path.name not in entries:
+                entries[path.name] = record
+        self._checked = time.monotonic()
+        return entries
+
+    def _replay(self) -> None:
+        self._checked = time.monotonic()
+        try:
+            with open(self.path, "rb") as handle:
+                inode = os.fstat(handle.fileno()).st_ino
+                if inode != self._inode:
+                    # New or compacted (atomically replaced) journal: start over.
+                    self._inode = inode
+                    self._offset = 0
+                    self._entries.clear()
+                handle.seek(self._offset)
+                chunk = handle.read()
+        except FileNotFoundError:
+            return
+        complete = chunk[: chunk.rfind(b"\n") + 1]
+        self._offset += len(complete)
+        for line in complete.splitlines():
+            try:
+                record = json.loads(line)
+                name = record.pop("n")
+            except (ValueError, KeyError, AttributeError):
+                continue
+            if record.get("x"):
+                self._entries.pop(name, None)
+            else:
+                self._entries[name] = record
+
+    def _append(self, record: dict[str, Any]) -> None:
+        if not self.path.exists():
+            # First write to a scanned directory: persist what the scan found.
+            with _file_lock(
+                self.path.with_suffix(".lock"),
+                timeout=WRITE_LOCK_TIMEOUT_SECONDS,
+                stale_after=WRITE_LOCK_STALE_SECONDS,
+            ):
+                if not self.path.exists():
+                    self._write_snapshot()
+                    return
+        line = json.dumps(record, separators=(",", ":")) + "\n"
+        # O_APPEND keeps concurrent single-line writes from interleaving.
+        with open(self.path, "a", encoding="utf-8") as handle:
+            handle.write(line)
+
+    def _write_snapshot(self) -> None:
+        lines = "".join(
+            json.dumps({"n": name, **record}, separators=(",", ":")) + "\n"
+            for name, record in self._entries.items()
+        )
+        self.directory.mkdir(parents=True, exist_ok=True)
+        data = lines.encode("utf-8")
+        _atomic_write(self.path, data, fsync=False)
+        self._offset = len(data)
+        self._inode = self.path.stat().st_ino
+
+
+def _manifest_record(directory: Path, path: Path, size: int, fetched_at: float) -> dict[str, Any]:
+    return {
+        "p": path.relative_to(directory).as_posix(),
+        "s": size,
+        "f": fetched_at,
+        "m": normalize_key(path.name).split("_", 1)[0],
+    }
+
+
+def _iter_entry_files(directory: Path) -> Iterator[Path]:
+    """Entry files in a JSON cache directory: flat ones, then sharded ones."""
+    try:
+        top = list(os.scandir(directory))
+    except FileNotFoundError:
+        return
+    shards = []
+    for item in top:
+        if item.is_file() and item.name.endswith(".json"):
+            yield Path(item.path)
+        elif item.is_dir() and len(item.name) == SHARD_CHARS:
+            shards.append(item.path)
+    for shard in sorted(shards):
+        for item in os.scandir(shard):
+            if item.is_file() and item.name.endswith(".json"):
+                yield Path(item.path)
+
+
+class JsonFileBackend:
+    """One JSON file per key, in hash-prefix shard directories.
+
+    `encoding` sets how new entries are written and `fsync=True` flushes
+    each entry (and the directory) to disk before the write returns; both
+    default to configure_cache_writes().
+    """
+
+    def __init__(
+        self,
+        directory: str | Path,
+        *,
+        fsync: bool | None = None,
+        encoding: CacheEncoding | None = None,
+    ):
+        self.directory = Path(directory)
+        self.fsync = fsync
+        self.encoding = encoding
+        self.quarantined = 0
+        self._resolved = self.directory.resolve()
+        self._manifest = _Manifest(self.directory)
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return entry.value if entry is not None else None
+
+    def get_entry(self, key: str, *, probe: bool = False) -> Optional[CacheEntry]:
+        """Value plus metadata; the file's mtime is its fetched-at time.
+
+        The manifest decides misses without touching disk; `probe=True`
+        checks the filesystem anyway, for callers that must not miss an
+        entry another process wrote a moment ago.
+        """
+        name = _entry_name(key)
+        if probe:
+            candidates = [_shard_path(self.directory, name), self.directory / name]
+        else:
+            record = self._manifest.lookup(name)
+            if record is None:
+                return None
+            candidates = [self.directory / record["p"]]
+
+        for candidate in candidates:
+            found = self._read_file(candidate)
+            if found is not None:
+                break
+        else:
+            if not probe:
+                # Evicted or removed behind our back.
+                self._manifest.forget(name)
+            return None
+
+        path, raw, stat = found
+        if probe:
+            self._manifest.note(name, _manifest_record(self.directory, path, stat.st_size, stat.st_mtime))
+        try:
+            value = decode_payload(raw)
+        except ValueError:
+            self._quarantine(path, stat.st_ino)
+            return None
+        return CacheEntry(value, stat.st_mtime, len(raw))
+
+    def _read_file(self, path: Path) -> Optional[tuple[Path, bytes, os.stat_result]]:
+        try:
+            with open(path, "rb") as handle:
+                raw = handle.read()
+                stat = os.fstat(handle.fileno())
+                self._touch(handle.fileno(), stat)
+        except FileNotFoundError:
+            return None
+        return path, raw, stat
+
+    @staticmethod
+    def _touch(fd: int, stat: os.stat_result) -> None:
+        """Record the read in atime (mtime stays the fetched-at time) for LRU eviction."""
+        if time.time() - stat.st_atime <= ACCESS_TOUCH_SECONDS or os.utime not in os.supports_fd:
+            return
+        try:
+            os.utime(fd, ns=(time.time_ns(), stat.st_mtime_ns))
+        except OSError:
+            # Read-only checkouts (e.g. committed samples) just skip the touch.
+            pass
+
+    def set(self, key: str, value: Any, *, fetched_at: float | None = None) -> Path:
+        name = _entry_name(key)
+        path = _shard_path(self.directory, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = encode_payload(value, self.encoding or _write_encoding)
+        with _file_lock(
+            self.write_lock_path(key),
+            timeout=WRITE_LOCK_TIMEOUT_SECONDS,
+            stale_after=WRITE_LOCK_STALE_SECONDS,
+        ):
+            _atomic_write(path, data, fsync=self._fsync())
+            if fetched_at is not None:
+                os.utime(path, (time.time(), fetched_at))
+            # The sharded copy supersedes any pre-sharding one.
+            (self.directory / name).unlink(missing_ok=True)
+        stamp = time.time() if fetched_at is None else fetched_at
+        self._manifest.record(name, _manifest_record(self.directory, path, len(data), stamp))
+        return path
+
+    def migrate(self, encoding: CacheEncoding) -> dict[str, int]:
+        """Re-encode every entry in place, keeping each file's fetched-at time.
+
+        Flat entries from the pre-sharding layout are moved into shards.
+        """
+        counts = {"rewritten": 0, "unchanged": 0, "unreadable": 0}
+        for path in sorted(_iter_entry_files(self.directory)):
+            target = _shard_path(self.directory, path.name)
+            with _file_lock(
+                self.directory / path.with_suffix(".wlock").name,
+                timeout=WRITE_LOCK_TIMEOUT_SECONDS,
+                stale_after=WRITE_LOCK_STALE_SECONDS,
+            ):
+                try:
+                    raw = path.read_bytes()
+                    stat = path.stat()
+                    data = encode_payload(decode_payload(raw), encoding)
+                except FileNotFoundError:
+                    continue
+                except ValueError:
+                    counts["unreadable"] += 1
+                    continue
+                if data == raw and path == target:
+                    counts["unchanged"] += 1
+                    continue
+                target.parent.mkdir(parents=True, exist_ok=True)
+                _atomic_write(target, data, fsync=self._fsync())
+                os.utime(target, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+                if path != target:
+                    path.unlink(missing_ok=True)
+            counts["rewritten"] += 1
+        self._manifest.compact()
+        return counts
+
+    def iter_entries(self) -> Iterator[StoredEntry]:
+        for path in _iter_entry_files(self.directory):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            yield StoredEntry(path.name, stat.st_size, stat.st_mtime, stat.st_atime)
+
+    def evict(self, entry: StoredEntry) -> bool:
+        """Delete a listed entry unless it was rewritten since it was listed."""
+        evicted = False
+        with _file_lock(
+            self.directory / Path(entry.name).with_suffix(".wlock"),
+            timeout=WRITE_LOCK_TIMEOUT_SECONDS,
+            stale_after=WRITE_LOCK_STALE_SECONDS,
+        ) as acquired:
+            if not acquired:
+                return False
+            for path in (_shard_path(self.directory, entry.name), self.directory / entry.name):
+                try:
+                    if path.stat().st_mtime != entry.fetched_at:
+                        continue
+                    path.unlink()
+                    evicted = True
+                except FileNotFoundError:
+                    continue
+        if evicted:
+            self._manifest.forget(entry.name)
+        return evicted
+
+    def entry_name(self, key: str) -> str:
+        """The name iter_entries() lists `key` under."""
+        return _entry_name(key)
+
+    def read_raw(self, name: str) -> Optional[bytes]:
+        """Stored bytes of a listed entry, as written (encoded, maybe compressed)."""
+        for path in (_shard_path(self.directory, name), self.directory / name):
+            try:
+                return path.read_bytes()
+            except FileNotFoundError:
+                continue
+        return None
+
+    def write_raw(self, name: str, data: bytes, *, fetched_at: float) -> None:
+        """Store already-encoded bytes under a listed name (cache bundle import)."""
+        if not _ENTRY_FILE_RE.match(name):
+            raise ValueError(f"Not a cache entry file name: {name!r}")
+        path = _shard_path(self.directory, name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with _file_lock(
+            self.directory / Path(name).with_suffix(".wlock"),
+            timeout=WRITE_LOCK_TIMEOUT_SECONDS,
+            stale_after=WRITE_LOCK_STALE_SECONDS,
+        ):
+            _atomic_write(path, data, fsync=self._fsync())
+            os.utime(path, (time.time(), fetched_at))
+            (self.directory / name).unlink(missing_ok=True)
+        self._manifest.record(name, _manifest_record(self.directory, path, len(data), fetched_at))
+
+    def compact_manifest(self) -> None:
+        """Rewrite the manifest journal from a scan of the directory."""
+        self._manifest.compact()
+
+    def sweep_temp_files(self, older_than: float = LOCK_STALE_SECONDS) -> int:
+        """Remove temp files abandoned by writers that crashed mid-write."""
+        removed = 0
+        cutoff = time.time() - older_than
+        for path in [*self.directory.glob(".*.tmp"), *self.directory.glob("*/.*.tmp")]:
+            try:
+                if path.stat().st_mtime < cutoff:
+                    path.unlink()
+                    removed += 1
+            except FileNotFoundError:
+                continue
+        return removed
+
+    def _fsync(self) -> bool:
+        return _fsync_writes if self.fsync is None else self.fsync
+
+    def lock_path(self, key: str) -> Path:
+        return _cache_path(self.directory, key).with_suffix(".lock")
+
+    def write_lock_path(self, key: str) -> Path:
+        return _cache_path(self.directory, key).with_suffix(".wlock")
+
+    def flight_key(self, key: str) -> str:
+        return str(_cache_path(self._resolved, key))
+
+    def _quarantine(self, path: Path, inode: int) -> None:
+        """Move an unreadable entry aside so it is not re-parsed on every run."""
+        target = self.directory / QUARANTINE_DIRNAME / f"{path.name}.{time.time_ns()}"
+        with _file_lock(
+            self.directory / path.with_suffix(".wlock").name,
+            timeout=WRITE_LOCK_TIMEOUT_SECONDS,
+            stale_after=WRITE_LOCK_STALE_SECONDS,
+        ) as acquired:
+            try:
+                # Leave it alone if a writer has replaced it since we read it.
+                if not acquired or os.stat(path).st_ino != inode:
+                    return
+                target.parent.mkdir(parents=True, exist_ok=True)
+                os.replace(path, target)
+            except FileNotFoundError:
+                return
+        self._manifest.forget(path.name)
+        self.quarantined += 1
+
+
+def _atomic_write(path: Path, data: bytes, *, fsync: bool) -> None:
+    """Write data to a temp file beside path, then rename it into place."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(data)
+            if fsync:
+                handle.flush()
+                os.fsync(handle.fileno())
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    if fsync and hasattr(os, "O_DIRECTORY"):
+        # Persist the rename itself, not just the file contents.
+        dir_fd = os.open(path.parent, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def configure_cache_writes(*, fsync: bool = False, encoding: CacheEncoding = LEGACY_ENCODING) -> None:
+    """Set how new entries are encoded and whether JSON writes are fsynced.
+
+    fsync makes writes durable across power loss at some cost in latency.
+    Backends constructed with their own settings keep them.
+    """
+    global _fsync_writes, _write_encoding
+    _fsync_writes = fsync
+    _write_encoding = encoding
+
+
+class SQLiteCacheBackend:
+    """All entries in one SQLite database in WAL mode.
 
+    Each row holds the key, the compact JSON payload, created/accessed
+    timestamps, and the schema version it was written under. Connections
+    are per thread; WAL lets readers proceed while another process writes.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        *,
+        schema_version: str | None = None,
+        encoding: CacheEncoding | None = None,
+    ):
+        self.path = Path(path)
+        self.schema_version = schema_version
+        self.encoding = encoding
+        self.quarantined = 0
+        self._resolved = self.path.resolve()
+        self._local = threading.local()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_entries ("
+            " key TEXT PRIMARY KEY,"
+            " payload BLOB NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL,"
+            " schema_version TEXT)"
+        )
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache_quarantine ("
+            " key TEXT NOT NULL,"
+            " payload BLOB,"
+            " quarantined_at REAL NOT NULL)"
+        )
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA busy_timeout = 30000")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str) -> Optional[Any]:
+        entry = self.get_entry(key)
+        return entry.value if entry is not None else None
+
+    def get_entry(self, key: str, *, probe: bool = False) -> Optional[CacheEntry]:
+        # Every lookup is an indexed query, so `probe` changes nothing here.
+        conn = self._connect()
+        row = conn.execute(
+            "SELECT payload, created_at, accessed_at FROM cache_entries WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None:
+            return None
+        try:
+            value = decode_payload(row[0])
+        except ValueError:
+            self._quarantine(key)
+            return None
+        now = time.time()
+        if now - row[2] > ACCESS_TOUCH_SECONDS:
+            conn.execute("UPDATE cache_entries SET accessed_at = ? WHERE key = ?", (now, key))
+        return CacheEntry(value, row[1], len(row[0]))
+
+    def set(self, key: str, value: Any, *, fetched_at: float | None = None) -> Path:
+        payload = encode_payload(value, self._encoding())
+        now = time.time()
+        self._connect().execute(
+            "INSERT INTO cache_entries (key, payload, created_at, accessed_at, schema_version)"
+            " VALUES (?, ?, ?, ?, ?)"
+            " ON CONFLICT(key) DO UPDATE SET payload = excluded.payload,"
+            " created_at = excluded.created_at, accessed_at = excluded.accessed_at,"
+            " schema_version = excluded.schema_version",
+            (key, payload, now if fetched_at is None else fetched_at, now, self.schema_version),
+        )
+        return self.path
+
+    def migrate(self, encoding: CacheEncoding) -> dict[str, int]:
+        """Re-encode every row in place; timestamps are left alone."""
+        encoding = replace(encoding, compact=True)
+        counts = {"rewritten": 0, "unchanged": 0, "unreadable": 0}
+        conn = self._connect()
+        keys = [row[0] for row in conn.execute("SELECT key FROM cache_entries ORDER BY key")]
+        for key in keys:
+            with conn:
+                conn.execute("BEGIN IMMEDIATE")
+                row = conn.execute("SELECT payload FROM cache_entries WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    continue
+                try:
+                    payload = encode_payload(decode_payload(row[0]), encoding)
+                except ValueError:
+                    counts["unreadable"] += 1
+                    continue
+                if payload == row[0]:
+                    counts["unchanged"] += 1
+                    continue
+                conn.execute("UPDATE cache_entries SET payload = ? WHERE key = ?", (payload, key))
+            counts["rewritten"] += 1
+        return counts
+
+    def iter_entries(self) -> Iterator[StoredEntry]:
+        rows = self._connect().execute(
+            "SELECT key, length(payload), created_at, accessed_at FROM cache_entries"
+        ).fetchall()
+        for key, size, created_at, accessed_at in rows:
+            yield StoredEntry(key, size, created_at, accessed_at)
+
+    def entry_name(self, key: str) -> str:
+        return key
+
+    def read_raw(self, name: str) -> Optional[bytes]:
+        row = self._connect().execute(
+            "SELECT payload FROM cache_entries WHERE key = ?", (name,)
+        ).fetchone()
+        return bytes(row[0]) if row is not None else None
+
+    def write_raw(self, name: str, data: bytes, *, fetched_at: float) -> None:
+        self._connect().execute(
+            "INSERT INTO cache_entries (key, payload, created_at, accessed_at, schema_version)"
+            " VALUES (?, ?, ?, ?, ?)"
+            " ON CONFLICT(key) DO UPDATE SET payload = excluded.payload,"
+            " created_at = excluded.created_at, accessed_at = excluded.accessed_at,"
+            " schema_version = excluded.schema_version",
+            (name, data, fetched_at, time.time(), self.schema_version),
+        )
+
+    def evict(self, entry: StoredEntry) -> bool:
+        """Delete a listed entry unless it was rewritten since it was listed."""
+        cursor = self._connect().execute(
+            "DELETE FROM cache_entries WHERE key = ? AND created_at = ?",
+            (entry.name, entry.fetched_at),
+        )
+        return cursor.rowcount > 0
+
+    def _encoding(self) -> CacheEncoding:
+        # Rows are always compact; indentation buys nothing inside a database.
+        return replace(self.encoding or _write_encoding, compact=True)
+
+    def _quarantine(self, key: str) -> None:
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            conn.execute(
+                "INSERT INTO cache_quarantine (key, payload, quarantined_at)"
+                " SELECT key, payload, ? FROM cache_entries WHERE key = ?",
+                (time.time(), key),
+            )
+            conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+        self.quarantined += 1
+
+    def lock_path(self, key: str) -> Path:
+        return Path(f"{self.path}.locks") / f"{normalize_key(key)[:100]}_{_hash_key(key)}.lock"
+
+    def flight_key(self, key: str) -> str:
+        return f"{self._resolved}::{key}"
+
+
+CacheLocation = str | Path | CacheBackend
+
+_backends_lock = threading.Lock()
+_backends: dict[str, CacheBackend] = {}
+
+
+def is_sqlite_location(location: str | Path) -> bool:
+    """True when a cache location names a SQLite database rather than a directory."""
+    return Path(location).suffix.lower() in SQLITE_SUFFIXES
+
+
+def get_backend(location: CacheLocation) -> CacheBackend:
+    """Resolve a cache location to its backend, reusing one instance per path.
+
+    Locations are keyed by resolved path, so `cache`, `./cache` and its
+    absolute path share one backend and one manifest.
+    """
+    if isinstance(location, CacheBackend):
+        return location
+    name = os.fspath(location)
+    resolved = str(Path(name).resolve())
+    with _backends_lock:
+        backend = _backends.get(resolved)
+        if backend is None:
+            # Built on the resolved path: a later chdir must not move the cache.
+            if is_sqlite_location(resolved):
+                backend = SQLiteCacheBackend(resolved)
+            else:
+                backend = JsonFileBackend(resolved)
+            _backends[resolved] = backend
+        return backend
+
+
+class MemoryLRU:
+    """Thread-safe LRU of decoded cache values, bounded by entries and bytes.
+
+    Sizes are the stored (encoded) size of each entry, a cheap stand-in for
+    its in-memory footprint. Only hits are remembered: a miss always goes to
+    the backend, so entries written by other processes are picked up.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = MEMORY_CACHE_MAX_ENTRIES,
+        max_bytes: int = MEMORY_CACHE_MAX_BYTES,
+    ):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[str, tuple[Any, int]] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, ident: str) -> tuple[bool, Any]:
+        with self._lock:
+            entry = self._entries.get(ident)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(ident)
+            self.hits += 1
+            return True, entry[0]
+
+    def put(self, ident: str, value: Any, size: int) -> None:
+        if size > self.max_bytes or self.max_entries < 1:
+            return
+        with self._lock:
+            old = self._entries.pop(ident, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._entries[ident] = (value, size)
+            self._bytes += size
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
 
-def cache_get(key: str, cache_dir: str | Path) -> Optional[Any]:
-    """Read a cached value, or None if not found."""
-    path = _cache_path(cache_dir, key)
-    if path.exists():
-        return json.loads(path.read_text(encoding="utf-8"))
-    return None
+    def invalidate(self, ident: str) -> None:
+        with self._lock:
+            old = self._entries.pop(ident, None)
+            if old is not None:
+                self._bytes -= old[1]
 
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
 
-def cache_set(key: str, value: Any, cache_dir: str | Path) -> Path:
-    """Write a value to the cache. Returns the file path."""
-    path = _cache_path(cache_dir, key)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps(value, indent=2, default=str), encoding="utf-8")
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+            }
+
+
+_memory_cache = MemoryLRU()
+
+
+def configure_memory_cache(
+    *,
+    max_entries: int = MEMORY_CACHE_MAX_ENTRIES,
+    max_bytes: int = MEMORY_CACHE_MAX_BYTES,
+) -> None:
+    """Resize the in-process LRU (max_entries=0 disables it) and drop its contents."""
+    global _memory_cache
+    _memory_cache = MemoryLRU(max_entries=max_entries, max_bytes=max_bytes)
+
+
+def memory_cache_stats() -> dict[str, int]:
+    """Hit/miss/eviction counters and current size of the in-process LRU."""
+    return _memory_cache.stats()
+
+
+def clear_memory_cache() -> None:
+    """Drop every in-process entry and reset the counters."""
+    _memory_cache.clear()
+
+
+def _read_entry(key: str, location: CacheLocation, *, use_memory: bool = True) -> Optional[CacheEntry]:
+    backend = get_backend(location)
+    ident = backend.flight_key(key)
+    memory = _memory_cache
+    if use_memory:
+        found, entry = memory.get(ident)
+        if found:
+            # Copy: callers own what they get back and may edit it in place.
+            return replace(entry, value=copy.deepcopy(entry.value))
+
+    get_entry = getattr(backend, "get_entry", None)
+    if get_entry is not None:
+        # Bypassing memory means "check for real": don't trust the index either.
+        entry = get_entry(key) if use_memory else get_entry(key, probe=True)
+    else:
+        # Backends without metadata: treat the value as fetched just now.
+        value = backend.get(key)
+        entry = None if value is None else CacheEntry(
+            value, time.time(), len(json.dumps(value, default=str))
+        )
+    if entry is None:
+        return None
+    negative = NegativeResult.from_payload(entry.value)
+    if negative is not None:
+        entry = replace(entry, value=negative.value, negative=negative)
+    memory.put(ident, entry, entry.size)
+    return replace(entry, value=copy.deepcopy(entry.value))
+
+
+def cache_get_entry(key: str, cache_dir: CacheLocation) -> Optional[CacheEntry]:
+    """Read a cached value with its fetched-at metadata, or None if not found."""
+    return _read_entry(key, cache_dir)
+
+
+def cache_get(key: str, cache_dir: CacheLocation) -> Optional[Any]:
+    """Read a cached value, or None if not found. The caller gets its own copy."""
+    entry = _read_entry(key, cache_dir)
+    return entry.value if entry is not None else None
+
+
+def cache_set(
+    key: str,
+    value: Any,
+    cache_dir: CacheLocation,
+    *,
+    fetched_at: float | None = None,
+) -> Path:
+    """Write a value to the cache. Returns the file it was written to.
+
+    Pass `fetched_at` to keep an older entry's age when rewriting it.
+    """
+    backend = get_backend(cache_dir)
+    path = backend.set(key, value) if fetched_at is None else backend.set(key, value, fetched_at=fetched_at)
+    _memory_cache.invalidate(backend.flight_key(key))
     return path
 
 
+def migrate_cache(cache_dir: CacheLocation, encoding: CacheEncoding) -> dict[str, int]:
+    """Rewrite every entry in a cache location in the given encoding.
+
+    Safe to run while other processes use the cache: each entry is
+    rewritten atomically under its write lock. Returns counts of
+    rewritten, unchanged, and unreadable entries.
+    """
+    return get_backend(cache_dir).migrate(encoding)
+
+
+class _Flight:
+    """One in-progress live call that other callers can wait on."""
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: BaseException | None = None
+
+
+_flights_lock = threading.Lock()
+_flights: dict[str, _Flight] = {}
+_async_flights: dict[tuple[int, str], asyncio.Task] = {}
+
+
+def single_flight(flight_key: str, fn: Callable[[], Any]) -> Any:
+    """Run fn() at most once at a time per key within this process.
+
+    The first caller runs fn(); callers arriving while it is in flight block
+    until it finishes and receive a deep copy of its result (or re-raise its
+    exception). Once the flight lands the key is released.
+    """
+    with _flights_lock:
+        flight = _flights.get(flight_key)
+        is_leader = flight is None
+        if is_leader:
+            flight = _flights[flight_key] = _Flight()
+
+    if not is_leader:
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return copy.deepcopy(flight.result)
+
+    try:
+        flight.result = fn()
+        return flight.result
+    except BaseException as exc:
+        flight.error = exc
+        raise
+    finally:
+        with _flights_lock:
+            _flights.pop(flight_key, None)
+        flight.done.set()
+
+
+@contextmanager
+def _file_lock(
+    lock_path: Path,
+    *,
+    timeout: float = LOCK_TIMEOUT_SECONDS,
+    stale_after: float = LOCK_STALE_SECONDS,
+) -> Iterator[bool]:
+    """Hold an advisory lock file for the duration of the block.
+
+    Yields True when the lock was acquired. Locks older than `stale_after`
+    are assumed abandoned by a crashed process and broken. If the lock is
+    still held after `timeout`, yields False so the caller can proceed
+    unlocked rather than stall the run.
+    """
+    lock_path.parent.mkdir(parents=True, exist_ok=True)
+    deadline = time.monotonic() + timeout
+    acquired = False
+    while True:
+        try:
+            fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            try:
+                if time.time() - lock_path.stat().st_mtime > stale_after:
+                    lock_path.unlink(missing_ok=True)
+                    continue
+            except FileNotFoundError:
+                continue
+            if time.monotonic() >= deadline:
+                break
+            time.sleep(_LOCK_POLL_SECONDS)
+            continue
+        os.write(fd, str(os.getpid()).encode())
+        os.close(fd)
+        acquired = True
+        break
+
+    try:
+        yield acquired
+    finally:
+        if acquired:
+            lock_path.unlink(missing_ok=True)
+
+
+def _flight_key(key: str, cache_dir: CacheLocation) -> str:
+    """Identify a flight by its target cache entry, not just the raw key."""
+    return get_backend(cache_dir).flight_key(key)
+
+
+# Set while a background refresh runs: nested cached_calls refetch stale
+# entries instead of serving them, so a refreshed pack is assembled from
+# fresh hits rather than the stale ones beneath it.
+_revalidating: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "war_room_cache_revalidating",
+    default=False,
+)
+
+
+
+def in_background_refresh() -> bool:
+    """True while running inside a stale-while-revalidate refresh."""
+    return _revalidating.get()
+
+
+_refresh_lock = threading.Lock()
+_refresh_pool: ThreadPoolExecutor | None = None
+_refreshing: dict[str, Future] = {}
+_refresh_counts = {"scheduled": 0, "completed": 0, "failed": 0}
+
+
+def _count_refresh(outcome: str) -> None:
+    with _refresh_lock:
+        _refresh_counts[outcome] += 1
+
+
+def _schedule_refresh(flight_key: str, refresh: Callable[[], Any]) -> None:
+    """Run refresh() on the background pool unless one is already queued for this entry."""
+    global _refresh_pool
+    with _refresh_lock:
+        if flight_key in _refreshing:
+            return
+        if _refresh_pool is None:
+            _refresh_pool = ThreadPoolExecutor(
+                max_workers=REFRESH_WORKERS,
+                thread_name_prefix="cache-refresh",
+            )
+        _refresh_counts["scheduled"] += 1
+        _refreshing[flight_key] = _refresh_pool.submit(_run_refresh, flight_key, refresh)
+
+
+def _run_refresh(flight_key: str, refresh: Callable[[], Any]) -> None:
+    token = _revalidating.set(True)
+    outcome = "failed"
+    try:
+        refresh()
+        outcome = "completed"
+    except Exception:
+        # The stale entry keeps being served; the next stale read tries again.
+        pass
+    finally:
+        _revalidating.reset(token)
+        with _refresh_lock:
+            _refreshing.pop(flight_key, None)
+            _refresh_counts[outcome] += 1
+
+
+def wait_for_refreshes(timeout: float | None = None) -> bool:
+    """Block until queued background refreshes finish; False on timeout."""
+    with _refresh_lock:
+        pending = list(_refreshing.values())
+    _, not_done = wait_futures(pending, timeout=timeout)
+    return not not_done
+
+
+def refresh_stats() -> dict[str, int]:
+    """Counts of background refreshes scheduled, completed, failed, and in flight."""
+    with _refresh_lock:
+        return {**_refresh_counts, "pending": len(_refreshing)}
+
+
+def _serve_stale(entry: CacheEntry, ttl: float, max_stale: float | None) -> bool:
+    """Whether a stale entry may be returned while it is refreshed."""
+    if _revalidating.get() or entry.negative is not None:
+        return False
+    return max_stale is None or entry.age <= ttl + max_stale
+
+
+def _entry_value(key: str, entry: CacheEntry) -> Any:
+    """The value a cache hit returns; recorded failures are re-raised."""
+    if entry.negative is not None and entry.negative.raised:
+        raise CachedFailure(key, entry.negative)
+    return entry.value
+
+
+def _store_result(key: str, result: Any, cache_dir: CacheLocation) -> Any:
+    """Cache fn()'s result and return the value callers should see."""
+    if not isinstance(result, NegativeResult):
+        cache_set(key, result, cache_dir)
+        return result
+    if result.reason not in NEGATIVE_TTLS:
+        raise ValueError(f"Unknown negative-cache reason: {result.reason!r}")
+    if result.ttl > 0:
+        current = _read_entry(key, cache_dir, use_memory=False)
+        # A failed refresh must not clobber the good entry it was refreshing.
+        if current is None or current.negative is not None:
+            cache_set(key, result.to_payload(), cache_dir)
+    return result.value
+
+
+def _store_failure(
+    key: str,
+    exc: BaseException,
+    cache_dir: CacheLocation,
+    classify_error: Callable[[BaseException], Optional[str]] | None,
+) -> None:
+    reason = classify_error(exc) if classify_error is not None else None
+    if reason is not None:
+        detail = f"{type(exc).__name__}: {exc}"
+        _store_result(key, NegativeResult(reason, detail=detail, raised=True), cache_dir)
+
+
 def cached_call(
     key: str,
     fn: Callable[[], Any],
     *,
-    cache_samples_dir: str | Path = "cache_samples",
-    cache_dir: str | Path = "cache",
+    cache_samples_dir: CacheLocation = "cache_samples",
+    cache_dir: CacheLocation = "cache",
     use_cache: bool = True,
+    cross_process: bool = False,
+    ttl: float | None = None,
+    max_stale: float | None = None,
+    classify_error: Callable[[BaseException], Optional[str]] | None = None,
 ) -> Any:
     """Cache-first call wrapper.
 
     1. Check cache_samples/ (committed demo fixtures)
     2. Check cache/ (runtime cache)
     3. Call fn(), save result to cache/
+
+    With `ttl` (seconds), runtime entries older than the TTL are stale: they
+    are returned at once while fn() refreshes them in the background, unless
+    they are more than `max_stale` seconds past the TTL, in which case the
+    call blocks on a fresh fetch. Committed samples never expire.
+
+    fn() may return a NegativeResult to cache a failed or empty lookup
+    under its reason's TTL. `classify_error` maps an exception from fn() to
+    such a reason (or None to leave it uncached); a recorded failure is
+    re-raised as CachedFailure until it expires.
+
+    Concurrent misses on the same key share one fn() call. Set
+    `cross_process=True` to also serialize misses across processes with a
+    lock file beside the cache entry.
     """
+    flight_key = _flight_key(key, cache_dir)
+
+    def _fetch_and_store() -> Any:
+        if use_cache:
+            # A flight (possibly in another process) may have refreshed it
+            # since our read; check the backend, not the memory cache.
+            entry = _read_entry(key, cache_dir, use_memory=False)
+            if entry is not None and entry.is_fresh(ttl):
+                return _entry_value(key, entry)
+        try:
+            result = fn()
+        except Exception as exc:
+            _store_failure(key, exc, cache_dir, classify_error)
+            raise
+        return _store_result(key, result, cache_dir)
+
+    def _leader() -> Any:
+        if not cross_process:
+            return _fetch_and_store()
+        with _file_lock(get_backend(cache_dir).lock_path(key)):
+            return _fetch_and_store()
+
     if use_cache:
         # Layer 1: committed samples
         result = cache_get(key, cache_samples_dir)
         if result is not None:
+            count("cache_samples")
             return result
 
         # Layer 2: runtime cache
-        result = cache_get(key, cache_dir)
+        entry = cache_get_entry(key, cache_dir)
+        if entry is not None:
+            if entry.is_fresh(ttl):
+                count("cache_fresh" if entry.negative is None else "cache_negative")
+                return _entry_value(key, entry)
+            if _serve_stale(entry, ttl, max_stale):
+                count("cache_stale")
+                _schedule_refresh(flight_key, lambda: single_flight(flight_key, _leader))
+                return entry.value
+
+    # Layer 3: live call, coalesced across concurrent callers
+    count("cache_miss")
+    return single_flight(flight_key, _leader)
+
+
+async def cached_call_async(
+    key: str,
+    fn: Callable[[], Awaitable[Any]],
+    *,
+    cache_samples_dir: CacheLocation = "cache_samples",
+    cache_dir: CacheLocation = "cache",
+    use_cache: bool = True,
+    ttl: float | None = None,
+    max_stale: float | None = None,
+    classify_error: Callable[[BaseException], Optional[str]] | None = None,
+) -> Any:
+    """Async variant of cached_call: same lookup order, awaits fn() on a miss.
+
+    Concurrent misses on the same key within one event loop share one task;
+    stale entries are refreshed by a background task on the running loop.
+    """
+    loop = asyncio.get_running_loop()
+    flight_key = (id(loop), _flight_key(key, cache_dir))
+
+    async def _fetch_and_store() -> Any:
+        try:
+            try:
+                result = await fn()
+            except Exception as exc:
+                _store_failure(key, exc, cache_dir, classify_error)
+                raise
+            return _store_result(key, result, cache_dir)
+        finally:
+            _async_flights.pop(flight_key, None)
+
+    if use_cache:
+        result = cache_get(key, cache_samples_dir)
         if result is not None:
+            count("cache_samples")
             return result
 
-    # Layer 3: live call
-    result = fn()
-    cache_set(key, result, cache_dir)
-    return result
+        entry = cache_get_entry(key, cache_dir)
+        if entry is not None:
+            if entry.is_fresh(ttl):
+                count("cache_fresh" if entry.negative is None else "cache_negative")
+                return _entry_value(key, entry)
+            if _serve_stale(entry, ttl, max_stale):
+                count("cache_stale")
+                if flight_key not in _async_flights:
+                    context = contextvars.copy_context()
+                    context.run(_revalidating.set, True)
+                    task = loop.create_task(_fetch_and_store(), context=context)
+                    _async_flights[flight_key] = task
+                    _count_refresh("scheduled")
+                    task.add_done_callback(_record_async_refresh)
+                return entry.value
+
+    count("cache_miss")
+    task = _async_flights.get(flight_key)
+    if task is not None:
+        return copy.deepcopy(await asyncio.shield(task))
+
+    task = asyncio.ensure_future(_fetch_and_store())
+    _async_flights[flight_key] = task
+    return await asyncio.shield(task)
+
+
+def _record_async_refresh(task: asyncio.Task) -> None:
+    # Retrieving the exception also keeps asyncio from logging it as unhandled.
+    failed = task.cancelled() or task.exception() is not None
+    _count_refresh("failed" if failed else "completed")
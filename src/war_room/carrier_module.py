@@ -6,15 +6,48 @@ denial patterns, regulatory signals, and rebuttal angles.
 
 from __future__ import annotations
 
-from typing import Any
+from typing import Any, AsyncIterator, Iterator
 
-from war_room.cache_io import cache_get, cached_call
-from war_room.exa_client import ExaClient
+from war_room.exa_client import AsyncExaClient, ExaClient
 from war_room.models import carrier_doc_pack_to_payload
-from war_room.query_plan import CaseIntake, generate_query_plan
+from war_room.query_plan import CaseIntake, QuerySpec
+from war_room.retrieval import (
+    DEFAULT_MAX_CONCURRENCY,
+    ModulePack,
+    PackSnapshot,
+    build_pack,
+    build_pack_async,
+    pack_cache_key,
+    stream_pack,
+    stream_pack_async,
+)
+from war_room.run_plan import RunPlan, module_queries
 from war_room.source_scoring import score_url
 
 
+def carrier_case_key(intake: CaseIntake) -> str:
+    """Plain cache key of the carrier doc pack, as committed in cache_samples/."""
+    return f"carrier__{intake.carrier}__{intake.event_name}__{intake.state}"
+
+
+def carrier_pack_key(intake: CaseIntake, queries: list[QuerySpec]) -> str:
+    """Runtime cache key of the carrier doc pack built from `queries`."""
+    return pack_cache_key(carrier_case_key(intake), queries)
+
+
+def _module_pack(intake: CaseIntake, plan: RunPlan | None) -> ModulePack:
+    queries = module_queries(intake, "carrier_docs", plan)
+    return ModulePack(
+        module="carrier_docs",
+        label="carrier pack",
+        case_key=carrier_case_key(intake),
+        pack_key=carrier_pack_key(intake, queries),
+        queries=queries,
+        assemble=lambda results: _assemble_pack(intake, results),
+        empty=lambda reason: _empty_carrier_pack(intake, reason),
+    )
+
+
 def build_carrier_doc_pack(
     intake: CaseIntake,
     client: ExaClient | None,
@@ -22,45 +55,89 @@ def build_carrier_doc_pack(
     use_cache: bool = True,
     cache_dir: str = "cache",
     cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
 ) -> dict[str, Any]:
     """Build a carrier document pack for the case."""
-    case_key = f"carrier__{intake.carrier}__{intake.event_name}__{intake.state}"
-
-    # Graceful fallback: no client available. Prefer cache, then return safe empty payload.
-    if client is None:
-        if use_cache:
-            cached = cache_get(case_key, cache_samples_dir)
-            if cached is None:
-                cached = cache_get(case_key, cache_dir)
-            if cached is not None:
-                return cached
-        return _empty_carrier_pack(
-            intake,
-            "No Exa client available and no cached carrier pack found.",
-        )
+    return build_pack(
+        _module_pack(intake, plan),
+        client,
+        use_cache=use_cache,
+        cache_dir=cache_dir,
+        cache_samples_dir=cache_samples_dir,
+        plan=plan,
+    )
+
 
-    def _fetch() -> dict[str, Any]:
-        queries = [q for q in generate_query_plan(intake) if q.module == "carrier_docs"]
-        all_results: list[dict] = []
-
-        for query in queries:
-            hits = client.search(
-                query.query,
-                k=5,
-                include_domains=query.preferred_domains or None,
-            )
-            for hit in hits:
-                hit["category"] = query.category
-            all_results.extend(hits)
-
-        return _assemble_pack(intake, all_results)
-
-    return cached_call(
-        case_key,
-        _fetch,
+async def build_carrier_doc_pack_async(
+    intake: CaseIntake,
+    client: AsyncExaClient | None,
+    *,
+    use_cache: bool = True,
+    cache_dir: str = "cache",
+    cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> dict[str, Any]:
+    """Async variant of build_carrier_doc_pack; runs carrier queries concurrently."""
+    return await build_pack_async(
+        _module_pack(intake, plan),
+        client,
+        use_cache=use_cache,
+        cache_dir=cache_dir,
         cache_samples_dir=cache_samples_dir,
+        plan=plan,
+        max_concurrency=max_concurrency,
+    )
+
+
+def stream_carrier_doc_pack(
+    intake: CaseIntake,
+    client: ExaClient | None,
+    *,
+    use_cache: bool = True,
+    cache_dir: str = "cache",
+    cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
+    snapshot_every: int = 1,
+) -> Iterator[PackSnapshot]:
+    """Streaming variant of build_carrier_doc_pack.
+
+    Yields a partial pack after every `snapshot_every` queries, then the
+    final pack, which is cached exactly as build_carrier_doc_pack would cache it.
+    Cache hits and fallbacks yield a single final snapshot.
+    """
+    return stream_pack(
+        _module_pack(intake, plan),
+        client,
+        use_cache=use_cache,
         cache_dir=cache_dir,
+        cache_samples_dir=cache_samples_dir,
+        plan=plan,
+        snapshot_every=snapshot_every,
+    )
+
+
+def stream_carrier_doc_pack_async(
+    intake: CaseIntake,
+    client: AsyncExaClient | None,
+    *,
+    use_cache: bool = True,
+    cache_dir: str = "cache",
+    cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    snapshot_every: int = 1,
+) -> AsyncIterator[PackSnapshot]:
+    """Async variant of stream_carrier_doc_pack; snapshots arrive as queries complete."""
+    return stream_pack_async(
+        _module_pack(intake, plan),
+        client,
         use_cache=use_cache,
+        cache_dir=cache_dir,
+        cache_samples_dir=cache_samples_dir,
+        plan=plan,
+        max_concurrency=max_concurrency,
+        snapshot_every=snapshot_every,
     )
 
 
@@ -8,13 +8,23 @@ Avoids Westlaw/Lexis as primary sources.
 from __future__ import annotations
 
 import re
-from typing import Any
+from typing import Any, AsyncIterator, Iterator
 from urllib.parse import urlparse
 
-from war_room.cache_io import cache_get, cached_call
-from war_room.exa_client import ExaClient
+from war_room.exa_client import AsyncExaClient, ExaClient
 from war_room.models import caselaw_pack_to_payload
-from war_room.query_plan import CaseIntake, generate_query_plan
+from war_room.query_plan import CaseIntake, QuerySpec
+from war_room.retrieval import (
+    DEFAULT_MAX_CONCURRENCY,
+    ModulePack,
+    PackSnapshot,
+    build_pack,
+    build_pack_async,
+    pack_cache_key,
+    stream_pack,
+    stream_pack_async,
+)
+from war_room.run_plan import RunPlan, module_queries
 from war_room.source_scoring import PAYWALLED_DOMAINS, score_url
 
 CASELAW_EXCLUDE_DOMAINS = list(PAYWALLED_DOMAINS)
@@ -69,6 +79,30 @@ def _is_case_like(result: dict) -> bool:
     return False
 
 
+def caselaw_case_key(intake: CaseIntake) -> str:
+    """Plain cache key of the caselaw pack, as committed in cache_samples/."""
+    return f"caselaw__{intake.event_name}__{intake.carrier}__{intake.state}"
+
+
+def caselaw_pack_key(intake: CaseIntake, queries: list[QuerySpec]) -> str:
+    """Runtime cache key of the caselaw pack built from `queries`."""
+    return pack_cache_key(caselaw_case_key(intake), queries, exclude_domains=CASELAW_EXCLUDE_DOMAINS)
+
+
+def _module_pack(intake: CaseIntake, plan: RunPlan | None) -> ModulePack:
+    queries = module_queries(intake, "caselaw", plan)
+    return ModulePack(
+        module="caselaw",
+        label="case-law pack",
+        case_key=caselaw_case_key(intake),
+        pack_key=caselaw_pack_key(intake, queries),
+        queries=queries,
+        assemble=lambda results: _assemble_pack(intake, results),
+        empty=lambda reason: _empty_caselaw_pack(reason),
+        exclude_domains=CASELAW_EXCLUDE_DOMAINS,
+    )
+
+
 def build_caselaw_pack(
     intake: CaseIntake,
     client: ExaClient | None,
@@ -76,45 +110,89 @@ def build_caselaw_pack(
     use_cache: bool = True,
     cache_dir: str = "cache",
     cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
 ) -> dict[str, Any]:
     """Build a case law pack organized by legal issue."""
-    case_key = f"caselaw__{intake.event_name}__{intake.carrier}__{intake.state}"
-
-    # Graceful fallback: no client available. Prefer cache, then return safe empty payload.
-    if client is None:
-        if use_cache:
-            cached = cache_get(case_key, cache_samples_dir)
-            if cached is None:
-                cached = cache_get(case_key, cache_dir)
-            if cached is not None:
-                return cached
-        return _empty_caselaw_pack(
-            "No Exa client available and no cached case-law pack found.",
-        )
-
-    def _fetch() -> dict[str, Any]:
-        queries = [q for q in generate_query_plan(intake) if q.module == "caselaw"]
-        all_results: list[dict] = []
-
-        for query in queries:
-            hits = client.search(
-                query.query,
-                k=5,
-                include_domains=query.preferred_domains or None,
-                exclude_domains=CASELAW_EXCLUDE_DOMAINS,
-            )
-            for hit in hits:
-                hit["category"] = query.category
-            all_results.extend(hits)
-
-        return _assemble_pack(intake, all_results)
-
-    return cached_call(
-        case_key,
-        _fetch,
+    return build_pack(
+        _module_pack(intake, plan),
+        client,
+        use_cache=use_cache,
+        cache_dir=cache_dir,
         cache_samples_dir=cache_samples_dir,
+        plan=plan,
+    )
+
+
+async def build_caselaw_pack_async(
+    intake: CaseIntake,
+    client: AsyncExaClient | None,
+    *,
+    use_cache: bool = True,
+    cache_dir: str = "cache",
+    cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> dict[str, Any]:
+    """Async variant of build_caselaw_pack; runs caselaw queries concurrently."""
+    return await build_pack_async(
+        _module_pack(intake, plan),
+        client,
+        use_cache=use_cache,
         cache_dir=cache_dir,
+        cache_samples_dir=cache_samples_dir,
+        plan=plan,
+        max_concurrency=max_concurrency,
+    )
+
+
+def stream_caselaw_pack(
+    intake: CaseIntake,
+    client: ExaClient | None,
+    *,
+    use_cache: bool = True,
+    cache_dir: str = "cache",
+    cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
+    snapshot_every: int = 1,
+) -> Iterator[PackSnapshot]:
+    """Streaming variant of build_caselaw_pack.
+
+    Yields a partial pack after every `snapshot_every` queries, then the
+    final pack, which is cached exactly as build_caselaw_pack would cache it.
+    Cache hits and fallbacks yield a single final snapshot.
+    """
+    return stream_pack(
+        _module_pack(intake, plan),
+        client,
         use_cache=use_cache,
+        cache_dir=cache_dir,
+        cache_samples_dir=cache_samples_dir,
+        plan=plan,
+        snapshot_every=snapshot_every,
+    )
+
+
+def stream_caselaw_pack_async(
+    intake: CaseIntake,
+    client: AsyncExaClient | None,
+    *,
+    use_cache: bool = True,
+    cache_dir: str = "cache",
+    cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    snapshot_every: int = 1,
+) -> AsyncIterator[PackSnapshot]:
+    """Async variant of stream_caselaw_pack; snapshots arrive as queries complete."""
+    return stream_pack_async(
+        _module_pack(intake, plan),
+        client,
+        use_cache=use_cache,
+        cache_dir=cache_dir,
+        cache_samples_dir=cache_samples_dir,
+        plan=plan,
+        max_concurrency=max_concurrency,
+        snapshot_every=snapshot_every,
     )
 
 
@@ -0,0 +1,296 @@
+"""Record/replay ("cassette") providers for deterministic offline runs.
+
+A cassette captures every raw `search` / `get_contents` request and response
+an ExaClient makes during a live run. Replaying it feeds the same responses
+back, in the same order, without touching the network, so whole-pipeline
+load tests and benchmarks are reproducible. Replay latency is configurable:
+a fixed delay plus jitter, or the recorded latency scaled by `time_scale`.
+
+Providers plug into the clients through their `provider` argument:
+
+    cassette = Cassette("runs/milton.cassette.jsonl.gz")
+    client = ExaClient(provider=RecordingExa(Exa(api_key), cassette))
+    ...
+    cassette.save()
+
+    client = ExaClient(provider=ReplayExa(Cassette.load(path), latency=0.05))
+
+Recorded provider errors are replayed as errors, so retry and circuit-breaker
+behavior is reproduced too. A request the cassette has never seen raises
+CassetteMiss, which clients treat as a non-retryable client error.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import gzip
+import json
+import random
+import threading
+import time
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any, Callable
+
+CASSETTE_VERSION = 1
+
+_RESULT_FIELDS = ("id", "url", "title", "text", "published_date", "author", "score")
+_STATUS_FIELDS = ("id", "status", "source")
+
+
+class CassetteMiss(LookupError):
+    """Raised on replay when a request was never recorded."""
+
+    # Read by retry_policy.error_status_code: a miss is a client error, not retryable.
+    status_code = 404
+
+
+def request_key(method: str, args: dict[str, Any]) -> str:
+    """Canonical JSON for one provider request, used to match replays."""
+    return json.dumps({"method": method, **args}, sort_keys=True, default=_jsonable)
+
+
+def _jsonable(value: Any) -> Any:
+    if hasattr(value, "__dict__"):
+        return {k: v for k, v in vars(value).items() if v is not None}
+    return str(value)
+
+
+def _dump_response(response: Any) -> dict[str, Any]:
+    results = [
+        {name: getattr(result, name, None) for name in _RESULT_FIELDS}
+        for result in getattr(response, "results", None) or []
+    ]
+    statuses = [
+        {name: getattr(status, name, None) for name in _STATUS_FIELDS}
+        for status in getattr(response, "statuses", None) or []
+    ]
+    return {"results": results, "statuses": statuses}
+
+
+def _load_response(payload: dict[str, Any]) -> SimpleNamespace:
+    return SimpleNamespace(
+        results=[SimpleNamespace(**result) for result in payload.get("results", [])],
+        statuses=[SimpleNamespace(**status) for status in payload.get("statuses", [])],
+    )
+
+
+class Cassette:
+    """An ordered list of recorded provider interactions.
+
+    Files are JSON lines (gzip-compressed when the path ends in `.gz`): a
+    header line with the format version, then one line per interaction.
+    """
+
+    def __init__(self, path: str | Path | None = None):
+        self.path = Path(path) if path is not None else None
+        self.interactions: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path: str | Path) -> Cassette:
+        cassette = cls(path)
+        with _open(cassette.path, "rt") as handle:
+            lines = [line for line in handle if line.strip()]
+        if not lines:
+            return cassette
+        header = json.loads(lines[0])
+        if header.get("cassette_version") != CASSETTE_VERSION:
+            raise ValueError(f"Unsupported cassette version in {path}: {header!r}")
+        cassette.interactions = [json.loads(line) for line in lines[1:]]
+        return cassette
+
+    def save(self, path: str | Path | None = None) -> Path:
+        target = Path(path) if path is not None else self.path
+        if target is None:
+            raise ValueError("Cassette has no path; pass one to save()")
+        target.parent.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            interactions = list(self.interactions)
+        with _open(target, "wt") as handle:
+            handle.write(json.dumps({"cassette_version": CASSETTE_VERSION}) + "\n")
+            for interaction in interactions:
+                handle.write(json.dumps(interaction, separators=(",", ":"), default=str) + "\n")
+        return target
+
+    def record(
+        self,
+        key: str,
+        *,
+        response: Any = None,
+        error: BaseException | None = None,
+        elapsed: float,
+    ) -> None:
+        interaction: dict[str, Any] = {"request": key, "elapsed": round(elapsed, 4)}
+        if error is not None:
+            interaction["error"] = {"type": type(error).__name__, "message": str(error)}
+        else:
+            interaction["response"] = _dump_response(response)
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def __len__(self) -> int:
+        return len(self.interactions)
+
+
+def _open(path: Path, mode: str):
+    if path.suffix == ".gz":
+        return gzip.open(path, mode, encoding="utf-8")
+    return open(path, mode.replace("t", ""), encoding="utf-8")
+
+
+class _Recorder:
+    """Shared bookkeeping for the sync and async recording providers."""
+
+    def __init__(self, inner: Any, cassette: Cassette):
+        self._inner = inner
+        self.cassette = cassette
+
+    def _call(self, method: str, args: dict[str, Any], fn: Callable[[], Any]) -> Any:
+        key = request_key(method, args)
+        started = time.monotonic()
+        try:
+            response = fn()
+        except Exception as exc:
+            self.cassette.record(key, error=exc, elapsed=time.monotonic() - started)
+            raise
+        self.cassette.record(key, response=response, elapsed=time.monotonic() - started)
+        return response
+
+
+class RecordingExa(_Recorder):
+    """Wraps an exa-py `Exa` client and records every call into a cassette."""
+
+    def search(self, query: str, **kwargs: Any) -> Any:
+        return self._call(
+            "search",
+            {"query": query, **kwargs},
+            lambda: self._inner.search(query, **kwargs),
+        )
+
+    def get_contents(self, urls: list[str], **kwargs: Any) -> Any:
+        return self._call(
+            "get_contents",
+            {"urls": list(urls), **kwargs},
+            lambda: self._inner.get_contents(urls, **kwargs),
+        )
+
+
+class AsyncRecordingExa(_Recorder):
+    """Async counterpart to RecordingExa for an exa-py `AsyncExa` client."""
+
+    async def _acall(self, method: str, args: dict[str, Any], fn: Callable[[], Any]) -> Any:
+        key = request_key(method, args)
+        started = time.monotonic()
+        try:
+            response = await fn()
+        except Exception as exc:
+            self.cassette.record(key, error=exc, elapsed=time.monotonic() - started)
+            raise
+        self.cassette.record(key, response=response, elapsed=time.monotonic() - started)
+        return response
+
+    async def search(self, query: str, **kwargs: Any) -> Any:
+        return await self._acall(
+            "search",
+            {"query": query, **kwargs},
+            lambda: self._inner.search(query, **kwargs),
+        )
+
+    async def get_contents(self, urls: list[str], **kwargs: Any) -> Any:
+        return await self._acall(
+            "get_contents",
+            {"urls": list(urls), **kwargs},
+            lambda: self._inner.get_contents(urls, **kwargs),
+        )
+
+
+class _Player:
+    """Matches requests to recorded interactions and decides replay latency.
+
+    Identical requests are answered in recording order; once exhausted, the
+    last recorded answer repeats so longer replays (load tests) still work.
+    """
+
+    def __init__(
+        self,
+        cassette: Cassette,
+        *,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        time_scale: float | None = None,
+        seed: int | None = None,
+    ):
+        if latency < 0 or jitter < 0:
+            raise ValueError("latency and jitter must be non-negative")
+        self.cassette = cassette
+        self.latency = latency
+        self.jitter = jitter
+        self.time_scale = time_scale
+        self.replayed = 0
+        self.misses = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._by_key: dict[str, list[dict[str, Any]]] = {}
+        self._cursor: dict[str, int] = {}
+        for interaction in cassette.interactions:
+            self._by_key.setdefault(interaction["request"], []).append(interaction)
+
+    def _next(self, method: str, args: dict[str, Any]) -> tuple[dict[str, Any], float]:
+        key = request_key(method, args)
+        with self._lock:
+            recorded = self._by_key.get(key)
+            if not recorded:
+                self.misses += 1
+                raise CassetteMiss(f"No recorded {method} for request {key}")
+            index = self._cursor.get(key, 0)
+            self._cursor[key] = index + 1
+            self.replayed += 1
+            interaction = recorded[min(index, len(recorded) - 1)]
+            delay = self._delay(interaction)
+        return interaction, delay
+
+    def _delay(self, interaction: dict[str, Any]) -> float:
+        if self.time_scale is not None:
+            return interaction.get("elapsed", 0.0) * self.time_scale
+        return self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    @staticmethod
+    def _answer(interaction: dict[str, Any]) -> SimpleNamespace:
+        error = interaction.get("error")
+        if error is not None:
+            # exa-py surfaces HTTP failures as ValueError with the status in the message.
+            raise ValueError(error["message"])
+        return _load_response(interaction["response"])
+
+
+class ReplayExa(_Player):
+    """Drop-in stand-in for exa-py `Exa` that answers from a cassette."""
+
+    def search(self, query: str, **kwargs: Any) -> Any:
+        interaction, delay = self._next("search", {"query": query, **kwargs})
+        if delay > 0:
+            time.sleep(delay)
+        return self._answer(interaction)
+
+    def get_contents(self, urls: list[str], **kwargs: Any) -> Any:
+        interaction, delay = self._next("get_contents", {"urls": list(urls), **kwargs})
+        if delay > 0:
+            time.sleep(delay)
+        return self._answer(interaction)
+
+
+class AsyncReplayExa(_Player):
+    """Async stand-in for exa-py `AsyncExa` that answers from a cassette."""
+
+    async def search(self, query: str, **kwargs: Any) -> Any:
+        interaction, delay = self._next("search", {"query": query, **kwargs})
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self._answer(interaction)
+
+    async def get_contents(self, urls: list[str], **kwargs: Any) -> Any:
+        interaction, delay = self._next("get_contents", {"urls": list(urls), **kwargs})
+        if delay > 0:
+            await asyncio.sleep(delay)
+        return self._answer(interaction)
@@ -3,6 +3,9 @@
 For each case citation, runs ONE Exa search to check if it appears
 on a court/legal site. Reports confidence level, not verification.
 
+Failed and empty searches are cached as negative entries with short TTLs,
+so they are retried on a later run instead of being frozen as results.
+
 Mandatory disclaimer: KeyCite/Shepardize before reliance.
 """
 
@@ -10,9 +13,12 @@ from __future__ import annotations
 
 from typing import Any
 
-from war_room.cache_io import cached_call
+from war_room.cache_io import NegativeResult
+from war_room.cassette import CassetteMiss
 from war_room.exa_client import BudgetExhausted, ExaClient
 from war_room.models import citation_verify_pack_to_payload
+from war_room.retrieval import MODULE_TTLS, cached_versioned_call, search_failure_reason, versioned_key
+from war_room.retry_policy import TRANSIENT_ERRORS, CircuitOpenError, error_status_code
 from war_room.source_scoring import score_url
 
 
@@ -52,9 +58,22 @@ def _extract_cases(caselaw_pack: Any) -> list[dict[str, str]]:
     return cases
 
 
+def citation_check_key(name: str, citation: str) -> str:
+    """Unversioned cache key for one case's spot-check."""
+    return f"citecheck__{f'{name} {citation}'.strip()}"
+
+
+def citation_check_keys(caselaw_pack: Any, *, max_checks: int = MAX_CHECKS) -> list[str]:
+    """Cache keys spot_check_citations() uses for a caselaw pack, in check order."""
+    return [
+        versioned_key("citecheck", citation_check_key(case["name"], case["citation"]))
+        for case in _extract_cases(caselaw_pack)[:max_checks]
+    ]
+
+
 def spot_check_citations(
     caselaw_pack: dict[str, Any],
-    client: ExaClient,
+    client: ExaClient | None,
     *,
     use_cache: bool = True,
     cache_dir: str = "cache",
@@ -65,7 +84,6 @@ def spot_check_citations(
 
     Returns dict with: module, disclaimer, checks, summary.
     """
-    case_key_base = "citecheck"
     all_cases = _extract_cases(caselaw_pack)
 
     checks = []
@@ -74,18 +92,21 @@ def spot_check_citations(
         citation = case["citation"]
         search_term = f"{name} {citation}".strip()
 
-        check_key = f"{case_key_base}__{search_term}"
+        check_key = citation_check_key(name, citation)
 
         def _verify(q=search_term) -> dict[str, Any]:
             return _do_check(q, client)
 
-        result = cached_call(
+        # Copy: cached values may be shared with other readers.
+        result = dict(cached_versioned_call(
+            "citecheck",
             check_key,
             _verify,
             cache_samples_dir=cache_samples_dir,
             cache_dir=cache_dir,
             use_cache=use_cache,
-        )
+            ttl=MODULE_TTLS["citecheck"],
+        ))
         result["case_name"] = name
         result["citation"] = citation
         checks.append(result)
@@ -114,32 +135,56 @@ def spot_check_citations(
 _TIER_RANK = {"official": 0, "professional": 1, "unvetted": 2, "paywalled": 3}
 
 
-def _do_check(query: str, client: ExaClient) -> dict[str, Any]:
-    """Run a single citation spot-check."""
+def _is_search_failure(exc: BaseException) -> bool:
+    """Provider, transport or breaker failure, as opposed to a bug in the caller."""
+    if isinstance(exc, (CircuitOpenError, CassetteMiss, *TRANSIENT_ERRORS)):
+        return True
+    # exa-py reports HTTP failures as exceptions carrying the status code.
+    return error_status_code(exc) is not None
+
+
+def _do_check(query: str, client: ExaClient | None) -> dict[str, Any] | NegativeResult:
+    """Run a single citation spot-check.
+
+    Failures and empty searches come back as NegativeResults so the cache
+    keeps them only briefly. Failures that say nothing about the citation
+    (no client, budget exhausted, circuit open, cassette miss; see
+    search_failure_reason) are not cached at all. Other exceptions propagate.
+    """
+    if client is None:
+        return NegativeResult("skipped", {
+            "status": "uncertain",
+            "badge": "warning",
+            "source_url": None,
+            "note": "No Exa client - could not verify",
+        }, detail="no client")
     try:
         hits = client.search(query, k=5)
     except BudgetExhausted:
-        return {
+        return NegativeResult("skipped", {
             "status": "uncertain",
             "badge": "warning",
             "source_url": None,
             "note": "Budget exhausted - could not verify",
-        }
+        }, detail="budget exhausted")
     except Exception as exc:
-        return {
+        if not _is_search_failure(exc):
+            raise
+        reason = search_failure_reason(exc) or "skipped"
+        return NegativeResult(reason, {
             "status": "uncertain",
             "badge": "warning",
             "source_url": None,
             "note": f"Search error - could not verify: {type(exc).__name__}",
-        }
+        }, detail=f"{type(exc).__name__}: {exc}")
 
     if not hits:
-        return {
+        return NegativeResult("empty", {
             "status": "not_found",
             "badge": "not_found",
             "source_url": None,
             "note": "No results found",
-        }
+        })
 
     # Score all hits and pick the best tier
     scored_hits = []
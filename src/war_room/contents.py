@@ -0,0 +1,190 @@
+"""Batched contents fetching: chunking, per-URL status, and partial retries.
+
+Enrichment fetches full text for hundreds of URLs per event. `ContentsRun`
+holds the bookkeeping the sync and async clients share: URLs are deduped,
+answered from the contents cache where possible, and split into chunks.
+One bad page must not cost the whole batch, so failures are tracked per URL:
+
+- URLs Exa reports as failed inside a successful response are retried once
+  more in their own chunks.
+- A chunk rejected outright with a client error (4xx) is bisected, within
+  the same round, until the offending URL is isolated and its neighbours
+  come back.
+- Transient errors have already been retried by the client's RetryPolicy,
+  so those URLs are marked failed rather than hammered again.
+"""
+
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from war_room.cache_io import cache_get, cache_set
+from war_room.metrics import count
+from war_room.retry_policy import CircuitOpenError, RetryPolicy
+
+CONTENTS_CHUNK_SIZE = 25
+CONTENTS_MAX_WORKERS = 4
+
+STATUS_PENDING = "pending"
+STATUS_CACHED = "cached"
+STATUS_FETCHED = "fetched"
+STATUS_FAILED = "failed"
+
+
+def contents_cache_key(url: str, max_chars: int) -> str:
+    """Cache key for one URL's normalized contents at a given text length."""
+    return f"contents__{url}__{max_chars}"
+
+
+@dataclass
+class ContentsBatch:
+    """Outcome of a batched contents fetch, keyed by URL in request order."""
+
+    status: dict[str, str] = field(default_factory=dict)
+    contents: dict[str, dict[str, Any]] = field(default_factory=dict)
+    errors: dict[str, str] = field(default_factory=dict)
+
+    @property
+    def results(self) -> list[dict[str, Any]]:
+        """Normalized contents for every URL that came back, in request order."""
+        return [self.contents[url] for url in self.status if url in self.contents]
+
+    @property
+    def failed(self) -> list[str]:
+        return [url for url, status in self.status.items() if status == STATUS_FAILED]
+
+    def counts(self) -> dict[str, int]:
+        totals: dict[str, int] = {}
+        for status in self.status.values():
+            totals[status] = totals.get(status, 0) + 1
+        return totals
+
+
+def _chunked(urls: list[str], size: int) -> list[list[str]]:
+    return [urls[i:i + size] for i in range(0, len(urls), size)]
+
+
+class ContentsRun:
+    """Shared state for one batched fetch; thread-safe for concurrent chunks."""
+
+    def __init__(
+        self,
+        urls: list[str],
+        *,
+        max_chars: int,
+        chunk_size: int = CONTENTS_CHUNK_SIZE,
+        policy: RetryPolicy,
+        cache_dir: str | Path | None = None,
+        cache_samples_dir: str | Path = "cache_samples",
+    ):
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be at least 1")
+        self.max_chars = max_chars
+        self.chunk_size = chunk_size
+        self.policy = policy
+        self.cache_dir = cache_dir
+        self.batch = ContentsBatch()
+        self._lock = threading.Lock()
+        self._retry_urls: list[str] = []
+
+        for url in urls:
+            if url and url not in self.batch.status:
+                self.batch.status[url] = STATUS_PENDING
+
+        if cache_dir is not None:
+            for url in self.batch.status:
+                key = contents_cache_key(url, max_chars)
+                cached = cache_get(key, cache_samples_dir)
+                if cached is None:
+                    cached = cache_get(key, cache_dir)
+                count("cache_miss" if cached is None else "cache_fresh")
+                if cached is not None:
+                    self.batch.status[url] = STATUS_CACHED
+                    self.batch.contents[url] = cached
+
+        pending = [url for url, status in self.batch.status.items() if status == STATUS_PENDING]
+        self._next: list[list[str]] = _chunked(pending, chunk_size)
+
+    def next_chunks(self) -> list[list[str]]:
+        """Chunks still to send this round, including halves of bisected chunks."""
+        with self._lock:
+            chunks = self._next
+            self._next = []
+            return chunks
+
+    def start_retry_round(self) -> bool:
+        """Queue the retry candidates from the last round; False if there are none."""
+        with self._lock:
+            self._next = _chunked(self._retry_urls, self.chunk_size)
+            self._retry_urls = []
+            return bool(self._next)
+
+    def record_response(self, chunk: list[str], results: dict[str, dict[str, Any]], errors: dict[str, str]) -> None:
+        """Record a chunk the provider answered; URLs without content are retry candidates."""
+        with self._lock:
+            for url in chunk:
+                if url in results:
+                    self.batch.status[url] = STATUS_FETCHED
+                    self.batch.contents[url] = results[url]
+                    self.batch.errors.pop(url, None)
+                else:
+                    first_failure = url not in self.batch.errors
+                    self.batch.status[url] = STATUS_FAILED
+                    self.batch.errors[url] = errors.get(url, "no content returned")
+                    if first_failure:
+                        self._retry_urls.append(url)
+        if self.cache_dir is not None:
+            for url in chunk:
+                if url not in results:
+                    continue
+                try:
+                    cache_set(contents_cache_key(url, self.max_chars), results[url], self.cache_dir)
+                except OSError:
+                    # The contents are already recorded; losing their cache entry only costs a re-fetch.
+                    count("cache_write_error")
+
+    def record_error(self, chunk: list[str], exc: BaseException) -> None:
+        """Record a chunk that failed outright; bisect it if a single URL may be to blame."""
+        message = f"{type(exc).__name__}: {exc}"
+        bisect = (
+            len(chunk) > 1
+            and not isinstance(exc, CircuitOpenError)
+            and not self.policy.is_retryable(exc)
+        )
+        with self._lock:
+            for url in chunk:
+                self.batch.status[url] = STATUS_FAILED
+                self.batch.errors[url] = message
+            if bisect:
+                middle = len(chunk) // 2
+                self._next.extend([chunk[:middle], chunk[middle:]])
+
+    @property
+    def last_error(self) -> str | None:
+        errors = list(self.batch.errors.values())
+        return errors[-1] if errors else None
+
+
+def split_contents_response(chunk: list[str], response: Any) -> tuple[dict[str, Any], dict[str, str]]:
+    """Map an exa-py contents response to {url: raw result} and {url: error}."""
+    requested = set(chunk)
+    results: dict[str, Any] = {}
+    for result in getattr(response, "results", None) or []:
+        # Exa echoes the requested URL as the result id; the url may be canonicalized.
+        for candidate in (getattr(result, "id", None), getattr(result, "url", None)):
+            if candidate in requested:
+                results[candidate] = result
+                break
+
+    errors: dict[str, str] = {}
+    for status in getattr(response, "statuses", None) or []:
+        url = getattr(status, "id", None)
+        state = getattr(status, "status", None)
+        if url in requested and state not in (None, "success"):
+            detail = getattr(status, "error", None) or getattr(status, "source", None)
+            errors[url] = f"{state}: {detail}" if detail else str(state)
+            results.pop(url, None)
+    return results, errors
@@ -6,14 +6,36 @@ It supports both older and newer exa-py APIs for `contents` options.
 
 from __future__ import annotations
 
+import asyncio
+import contextvars
+import json
 import os
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any
 
-from exa_py import Exa
+from exa_py import AsyncExa, Exa
 
 from war_room.bootstrap import discover_repo_root
+from war_room.contents import (
+    CONTENTS_CHUNK_SIZE,
+    CONTENTS_MAX_WORKERS,
+    ContentsBatch,
+    ContentsRun,
+    split_contents_response,
+)
+from war_room.metrics import count
+from war_room.rate_limit import BudgetLedger, RateLimiter
+from war_room.retry_policy import (
+    DEFAULT_RETRY_POLICY,
+    CircuitBreaker,
+    RetryPolicy,
+    RetryStats,
+    call_with_retry,
+    call_with_retry_async,
+)
 from war_room.settings import load_settings
 
 
@@ -21,20 +43,131 @@ class BudgetExhausted(Exception):
     """Raised when the search budget is exhausted."""
 
 
-class ExaClient:
-    """Thin wrapper around exa-py with retry + budget guard."""
+class _BudgetGuard:
+    """Budget, rate-limit, and retry bookkeeping shared by the sync and async clients.
+
+    The per-instance `max_search_calls` cap applies to searches only. An
+    optional shared `budget_ledger` is drawn from by both searches and
+    content fetches, and an optional `rate_limiter` paces every attempt.
+    Budget is reserved before a call and refunded if the call fails.
+    Attempts follow `retry_policy` and are gated by `circuit_breaker`.
+    """
+
+    def _init_budget(
+        self,
+        max_search_calls: int,
+        rate_limiter: RateLimiter | None,
+        budget_ledger: BudgetLedger | None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+    ) -> None:
+        self.max_search_calls = max_search_calls
+        self.search_count = 0
+        self.contents_count = 0
+        self.rate_limiter = rate_limiter
+        self.budget_ledger = budget_ledger
+        self.retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        self.retry_stats = RetryStats()
+        self.last_contents_error: str | None = None
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _reserve_search(self) -> None:
+        with self._lock:
+            if self.search_count + self._in_flight >= self.max_search_calls:
+                raise BudgetExhausted(
+                    f"Search budget exhausted: {self.search_count}/{self.max_search_calls} calls used"
+                )
+            self._in_flight += 1
+        if self.budget_ledger is not None and not self.budget_ledger.try_spend():
+            with self._lock:
+                self._in_flight -= 1
+            raise BudgetExhausted(
+                f"Shared budget exhausted: {self.budget_ledger.limit} calls used"
+            )
+
+    def _release_search(self, succeeded: bool) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            if succeeded:
+                self.search_count += 1
+        if not succeeded and self.budget_ledger is not None:
+            self.budget_ledger.refund()
+
+    def _reserve_contents(self) -> None:
+        if self.budget_ledger is not None and not self.budget_ledger.try_spend():
+            raise BudgetExhausted(
+                f"Shared budget exhausted: {self.budget_ledger.limit} calls used"
+            )
+
+    def _release_contents(self, succeeded: bool) -> None:
+        if succeeded:
+            with self._lock:
+                self.contents_count += 1
+        elif self.budget_ledger is not None:
+            self.budget_ledger.refund()
+
+    def _rate_limit_delay(self) -> float:
+        """Claim a rate-limiter slot and return the seconds to wait for it."""
+        if self.rate_limiter is None:
+            return 0.0
+        return self.rate_limiter.reserve()
+
+    @property
+    def budget_remaining(self) -> int:
+        """Searches this client may still run, honoring the shared ledger."""
+        with self._lock:
+            remaining = max(0, self.max_search_calls - self.search_count - self._in_flight)
+        if self.budget_ledger is not None:
+            remaining = min(remaining, self.budget_ledger.remaining())
+        return remaining
+
+    @property
+    def rate_limit_wait(self) -> float:
+        """Seconds until the rate limiter would admit the next call."""
+        if self.rate_limiter is None:
+            return 0.0
+        return self.rate_limiter.wait_time()
+
+
+class ExaClient(_BudgetGuard):
+    """Thin wrapper around exa-py with retry + budget guard.
+
+    Safe to share across threads: the budget check and counter update are
+    guarded by a lock, and in-flight searches reserve budget up front.
+    """
 
     def __init__(
         self,
         api_key: str | None = None,
         max_search_calls: int = 30,
+        *,
+        rate_limiter: RateLimiter | None = None,
+        budget_ledger: BudgetLedger | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        provider: Any | None = None,
+        base_url: str | None = None,
     ):
-        self._api_key = api_key or os.getenv("EXA_API_KEY", "") or _load_api_key_from_settings()
-        if not self._api_key:
-            raise ValueError("EXA_API_KEY is required (pass it or set in env)")
-        self._exa = Exa(self._api_key)
-        self.max_search_calls = max_search_calls
-        self.search_count = 0
+        if provider is not None:
+            # Anything shaped like exa-py's Exa (e.g. a cassette replayer); no key needed.
+            self._api_key = api_key or ""
+            self._exa = provider
+        else:
+            self._api_key = api_key or os.getenv("EXA_API_KEY", "") or _load_api_key_from_settings()
+            if not self._api_key:
+                raise ValueError("EXA_API_KEY is required (pass it or set in env)")
+            # EXA_BASE_URL points the client at a stand-in such as war_room.fake_exa.
+            base_url = base_url or os.getenv("EXA_BASE_URL")
+            self._exa = Exa(self._api_key, base_url=base_url) if base_url else Exa(self._api_key)
+        self._init_budget(
+            max_search_calls,
+            rate_limiter,
+            budget_ledger,
+            retry_policy,
+            circuit_breaker,
+        )
 
     def search(
         self,
@@ -48,30 +181,24 @@ class ExaClient:
     ) -> list[dict[str, Any]]:
         """Run a single Exa search and return normalized result dicts.
 
-        Raises BudgetExhausted if max_search_calls reached.
+        Raises BudgetExhausted if max_search_calls or the shared ledger is spent.
         """
-        if self.search_count >= self.max_search_calls:
-            raise BudgetExhausted(
-                f"Search budget exhausted: {self.search_count}/{self.max_search_calls} calls used"
-            )
+        kwargs = _build_search_kwargs(
+            k=k,
+            recency_days=recency_days,
+            include_domains=include_domains,
+            exclude_domains=exclude_domains,
+            max_chars=max_chars,
+        )
 
-        kwargs: dict[str, Any] = {
-            "num_results": k,
-            "contents": _build_contents_options(max_chars),
-        }
-        # Exa only allows one of include_domains or exclude_domains
-        if include_domains:
-            kwargs["include_domains"] = include_domains
-        elif exclude_domains:
-            kwargs["exclude_domains"] = exclude_domains
-        if recency_days is not None:
-            from datetime import UTC, datetime, timedelta
-            start = (datetime.now(UTC) - timedelta(days=recency_days)).strftime("%Y-%m-%d")
-            kwargs["start_published_date"] = start
-
-        response = self._search_with_retry(query, kwargs)
-        self.search_count += 1
-        return [self._normalize_result(r) for r in response.results]
+        self._reserve_search()
+        succeeded = False
+        try:
+            response = self._search_with_retry(query, kwargs)
+            succeeded = True
+        finally:
+            self._release_search(succeeded)
+        return _counted("exa_searches", [self._normalize_result(r) for r in response.results])
 
     def get_contents(
         self,
@@ -79,30 +206,99 @@ class ExaClient:
         *,
         max_chars: int = 6000,
     ) -> list[dict[str, Any]]:
-        """Fetch full contents for a list of URLs."""
-        if not urls:
-            return []
+        """Fetch full contents for a list of URLs.
+
+        Returns whatever came back; use fetch_contents for per-URL status.
+        """
+        return self.fetch_contents(urls, max_chars=max_chars).results
+
+    def fetch_contents(
+        self,
+        urls: list[str],
+        *,
+        max_chars: int = 6000,
+        chunk_size: int = CONTENTS_CHUNK_SIZE,
+        max_workers: int = CONTENTS_MAX_WORKERS,
+        url_retries: int = 1,
+        cache_dir: str | Path | None = None,
+        cache_samples_dir: str | Path = "cache_samples",
+    ) -> ContentsBatch:
+        """Fetch contents in concurrent chunks and report status per URL.
+
+        Duplicate URLs are fetched once; with `cache_dir` set, URLs already
+        cached are not fetched at all. Failed URLs get up to `url_retries`
+        further rounds (see war_room.contents). Budget exhaustion and
+        provider errors are recorded per URL rather than raised.
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        run = ContentsRun(
+            urls,
+            max_chars=max_chars,
+            chunk_size=chunk_size,
+            policy=self.retry_policy,
+            cache_dir=cache_dir,
+            cache_samples_dir=cache_samples_dir,
+        )
+        for attempt in range(url_retries + 1):
+            if attempt and not run.start_retry_round():
+                break
+            while chunks := run.next_chunks():
+                if len(chunks) == 1 or max_workers == 1:
+                    for chunk in chunks:
+                        self._fetch_chunk(run, chunk)
+                    continue
+                # Workers run in copies of this context so run metrics see their calls.
+                context = contextvars.copy_context()
+                with ThreadPoolExecutor(
+                    max_workers=min(max_workers, len(chunks)),
+                    thread_name_prefix="exa-contents",
+                ) as pool:
+                    list(pool.map(lambda chunk: context.copy().run(self._fetch_chunk, run, chunk), chunks))
+
+        self.last_contents_error = run.last_error
+        return run.batch
+
+    def _fetch_chunk(self, run: ContentsRun, chunk: list[str]) -> None:
+        """Send one contents request and record the outcome for each of its URLs."""
+        try:
+            self._reserve_contents()
+        except BudgetExhausted as exc:
+            run.record_error(chunk, exc)
+            return
         try:
-            response = self._exa.get_contents(
-                urls,
-                text={"max_characters": max_chars},
+            response = call_with_retry(
+                lambda: self._exa.get_contents(chunk, text={"max_characters": run.max_chars}),
+                policy=self.retry_policy,
+                breaker=self.circuit_breaker,
+                stats=self.retry_stats,
+                before_attempt=self._throttle,
             )
-            return [self._normalize_result(r) for r in response.results]
-        except Exception:
-            return []
-
-    def _search_with_retry(
-        self, query: str, kwargs: dict, max_retries: int = 3
-    ) -> Any:
-        """Simple retry with exponential backoff."""
-        for attempt in range(max_retries):
-            try:
-                return self._exa.search(query, **kwargs)
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    raise
-                wait = 2 ** attempt
-                time.sleep(wait)
+        except Exception as exc:
+            # Enrichment is best-effort: failures are recorded, not raised.
+            self._release_contents(False)
+            run.record_error(chunk, exc)
+            return
+        self._release_contents(True)
+        raw, errors = split_contents_response(chunk, response)
+        results = {url: self._normalize_result(result) for url, result in raw.items()}
+        _counted("exa_contents", list(results.values()))
+        run.record_response(chunk, results, errors)
+
+    def _throttle(self) -> None:
+        wait = self._rate_limit_delay()
+        if wait > 0:
+            time.sleep(wait)
+
+    def _search_with_retry(self, query: str, kwargs: dict) -> Any:
+        """Run one search under the client's retry policy and circuit breaker."""
+        return call_with_retry(
+            lambda: self._exa.search(query, **kwargs),
+            policy=self.retry_policy,
+            breaker=self.circuit_breaker,
+            stats=self.retry_stats,
+            before_attempt=self._throttle,
+        )
 
     @staticmethod
     def _normalize_result(result: Any) -> dict[str, Any]:
@@ -116,9 +312,194 @@ class ExaClient:
             "score": getattr(result, "score", None),
         }
 
-    @property
-    def budget_remaining(self) -> int:
-        return max(0, self.max_search_calls - self.search_count)
+
+class AsyncExaClient(_BudgetGuard):
+    """Asyncio-native counterpart to ExaClient with the same budget guard.
+
+    In-flight searches reserve budget up front so concurrent callers
+    cannot overrun ``max_search_calls``.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        max_search_calls: int = 30,
+        *,
+        rate_limiter: RateLimiter | None = None,
+        budget_ledger: BudgetLedger | None = None,
+        retry_policy: RetryPolicy | None = None,
+        circuit_breaker: CircuitBreaker | None = None,
+        provider: Any | None = None,
+        base_url: str | None = None,
+    ):
+        if provider is not None:
+            # Anything shaped like exa-py's AsyncExa (e.g. a cassette replayer); no key needed.
+            self._api_key = api_key or ""
+            self._exa = provider
+        else:
+            self._api_key = api_key or os.getenv("EXA_API_KEY", "") or _load_api_key_from_settings()
+            if not self._api_key:
+                raise ValueError("EXA_API_KEY is required (pass it or set in env)")
+            base_url = base_url or os.getenv("EXA_BASE_URL")
+            self._exa = AsyncExa(self._api_key, api_base=base_url) if base_url else AsyncExa(self._api_key)
+        self._init_budget(
+            max_search_calls,
+            rate_limiter,
+            budget_ledger,
+            retry_policy,
+            circuit_breaker,
+        )
+
+    async def search(
+        self,
+        query: str,
+        *,
+        k: int = 5,
+        recency_days: int | None = None,
+        include_domains: list[str] | None = None,
+        exclude_domains: list[str] | None = None,
+        max_chars: int = 3000,
+    ) -> list[dict[str, Any]]:
+        """Run a single Exa search and return normalized result dicts.
+
+        Raises BudgetExhausted if max_search_calls or the shared ledger is spent.
+        """
+        kwargs = _build_search_kwargs(
+            k=k,
+            recency_days=recency_days,
+            include_domains=include_domains,
+            exclude_domains=exclude_domains,
+            max_chars=max_chars,
+        )
+
+        self._reserve_search()
+        succeeded = False
+        try:
+            response = await self._search_with_retry(query, kwargs)
+            succeeded = True
+        finally:
+            self._release_search(succeeded)
+        return _counted("exa_searches", [ExaClient._normalize_result(r) for r in response.results])
+
+    async def get_contents(
+        self,
+        urls: list[str],
+        *,
+        max_chars: int = 6000,
+    ) -> list[dict[str, Any]]:
+        """Fetch full contents for a list of URLs.
+
+        Returns whatever came back; use fetch_contents for per-URL status.
+        """
+        return (await self.fetch_contents(urls, max_chars=max_chars)).results
+
+    async def fetch_contents(
+        self,
+        urls: list[str],
+        *,
+        max_chars: int = 6000,
+        chunk_size: int = CONTENTS_CHUNK_SIZE,
+        max_workers: int = CONTENTS_MAX_WORKERS,
+        url_retries: int = 1,
+        cache_dir: str | Path | None = None,
+        cache_samples_dir: str | Path = "cache_samples",
+    ) -> ContentsBatch:
+        """Async variant of ExaClient.fetch_contents; at most `max_workers` chunks in flight."""
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        run = ContentsRun(
+            urls,
+            max_chars=max_chars,
+            chunk_size=chunk_size,
+            policy=self.retry_policy,
+            cache_dir=cache_dir,
+            cache_samples_dir=cache_samples_dir,
+        )
+        semaphore = asyncio.Semaphore(max_workers)
+
+        async def _bounded(chunk: list[str]) -> None:
+            async with semaphore:
+                await self._fetch_chunk(run, chunk)
+
+        for attempt in range(url_retries + 1):
+            if attempt and not run.start_retry_round():
+                break
+            while chunks := run.next_chunks():
+                await asyncio.gather(*(_bounded(chunk) for chunk in chunks))
+
+        self.last_contents_error = run.last_error
+        return run.batch
+
+    async def _fetch_chunk(self, run: ContentsRun, chunk: list[str]) -> None:
+        try:
+            self._reserve_contents()
+        except BudgetExhausted as exc:
+            run.record_error(chunk, exc)
+            return
+        try:
+            response = await call_with_retry_async(
+                lambda: self._exa.get_contents(chunk, text={"max_characters": run.max_chars}),
+                policy=self.retry_policy,
+                breaker=self.circuit_breaker,
+                stats=self.retry_stats,
+                before_attempt=self._throttle,
+            )
+        except Exception as exc:
+            self._release_contents(False)
+            run.record_error(chunk, exc)
+            return
+        self._release_contents(True)
+        raw, errors = split_contents_response(chunk, response)
+        results = {url: ExaClient._normalize_result(result) for url, result in raw.items()}
+        _counted("exa_contents", list(results.values()))
+        run.record_response(chunk, results, errors)
+
+    async def _throttle(self) -> None:
+        wait = self._rate_limit_delay()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    async def _search_with_retry(self, query: str, kwargs: dict) -> Any:
+        """Run one search under the retry policy without blocking the event loop."""
+        return await call_with_retry_async(
+            lambda: self._exa.search(query, **kwargs),
+            policy=self.retry_policy,
+            breaker=self.circuit_breaker,
+            stats=self.retry_stats,
+            before_attempt=self._throttle,
+        )
+
+
+def _counted(counter: str, results: list[dict[str, Any]]) -> list[dict[str, Any]]:
+    """Record one successful call and the size of its normalized results."""
+    count(counter)
+    count("exa_bytes", len(json.dumps(results, default=str).encode("utf-8")))
+    return results
+
+
+def _build_search_kwargs(
+    *,
+    k: int,
+    recency_days: int | None,
+    include_domains: list[str] | None,
+    exclude_domains: list[str] | None,
+    max_chars: int,
+) -> dict[str, Any]:
+    """Build the exa-py search kwargs shared by the sync and async clients."""
+    kwargs: dict[str, Any] = {
+        "num_results": k,
+        "contents": _build_contents_options(max_chars),
+    }
+    # Exa only allows one of include_domains or exclude_domains
+    if include_domains:
+        kwargs["include_domains"] = include_domains
+    elif exclude_domains:
+        kwargs["exclude_domains"] = exclude_domains
+    if recency_days is not None:
+        from datetime import UTC, datetime, timedelta
+        start = (datetime.now(UTC) - timedelta(days=recency_days)).strftime("%Y-%m-%d")
+        kwargs["start_published_date"] = start
+    return kwargs
 
 
 def _build_contents_options(max_chars: int) -> dict[str, Any]:
@@ -17,6 +17,7 @@ from war_room.models import (
     weather_brief_to_payload,
 )
 from war_room.query_plan import CaseIntake, QuerySpec
+from war_room.run_plan import RunPlan
 
 
 def render_markdown_memo(
@@ -25,9 +26,16 @@ def render_markdown_memo(
     carrier: dict[str, Any],
     caselaw: dict[str, Any],
     citecheck: dict[str, Any],
-    query_plan: list[QuerySpec],
+    query_plan: list[QuerySpec] | RunPlan,
 ) -> str:
-    """Render the full research memo as markdown."""
+    """Render the full research memo as markdown.
+
+    Given the run's RunPlan, the query appendix also shows each query's id,
+    hits, source and latency.
+    """
+    run_plan = query_plan if isinstance(query_plan, RunPlan) else None
+    if run_plan is not None:
+        query_plan = run_plan.queries
     memo_input = memo_render_input_from_parts(
         intake,
         weather,
@@ -197,10 +205,21 @@ def render_markdown_memo(
     lines.append("")
     lines.append(f"Total queries: {len(query_plan)}")
     lines.append("")
-    lines.append("| Module | Category | Query |")
-    lines.append("|--------|----------|-------|")
-    for query in query_plan:
-        lines.append(f"| {query.module} | {query.category} | {query.query[:80]} |")
+    if run_plan is None:
+        lines.append("| Module | Category | Query |")
+        lines.append("|--------|----------|-------|")
+        for query in query_plan:
+            lines.append(f"| {query.module} | {query.category} | {query.query[:80]} |")
+    else:
+        lines.append("| ID | Module | Category | Query | Hits | Source | ms |")
+        lines.append("|----|--------|----------|-------|------|--------|----|")
+        for row in run_plan.rows():
+            hits = "" if row["hits"] is None else row["hits"]
+            ms = "" if row["seconds"] is None else round(row["seconds"] * 1000)
+            lines.append(
+                f"| {row['id']} | {row['module']} | {row['category']} | {row['query'][:80]} | "
+                f"{hits} | {row['source']} | {ms} |"
+            )
     lines.append("")
 
     # --- 7. Source Appendix (deduplicated) ---
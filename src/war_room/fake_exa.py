@@ -0,0 +1,405 @@
+"""Local stand-in for the Exa HTTP API, for load and concurrency testing.
+
+`FakeExaServer` speaks the wire protocol exa-py uses (`POST /search` and
+`POST /contents` with camelCase JSON bodies and an `x-api-key` header), so
+the real `Exa` / `AsyncExa` clients, and therefore ExaClient, can be pointed
+at it with `base_url=server.base_url` or `EXA_BASE_URL`.
+
+Answers come from a `FakeExaCorpus`: exact replays from a cassette when the
+request was recorded, otherwise deterministic picks from documents found in
+a cassette and in cache directories (cache_samples/, cache/). A
+`FaultProfile` injects latency, 5xx errors, and 429s (random, or from a
+server-side rate cap) so throughput can be measured under realistic failure
+patterns.
+
+Run standalone:
+
+    python -m war_room.fake_exa --cache-dir cache_samples --latency 0.2 --error-rate 0.05
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlparse
+
+from exa_py.api import to_snake_case
+
+from war_room.cache_io import decode_payload
+from war_room.cassette import Cassette, request_key
+from war_room.rate_limit import TokenBucket
+
+
+@dataclass(frozen=True)
+class FaultProfile:
+    """Latency and failure knobs for the fake server.
+
+    Latency is lognormal around `latency` seconds (the median); a
+    `latency_sigma` of 0 makes it fixed. `error_rate` and `rate_limit_rate`
+    are per-request probabilities of a 500 and a 429. `max_rps` adds a
+    server-side token bucket that answers 429 whenever it is exceeded.
+    """
+
+    latency: float = 0.0
+    latency_sigma: float = 0.0
+    error_rate: float = 0.0
+    rate_limit_rate: float = 0.0
+    retry_after: float = 1.0
+    max_rps: float | None = None
+    seed: int | None = None
+
+    def __post_init__(self) -> None:
+        if self.latency < 0 or self.latency_sigma < 0:
+            raise ValueError("latency and latency_sigma must be non-negative")
+        for name in ("error_rate", "rate_limit_rate"):
+            if not 0.0 <= getattr(self, name) <= 1.0:
+                raise ValueError(f"{name} must be between 0 and 1")
+
+
+def _docs_from_json(value: Any, docs: dict[str, dict[str, Any]]) -> None:
+    """Collect anything that looks like a search hit or source from cached JSON."""
+    if isinstance(value, list):
+        for item in value:
+            _docs_from_json(item, docs)
+        return
+    if not isinstance(value, dict):
+        return
+    url = value.get("url")
+    if isinstance(url, str) and url.startswith("http") and url not in docs:
+        docs[url] = {
+            "id": url,
+            "url": url,
+            "title": value.get("title") or value.get("name") or "",
+            "text": value.get("text") or value.get("snippet") or value.get("excerpt") or "",
+            "publishedDate": value.get("published_date") or None,
+        }
+    for item in value.values():
+        _docs_from_json(item, docs)
+
+
+class FakeExaCorpus:
+    """Documents and recorded answers the fake server draws from."""
+
+    def __init__(self, cassette: Cassette | None = None, docs: list[dict[str, Any]] | None = None):
+        self._recorded: dict[str, dict[str, Any]] = {}
+        self.docs: dict[str, dict[str, Any]] = {}
+        if cassette is not None:
+            for interaction in cassette.interactions:
+                response = interaction.get("response")
+                if response is None:
+                    continue
+                self._recorded.setdefault(interaction["request"], response)
+                for result in response.get("results", []):
+                    if result.get("url"):
+                        self.docs.setdefault(result["url"], _wire_result(result))
+        for doc in docs or []:
+            self.docs.setdefault(doc["url"], doc)
+
+    @classmethod
+    def from_paths(
+        cls,
+        *,
+        cassette: str | Path | None = None,
+        cache_dirs: list[str | Path] = (),
+    ) -> FakeExaCorpus:
+        docs: dict[str, dict[str, Any]] = {}
+        for directory in cache_dirs:
+            for path in sorted(Path(directory).rglob("*.json")):
+                try:
+                    _docs_from_json(decode_payload(path.read_bytes()), docs)
+                except (ImportError, OSError, ValueError):
+                    continue
+        loaded = Cassette.load(cassette) if cassette is not None else None
+        return cls(loaded, list(docs.values()))
+
+    def search(self, body: dict[str, Any]) -> dict[str, Any]:
+        options = to_snake_case(body)
+        recorded = self._recorded.get(request_key("search", options))
+        if recorded is not None:
+            return {"results": [_wire_result(r) for r in recorded["results"]]}
+
+        k = int(options.get("num_results") or 10)
+        include = [d.lower() for d in options.get("include_domains") or []]
+        exclude = [d.lower() for d in options.get("exclude_domains") or []]
+        pool = [
+            doc for doc in self.docs.values()
+            if _domain_ok(doc["url"], include, exclude)
+        ] or list(self.docs.values())
+        query = str(options.get("query", ""))
+        if not pool:
+            return {"results": [_synthetic_doc(query, i) for i in range(k)]}
+        # Deterministic per query, so repeated runs see the same hits.
+        rng = random.Random(hashlib.sha256(query.encode()).hexdigest())
+        picks = rng.sample(pool, min(k, len(pool)))
+        max_chars = _max_chars(options.get("contents"))
+        return {"results": [_with_text_limit(doc, max_chars) for doc in picks]}
+
+    def contents(self, body: dict[str, Any]) -> dict[str, Any]:
+        options = to_snake_case(body)
+        urls = list(options.get("urls") or [])
+        recorded = self._recorded.get(request_key("get_contents", options))
+        if recorded is not None:
+            return {
+                "results": [_wire_result(r) for r in recorded["results"]],
+                "statuses": recorded.get("statuses", []),
+            }
+
+        max_chars = _max_chars(options)
+        results = []
+        statuses = []
+        for url in urls:
+            doc = self.docs.get(url) or _synthetic_doc(url, 0, url=url)
+            results.append(_with_text_limit(doc, max_chars))
+            statuses.append({"id": url, "status": "success", "source": "cached"})
+        return {"results": results, "statuses": statuses}
+
+
+def _wire_result(result: dict[str, Any]) -> dict[str, Any]:
+    """Cassette results are snake_case; the wire format is camelCase."""
+    return {
+        "id": result.get("id") or result.get("url"),
+        "url": result.get("url"),
+        "title": result.get("title"),
+        "text": result.get("text"),
+        "publishedDate": result.get("published_date") or result.get("publishedDate"),
+        "author": result.get("author"),
+        "score": result.get("score"),
+    }
+
+
+def _synthetic_doc(seed: str, index: int, *, url: str | None = None) -> dict[str, Any]:
+    digest = hashlib.sha256(f"{seed}:{index}".encode()).hexdigest()[:12]
+    url = url or f"https://example.com/fake/{digest}"
+    return {
+        "id": url,
+        "url": url,
+        "title": f"Synthetic result {digest}",
+        "text": f"Synthetic body for {seed}. " * 20,
+        "publishedDate": None,
+    }
+
+
+def _domain_ok(url: str, include: list[str], exclude: list[str]) -> bool:
+    host = (urlparse(url).hostname or "").lower()
+    matches = lambda domain: host == domain or host.endswith("." + domain)  # noqa: E731
+    if include:
+        return any(matches(domain) for domain in include)
+    return not any(matches(domain) for domain in exclude)
+
+
+def _max_chars(options: Any) -> int | None:
+    if not isinstance(options, dict):
+        return None
+    text = options.get("text")
+    if isinstance(text, dict):
+        return text.get("max_characters")
+    return None
+
+
+def _with_text_limit(doc: dict[str, Any], max_chars: int | None) -> dict[str, Any]:
+    if not max_chars or not doc.get("text"):
+        return dict(doc)
+    return {**doc, "text": doc["text"][:max_chars]}
+
+
+class FakeExaServer:
+    """Threaded HTTP server answering Exa requests from a corpus.
+
+    Use as a context manager, or call start()/stop(). `stats()` reports
+    request counts and injected faults.
+    """
+
+    def __init__(
+        self,
+        corpus: FakeExaCorpus | None = None,
+        profile: FaultProfile | None = None,
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        api_key: str | None = None,
+    ):
+        self.corpus = corpus or FakeExaCorpus()
+        self.profile = profile or FaultProfile()
+        self.api_key = api_key
+        self._rng = random.Random(self.profile.seed)
+        self._bucket = TokenBucket(self.profile.max_rps) if self.profile.max_rps else None
+        self._lock = threading.Lock()
+        self._stats: dict[str, int] = {
+            "requests": 0,
+            "search": 0,
+            "contents": 0,
+            "errors_injected": 0,
+            "rate_limited": 0,
+            "unauthorized": 0,
+        }
+        self._httpd = ThreadingHTTPServer((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> FakeExaServer:
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever,
+            kwargs={"poll_interval": 0.05},
+            name="fake-exa",
+            daemon=True,
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> FakeExaServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.stop()
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return dict(self._stats)
+
+    def _bump(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def _draw(self) -> tuple[float, float, float]:
+        """Latency plus two uniform draws for fault injection, under one lock."""
+        with self._lock:
+            latency = self.profile.latency
+            if latency and self.profile.latency_sigma:
+                latency = self._rng.lognormvariate(math.log(latency), self.profile.latency_sigma)
+            return latency, self._rng.random(), self._rng.random()
+
+    def _respond(self, endpoint: str, body: dict[str, Any], headers: Any) -> tuple[int, dict[str, Any], dict[str, str]]:
+        self._bump("requests")
+        if self.api_key is not None and headers.get("x-api-key") != self.api_key:
+            self._bump("unauthorized")
+            return 401, {"error": "Invalid API key"}, {}
+
+        latency, fault_draw, limit_draw = self._draw()
+        if latency > 0:
+            time.sleep(latency)
+
+        over_cap = self._bucket is not None and self._bucket.wait_time() > 0
+        if over_cap or limit_draw < self.profile.rate_limit_rate:
+            self._bump("rate_limited")
+            retry_after = self.profile.retry_after
+            return (
+                429,
+                {"error": "Rate limit exceeded", "retry_after": retry_after},
+                {"Retry-After": f"{retry_after:g}"},
+            )
+        if self._bucket is not None:
+            self._bucket.reserve()
+        if fault_draw < self.profile.error_rate:
+            self._bump("errors_injected")
+            return 500, {"error": "Injected server error"}, {}
+
+        if endpoint == "/search":
+            self._bump("search")
+            return 200, self.corpus.search(body), {}
+        if endpoint == "/contents":
+            self._bump("contents")
+            return 200, self.corpus.contents(body), {}
+        return 404, {"error": f"Unknown endpoint {endpoint}"}, {}
+
+    def _handler_class(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # noqa: N802 - http.server naming
+                length = int(self.headers.get("Content-Length") or 0)
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except ValueError:
+                    self._send(400, {"error": "Invalid JSON body"}, {})
+                    return
+                status, payload, headers = server._respond(
+                    urlparse(self.path).path, body, self.headers
+                )
+                self._send(status, payload, headers)
+
+            def _send(self, status: int, payload: dict[str, Any], headers: dict[str, str]) -> None:
+                data = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                # Load tests generate thousands of requests; keep stderr quiet.
+                return
+
+        return _Handler
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run a local fake Exa API server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--cassette", help="Cassette file to replay recorded answers from.")
+    parser.add_argument(
+        "--cache-dir",
+        action="append",
+        default=[],
+        help="Cache directory to draw documents from (repeatable).",
+    )
+    parser.add_argument("--latency", type=float, default=0.0, help="Median latency in seconds.")
+    parser.add_argument("--latency-sigma", type=float, default=0.0, help="Lognormal spread; 0 = fixed.")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of a 500.")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Probability of a 429.")
+    parser.add_argument("--retry-after", type=float, default=1.0)
+    parser.add_argument("--max-rps", type=float, default=None, help="Server-side rate cap (429 above it).")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    corpus = FakeExaCorpus.from_paths(cassette=args.cassette, cache_dirs=args.cache_dir)
+    profile = FaultProfile(
+        latency=args.latency,
+        latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate,
+        rate_limit_rate=args.rate_limit_rate,
+        retry_after=args.retry_after,
+        max_rps=args.max_rps,
+        seed=args.seed,
+    )
+    server = FakeExaServer(corpus, profile, host=args.host, port=args.port)
+    print(f"Fake Exa listening on {server.base_url} ({len(corpus.docs)} documents)")
+    print(f"Point clients at it with EXA_BASE_URL={server.base_url}")
+    try:
+        server.start()
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+        print(json.dumps(server.stats(), indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
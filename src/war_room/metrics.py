@@ -0,0 +1,65 @@
+"""Run counters: cache lookups, Exa calls, and bytes received.
+
+Instrumented code calls `count("exa_searches")`; every `collect()` block
+active in the current context receives it. Context means the current thread
+or asyncio task plus anything started from it with a copied context (tasks,
+`contextvars.copy_context().run`), so a run and each of its stages can be
+tallied at once by nesting blocks. Counting outside any block is a no-op.
+
+Counter names:
+
+- cache_samples / cache_fresh / cache_stale / cache_negative / cache_miss:
+  how each cached lookup was answered
+- exa_searches / exa_contents: successful provider calls
+- exa_bytes: size of the normalized results those calls returned
+- workspace_reused: fetches answered by an EventWorkspace instead
+"""
+
+from __future__ import annotations
+
+import contextvars
+import threading
+from contextlib import contextmanager
+from typing import Iterator
+
+CACHE_COUNTERS = ("cache_samples", "cache_fresh", "cache_stale", "cache_negative", "cache_miss")
+EXA_COUNTERS = ("exa_searches", "exa_contents", "exa_bytes")
+WORKSPACE_COUNTERS = ("workspace_reused",)
+
+
+class Tally:
+    """Thread-safe named counters."""
+
+    def __init__(self) -> None:
+        self._counts: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def add(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counts[name] = self._counts.get(name, 0) + amount
+
+    def as_dict(self) -> dict[str, int]:
+        """Every known counter (zero if untouched) plus any others recorded."""
+        with self._lock:
+            counts = dict(self._counts)
+        return {name: counts.pop(name, 0) for name in (*CACHE_COUNTERS, *EXA_COUNTERS, *WORKSPACE_COUNTERS)} | counts
+
+
+_sinks: contextvars.ContextVar[tuple[Tally, ...]] = contextvars.ContextVar("war_room_metrics", default=())
+
+
+def count(name: str, amount: int = 1) -> None:
+    """Add to a counter in every collect() block active in this context."""
+    for tally in _sinks.get():
+        tally.add(name, amount)
+
+
+@contextmanager
+def collect() -> Iterator[Tally]:
+    """Tally every count() made in this context until the block exits."""
+    tally = Tally()
+    token = _sinks.set((*_sinks.get(), tally))
+    try:
+        yield tally
+    finally:
+        _sinks.reset(token)
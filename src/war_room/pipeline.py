@@ -0,0 +1,155 @@
+"""Parallel module pipeline.
+
+Weather, carrier, and caselaw packs are independent of each other, so they
+run concurrently on a bounded thread pool. Citation spot-checks depend only
+on the caselaw pack and are scheduled the moment it lands, while weather and
+carrier may still be in flight. The memo is rendered once everything is back.
+
+Each stage is timed and tallied on its own (see war_room.metrics), so a run
+record can show where wall time, cache hits, and Exa spend went even though
+the module stages overlap.
+
+The query plan is built once, as a RunPlan, and shared by every module and
+the memo; each query's hits, latency and source are recorded on it.
+
+Given an EventWorkspace, weather and carrier evidence come from it, so
+claimants of the same catastrophe share those fetches (see workspace).
+"""
+
+from __future__ import annotations
+
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from war_room.carrier_module import build_carrier_doc_pack
+from war_room.caselaw_module import build_caselaw_pack
+from war_room.citation_verify import spot_check_citations
+from war_room.exa_client import ExaClient
+from war_room.export_md import render_markdown_memo
+from war_room.metrics import collect
+from war_room.models import QuerySpec
+from war_room.query_plan import CaseIntake
+from war_room.run_plan import RunPlan
+from war_room.weather_module import build_weather_brief
+from war_room.workspace import EventWorkspace
+
+DEFAULT_MAX_WORKERS = 4
+STAGES = ("query_plan", "weather", "carrier", "caselaw", "citecheck", "render")
+
+
+@dataclass(frozen=True)
+class PipelineResult:
+    """All module outputs for one intake plus the rendered memo."""
+
+    weather: dict[str, Any]
+    carrier: dict[str, Any]
+    caselaw: dict[str, Any]
+    citecheck: dict[str, Any]
+    query_plan: list[QuerySpec]
+    memo_md: str
+    stages: dict[str, dict[str, Any]] = field(default_factory=dict)
+    run_plan: RunPlan | None = None
+
+
+def run_stage(stages: dict[str, dict[str, Any]], name: str, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+    """Call fn, recording its wall time and metrics under stages[name].
+
+    The record is written even if fn raises, with the exception's type.
+    """
+    started = time.perf_counter()
+    error: str | None = None
+    with collect() as tally:
+        try:
+            return fn(*args, **kwargs)
+        except Exception as exc:
+            error = type(exc).__name__
+            raise
+        finally:
+            stages[name] = {
+                "seconds": round(time.perf_counter() - started, 4),
+                **tally.as_dict(),
+                **({"error": error} if error else {}),
+            }
+
+
+def run_pipeline(
+    intake: CaseIntake,
+    client: ExaClient | None,
+    *,
+    use_cache: bool = True,
+    cache_dir: str = "cache",
+    cache_samples_dir: str = "cache_samples",
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    stages: dict[str, dict[str, Any]] | None = None,
+    workspace: EventWorkspace | None = None,
+    plan: RunPlan | None = None,
+) -> PipelineResult:
+    """Run every module for an intake concurrently and render the memo.
+
+    Module exceptions propagate to the caller once all submitted work has
+    finished, matching the sequential notebook flow. Pass a `stages` dict
+    to see per-stage timings and metrics even when a stage fails; they are
+    also on the result. Likewise, pass a `plan` built by the caller
+    (RunPlan.build) to keep per-query outcomes when a stage fails; without
+    one, the plan is built here as the query_plan stage.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    stages = {} if stages is None else stages
+    if plan is None:
+        plan = run_stage(stages, "query_plan", RunPlan.build, intake)
+
+    cache_kwargs: dict[str, Any] = {
+        "use_cache": use_cache,
+        "cache_dir": cache_dir,
+        "cache_samples_dir": cache_samples_dir,
+    }
+    module_kwargs = {**cache_kwargs, "plan": plan}
+
+    build_weather = workspace.weather_brief if workspace is not None else build_weather_brief
+    build_carrier = workspace.carrier_pack if workspace is not None else build_carrier_doc_pack
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="war-room") as pool:
+        weather_future = pool.submit(run_stage, stages, "weather", build_weather, intake, client, **module_kwargs)
+        carrier_future = pool.submit(run_stage, stages, "carrier", build_carrier, intake, client, **module_kwargs)
+        caselaw_future = pool.submit(run_stage, stages, "caselaw", build_caselaw_pack, intake, client, **module_kwargs)
+
+        pending: set[Future] = {weather_future, carrier_future, caselaw_future}
+        citecheck_future: Future | None = None
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            if caselaw_future in done and caselaw_future.exception() is None:
+                citecheck_future = pool.submit(
+                    run_stage,
+                    stages,
+                    "citecheck",
+                    spot_check_citations,
+                    caselaw_future.result(),
+                    client,
+                    **cache_kwargs,
+                )
+                pending.add(citecheck_future)
+
+    weather = weather_future.result()
+    carrier = carrier_future.result()
+    caselaw = caselaw_future.result()
+    # Caselaw succeeded, so its spot-check was scheduled in the loop above.
+    citecheck = citecheck_future.result()
+
+    memo_md = run_stage(
+        stages, "render", render_markdown_memo, intake, weather, carrier, caselaw, citecheck, plan
+    )
+
+    return PipelineResult(
+        weather=weather,
+        carrier=carrier,
+        caselaw=caselaw,
+        citecheck=citecheck,
+        query_plan=plan.queries,
+        memo_md=memo_md,
+        stages=dict(stages),
+        run_plan=plan,
+    )
@@ -0,0 +1,205 @@
+"""Portfolio query planning: one query plan for many intakes.
+
+A book of claims from one storm produces heavily overlapping query plans:
+every Pinellas intake asks the same weather questions, every FL intake the
+same concurrent-causation one. plan_portfolio() merges the per-intake plans
+into the unique queries, identified the way the per-query cache tier
+identifies them (retrieval.query_cache_key, with the module's excluded
+domains), and records which intakes each query serves.
+
+execute_portfolio() then runs each unique query once. Its hits reach the
+per-intake assemblers in one of two ways:
+
+- through the runtime cache, since run_query writes the per-query tier that
+  the modules read (this is what `python -m war_room batch --portfolio` uses);
+- or in-process, by handing the modules a PortfolioClient, which answers
+  searches from the executed hits and sends anything else, such as
+  citation checks, to the real client.
+
+PortfolioPlan.report() gives the dedup ratio: queries the intakes would
+have issued on their own over the unique queries actually run.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import copy
+import json
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Mapping
+
+from war_room.caselaw_module import CASELAW_EXCLUDE_DOMAINS
+from war_room.exa_client import ExaClient
+from war_room.models import QuerySpec
+from war_room.query_plan import CaseIntake, generate_query_plan
+from war_room.retrieval import HITS_PER_QUERY, MODULE_TTLS, SEARCH_MAX_CHARS, query_cache_key, run_query
+
+DEFAULT_MAX_WORKERS = 4
+MODULE_EXCLUDE_DOMAINS: dict[str, list[str]] = {"caselaw": CASELAW_EXCLUDE_DOMAINS}
+
+
+@dataclass
+class PortfolioQuery:
+    """One unique query and the intakes whose plans contain it."""
+
+    key: str
+    spec: QuerySpec
+    serves: list[str] = field(default_factory=list)
+
+    @property
+    def exclude_domains(self) -> list[str] | None:
+        return MODULE_EXCLUDE_DOMAINS.get(self.spec.module)
+
+
+@dataclass
+class PortfolioPlan:
+    """Unique queries across intakes, in first-seen order."""
+
+    queries: list[PortfolioQuery]
+    per_intake: dict[str, list[str]]
+
+    @property
+    def total_queries(self) -> int:
+        return sum(len(keys) for keys in self.per_intake.values())
+
+    @property
+    def dedup_ratio(self) -> float:
+        return self.total_queries / len(self.queries) if self.queries else 1.0
+
+    def report(self, *, top: int = 5) -> dict[str, Any]:
+        """Savings overall and per module, plus the most widely shared queries."""
+        by_module: dict[str, dict[str, int]] = {}
+        for query in self.queries:
+            module = by_module.setdefault(query.spec.module, {"total": 0, "unique": 0})
+            module["total"] += len(query.serves)
+            module["unique"] += 1
+        shared = sorted(self.queries, key=lambda query: len(query.serves), reverse=True)[:top]
+        return {
+            "intakes": len(self.per_intake),
+            "total_queries": self.total_queries,
+            "unique_queries": len(self.queries),
+            "saved_queries": self.total_queries - len(self.queries),
+            "dedup_ratio": round(self.dedup_ratio, 2),
+            "by_module": by_module,
+            "most_shared": [{"query": query.spec.query, "intakes": len(query.serves)} for query in shared],
+        }
+
+
+def plan_portfolio(intakes: Mapping[str, CaseIntake]) -> PortfolioPlan:
+    """Merge the query plans of `intakes` (case key -> intake) into unique queries."""
+    queries: dict[str, PortfolioQuery] = {}
+    per_intake: dict[str, list[str]] = {}
+    for case_key, intake in intakes.items():
+        keys: list[str] = []
+        for spec in generate_query_plan(intake):
+            key = query_cache_key(spec, exclude_domains=MODULE_EXCLUDE_DOMAINS.get(spec.module))
+            query = queries.setdefault(key, PortfolioQuery(key=key, spec=spec))
+            if case_key not in query.serves:
+                query.serves.append(case_key)
+            if key not in keys:
+                keys.append(key)
+        per_intake[case_key] = keys
+    return PortfolioPlan(queries=list(queries.values()), per_intake=per_intake)
+
+
+def _search_signature(
+    query: str,
+    *,
+    k: int = HITS_PER_QUERY,
+    include_domains: list[str] | None = None,
+    exclude_domains: list[str] | None = None,
+    max_chars: int = SEARCH_MAX_CHARS,
+    **_: Any,
+) -> str:
+    include = sorted({domain.lower() for domain in include_domains or []})
+    # Mirrors ExaClient: exclude_domains only applies when include is empty.
+    exclude = [] if include else sorted({domain.lower() for domain in exclude_domains or []})
+    return json.dumps([" ".join(query.lower().split()), include, exclude, k, max_chars])
+
+
+@dataclass
+class PortfolioHits:
+    """What execute_portfolio fetched: hits per query key, and failures."""
+
+    hits: dict[str, list[dict[str, Any]]]
+    errors: dict[str, str]
+    by_search: dict[str, list[dict[str, Any]]] = field(default_factory=dict, repr=False)
+
+
+def execute_portfolio(
+    plan: PortfolioPlan,
+    client: ExaClient,
+    *,
+    use_cache: bool = True,
+    cache_dir: str | Path | None = "cache",
+    cache_samples_dir: str | Path = "cache_samples",
+    max_workers: int = DEFAULT_MAX_WORKERS,
+) -> PortfolioHits:
+    """Run each unique query once, through the per-query cache tier.
+
+    A failed query is recorded and skipped; the intakes it serves will try
+    it again when their modules run.
+    """
+    if max_workers < 1:
+        raise ValueError("max_workers must be at least 1")
+
+    def _run(query: PortfolioQuery) -> list[dict[str, Any]]:
+        return run_query(
+            client,
+            query.spec,
+            exclude_domains=query.exclude_domains,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            cache_samples_dir=cache_samples_dir,
+            ttl=MODULE_TTLS.get(query.spec.module),
+        )
+
+    result = PortfolioHits(hits={}, errors={})
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="war-room-portfolio") as pool:
+        # Copied contexts carry the caller's metrics collectors into the pool.
+        futures = {
+            query.key: pool.submit(contextvars.copy_context().run, _run, query) for query in plan.queries
+        }
+    for query in plan.queries:
+        try:
+            hits = futures[query.key].result()
+        except Exception as exc:
+            result.errors[query.key] = f"{type(exc).__name__}: {exc}"
+            continue
+        result.hits[query.key] = hits
+        signature = _search_signature(
+            query.spec.query,
+            include_domains=query.spec.preferred_domains or None,
+            exclude_domains=query.exclude_domains,
+        )
+        result.by_search[signature] = hits
+    return result
+
+
+class PortfolioClient:
+    """Client proxy answering searches from executed portfolio hits.
+
+    Searches the portfolio did not run, or that failed there, go to the
+    wrapped client.
+    """
+
+    def __init__(self, hits: PortfolioHits, client: Any):
+        self._hits = hits
+        self._client = client
+        self._lock = threading.Lock()
+        self.served = 0
+
+    def search(self, query: str, **kwargs: Any) -> list[dict[str, Any]]:
+        hits = self._hits.by_search.get(_search_signature(query, **kwargs))
+        if hits is None:
+            return self._client.search(query, **kwargs)
+        with self._lock:
+            self.served += 1
+        return copy.deepcopy(hits)
+
+    def __getattr__(self, name: str) -> Any:
+        # Budget and retry counters, contents fetches: the real client's.
+        return getattr(self._client, name)
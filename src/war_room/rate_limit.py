@@ -0,0 +1,227 @@
+"""Rate limiting and shared budget accounting for Exa calls.
+
+`TokenBucket` paces requests to a steady rate with a burst allowance.
+Budget ledgers track Exa spend across clients: `InMemoryBudgetLedger` is
+shared by threads in one process, `SQLiteBudgetLedger` by every process
+pointed at the same database file.
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Protocol
+
+
+class RateLimiter(Protocol):
+    """Anything that can hand out request slots."""
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        """Claim `tokens` and return how many seconds the caller must wait."""
+        ...
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        """Seconds until `tokens` would be available, without claiming them."""
+        ...
+
+
+class BudgetLedger(Protocol):
+    """Shared spend counter that several clients draw from."""
+
+    @property
+    def limit(self) -> int: ...
+
+    def try_spend(self, units: int = 1) -> bool:
+        """Spend `units` if the balance allows it; return False otherwise."""
+        ...
+
+    def refund(self, units: int = 1) -> None:
+        """Return `units` to the balance (e.g. after a failed call)."""
+        ...
+
+    def spent(self) -> int: ...
+
+    def remaining(self) -> int: ...
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens/second, up to `burst` banked.
+
+    `reserve` always succeeds and lets the balance go negative, returning
+    the wait needed to pay the debt back. Sync callers sleep on it, async
+    callers await it, and callers queue fairly in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: float | None = None):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        if self.burst < 1:
+            raise ValueError("burst must be at least 1")
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            self._refill()
+            self._tokens -= tokens
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+    def wait_time(self, tokens: float = 1.0) -> float:
+        with self._lock:
+            self._refill()
+            deficit = tokens - self._tokens
+            return max(0.0, deficit / self.rate)
+
+    def acquire(self, tokens: float = 1.0) -> float:
+        """Block until `tokens` are available. Returns the time slept."""
+        wait = self.reserve(tokens)
+        if wait > 0:
+            time.sleep(wait)
+        return wait
+
+
+class InMemoryBudgetLedger:
+    """Budget ledger shared by every client holding this instance."""
+
+    def __init__(self, limit: int):
+        if limit < 0:
+            raise ValueError("limit must be non-negative")
+        self._limit = limit
+        self._spent = 0
+        self._lock = threading.Lock()
+
+    @property
+    def limit(self) -> int:
+        return self._limit
+
+    def try_spend(self, units: int = 1) -> bool:
+        with self._lock:
+            if self._spent + units > self._limit:
+                return False
+            self._spent += units
+            return True
+
+    def refund(self, units: int = 1) -> None:
+        with self._lock:
+            self._spent = max(0, self._spent - units)
+
+    def spent(self) -> int:
+        with self._lock:
+            return self._spent
+
+    def remaining(self) -> int:
+        with self._lock:
+            return max(0, self._limit - self._spent)
+
+
+class SQLiteBudgetLedger:
+    """Budget ledger persisted in SQLite so multiple processes share a balance.
+
+    Each `scope` (e.g. one batch run or one storm) has its own row. The
+    limit is set when the row is first created; later ledgers opened on the
+    same scope see the existing balance until `set_limit` changes it.
+    """
+
+    def __init__(self, path: str | Path, limit: int, *, scope: str = "default"):
+        if limit < 0:
+            raise ValueError("limit must be non-negative")
+        self.path = Path(path)
+        self.scope = scope
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS budget ("
+                " scope TEXT PRIMARY KEY,"
+                " budget_limit INTEGER NOT NULL,"
+                " spent INTEGER NOT NULL DEFAULT 0)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO budget (scope, budget_limit, spent) VALUES (?, ?, 0)",
+                (scope, limit),
+            )
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        # isolation_level=None lets us issue BEGIN IMMEDIATE ourselves.
+        conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+        conn.execute("PRAGMA busy_timeout = 30000")
+        return conn
+
+    def _row(self, conn: sqlite3.Connection) -> tuple[int, int]:
+        row = conn.execute(
+            "SELECT budget_limit, spent FROM budget WHERE scope = ?", (self.scope,)
+        ).fetchone()
+        return int(row[0]), int(row[1])
+
+    @property
+    def limit(self) -> int:
+        conn = self._connect()
+        try:
+            return self._row(conn)[0]
+        finally:
+            conn.close()
+
+    def set_limit(self, limit: int) -> None:
+        """Raise or lower the scope's limit; units already spent still count."""
+        if limit < 0:
+            raise ValueError("limit must be non-negative")
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE budget SET budget_limit = ? WHERE scope = ?", (limit, self.scope))
+        finally:
+            conn.close()
+
+    def try_spend(self, units: int = 1) -> bool:
+        conn = self._connect()
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            limit, spent = self._row(conn)
+            if spent + units > limit:
+                conn.execute("ROLLBACK")
+                return False
+            conn.execute(
+                "UPDATE budget SET spent = spent + ? WHERE scope = ?", (units, self.scope)
+            )
+            conn.execute("COMMIT")
+            return True
+        finally:
+            conn.close()
+
+    def refund(self, units: int = 1) -> None:
+        conn = self._connect()
+        try:
+            conn.execute(
+                "UPDATE budget SET spent = MAX(0, spent - ?) WHERE scope = ?",
+                (units, self.scope),
+            )
+        finally:
+            conn.close()
+
+    def spent(self) -> int:
+        conn = self._connect()
+        try:
+            return self._row(conn)[1]
+        finally:
+            conn.close()
+
+    def remaining(self) -> int:
+        conn = self._connect()
+        try:
+            limit, spent = self._row(conn)
+            return max(0, limit - spent)
+        finally:
+            conn.close()
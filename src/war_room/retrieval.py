@@ -0,0 +1,879 @@
+"""Shared query execution for the retrieval modules.
+
+Weather, carrier, and caselaw builders all run their slice of the query
+plan the same way: one Exa search per QuerySpec, hits tagged with the
+query category. The async helpers fan those searches out concurrently
+under a semaphore while preserving query-plan order in the output.
+
+When a cache directory is given, raw hits are also cached per query,
+beneath the pack-level cache. The key covers everything that shapes the
+Exa request (normalized query text, domains, k, max_chars, date window)
+but not the category or module, so editing one coverage issue only
+re-fetches the queries that actually changed.
+
+Runtime entries expire after a per-module TTL (`MODULE_TTLS`): weather
+reports move within hours of landfall, carrier regulatory actions within
+days, while case law is effectively settled. Expired entries are still
+served immediately and refreshed in the background (see cached_call).
+A query that matches nothing, or fails after the client's retries, is
+cached as a short-lived negative entry instead (`search_failure_reason`),
+so it is neither re-run on every pass nor frozen for the module TTL.
+
+Pack and citation-check entries are namespaced by the settings schema
+version plus a per-module assembler version (`ASSEMBLER_VERSIONS`); bump a
+module's version whenever its assembled payload changes shape. Entries
+written under an older assembler version are upgraded lazily on read by
+hooks registered with `register_payload_upgrade`, then stored under the
+current key with their original fetched-at time, so a payload change
+costs neither a cache flush nor a re-fetch. Raw per-query hits are not
+namespaced: their shape is Exa's, not ours.
+
+The stream helpers re-assemble the pack as queries land and yield
+`PackSnapshot`s, so callers can show partial results long before the last
+query returns.
+
+The weather, carrier and caselaw builders share one pack pipeline: each
+describes itself as a `ModulePack` (keys, queries, assembler, empty
+payload) and hands it to build_pack, build_pack_async, stream_pack or
+stream_pack_async, which own the cache lookup, fetch and fallbacks.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import json
+import time
+from contextlib import aclosing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterator
+
+from war_room.cache_io import (
+    CacheEntry,
+    NegativeResult,
+    cache_get,
+    cache_get_entry,
+    cache_set,
+    cached_call,
+    cached_call_async,
+    in_background_refresh,
+)
+from war_room.cassette import CassetteMiss
+from war_room.exa_client import AsyncExaClient, BudgetExhausted, ExaClient
+from war_room.metrics import count
+from war_room.models import QuerySpec
+from war_room.retry_policy import CircuitOpenError
+from war_room.run_plan import RunPlan, settle
+
+HITS_PER_QUERY = 5
+SEARCH_MAX_CHARS = 3000
+DEFAULT_MAX_CONCURRENCY = 4
+
+_DAY = 24 * 60 * 60
+MODULE_TTLS: dict[str, float] = {
+    "weather": 1 * _DAY,
+    "carrier_docs": 7 * _DAY,
+    "caselaw": 30 * _DAY,
+    "citecheck": 30 * _DAY,
+}
+
+# Bump when a module's cached payload changes shape, and register an upgrade
+# from the previous version. Version 0 is the unversioned key written before
+# namespacing existed.
+ASSEMBLER_VERSIONS: dict[str, int] = {
+    "weather": 1,
+    "carrier_docs": 1,
+    "caselaw": 1,
+    "citecheck": 1,
+}
+DEFAULT_SCHEMA_VERSION = "v0-demo"
+
+
+def _unchanged(payload: Any) -> Any:
+    return payload
+
+
+_schema_version = DEFAULT_SCHEMA_VERSION
+# Unversioned entries already have the version 1 shape.
+_PAYLOAD_UPGRADES: dict[tuple[str, int], Callable[[Any], Any]] = {
+    (module, 0): _unchanged for module in ASSEMBLER_VERSIONS
+}
+
+
+@dataclass(frozen=True)
+class PackSnapshot:
+    """A pack assembled from the queries that have completed so far.
+
+    Only the snapshot with `final=True` is authoritative (and cached);
+    earlier snapshots are previews for notebooks and UIs.
+    """
+
+    payload: dict[str, Any]
+    completed_queries: int
+    total_queries: int
+    final: bool = False
+
+
+def configure_schema_version(version: str) -> None:
+    """Namespace pack keys by the settings schema version (see bootstrap_runtime)."""
+    global _schema_version
+    _schema_version = version.strip() or DEFAULT_SCHEMA_VERSION
+
+
+def register_payload_upgrade(
+    module: str,
+    from_version: int,
+) -> Callable[[Callable[[Any], Any]], Callable[[Any], Any]]:
+    """Register fn(payload) -> payload upgrading `module` entries from one version to the next."""
+
+    def _register(fn: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        _PAYLOAD_UPGRADES[(module, from_version)] = fn
+        return fn
+
+    return _register
+
+
+def versioned_key(module: str, key: str, *, assembler_version: int | None = None) -> str:
+    """Namespace a cache key by schema version and the module's assembler version."""
+    version = ASSEMBLER_VERSIONS[module] if assembler_version is None else assembler_version
+    if version == 0:
+        return key
+    return f"{key}__{_schema_version}_a{version}"
+
+
+def upgrade_cached_payload(
+    module: str,
+    key: str,
+    *,
+    cache_dir: str | Path,
+    cache_samples_dir: str | Path,
+) -> CacheEntry | None:
+    """Find `key` under an older assembler version and upgrade it to the current one.
+
+    `key` is the unversioned key. Runtime entries are rewritten under the
+    current versioned key, keeping their fetched-at time; committed samples
+    are upgraded in memory only. Returns None when there is nothing to
+    upgrade or no registered path from the stored version.
+    """
+    upgraded = _upgrade_entry(module, key, cache_dir=cache_dir, cache_samples_dir=cache_samples_dir)
+    return upgraded[0] if upgraded is not None else None
+
+
+def _upgrade_entry(
+    module: str,
+    key: str,
+    *,
+    cache_dir: str | Path,
+    cache_samples_dir: str | Path,
+) -> tuple[CacheEntry, str] | None:
+    """upgrade_cached_payload, plus the cache counter a hit on it belongs under."""
+    current = ASSEMBLER_VERSIONS[module]
+    for version in range(current - 1, -1, -1):
+        old_key = versioned_key(module, key, assembler_version=version)
+        for directory in (cache_dir, cache_samples_dir):
+            entry = cache_get_entry(old_key, directory)
+            if entry is None or entry.negative is not None:
+                continue
+            payload = _apply_upgrades(module, copy.deepcopy(entry.value), version, current)
+            if payload is None:
+                return None
+            if directory is cache_samples_dir:
+                # Samples never expire; report them as fetched just now.
+                return CacheEntry(payload, time.time(), entry.size), "cache_samples"
+            cache_set(versioned_key(module, key), payload, cache_dir, fetched_at=entry.fetched_at)
+            return CacheEntry(payload, entry.fetched_at, entry.size), "cache_fresh"
+    return None
+
+
+def cached_versioned_call(
+    module: str,
+    key: str,
+    fn: Callable[[], Any],
+    *,
+    cache_samples_dir: str | Path = "cache_samples",
+    cache_dir: str | Path = "cache",
+    use_cache: bool = True,
+    ttl: float | None = None,
+) -> Any:
+    """cached_call under the module's versioned key, upgrading older entries first."""
+    current_key = versioned_key(module, key)
+    if use_cache and cache_get(current_key, cache_samples_dir) is None and cache_get(current_key, cache_dir) is None:
+        upgraded = _upgrade_entry(module, key, cache_dir=cache_dir, cache_samples_dir=cache_samples_dir)
+        if upgraded is not None and upgraded[0].is_fresh(ttl):
+            entry, counter = upgraded
+            # Counted like the cached_call hit it stands in for.
+            count(counter)
+            return entry.value
+    return cached_call(
+        current_key,
+        fn,
+        cache_samples_dir=cache_samples_dir,
+        cache_dir=cache_dir,
+        use_cache=use_cache,
+        ttl=ttl,
+    )
+
+
+def _apply_upgrades(module: str, payload: Any, version: int, target: int) -> Any | None:
+    for step in range(version, target):
+        upgrade = _PAYLOAD_UPGRADES.get((module, step))
+        if upgrade is None:
+            return None
+        payload = upgrade(payload)
+    return payload
+
+
+def query_cache_key(
+    query: QuerySpec,
+    *,
+    exclude_domains: list[str] | None = None,
+    k: int = HITS_PER_QUERY,
+    max_chars: int = SEARCH_MAX_CHARS,
+) -> str:
+    """Cache key for one query's raw hits, stable across modules and categories."""
+    text = " ".join(query.query.lower().split())
+    include = sorted({domain.lower() for domain in query.preferred_domains})
+    # Mirrors ExaClient: exclude_domains only applies when include is empty.
+    exclude = [] if include else sorted({domain.lower() for domain in exclude_domains or []})
+    canonical = json.dumps(
+        {
+            "query": text,
+            "include_domains": include,
+            "exclude_domains": exclude,
+            "k": k,
+            "max_chars": max_chars,
+            "date_start": query.date_start,
+            "date_end": query.date_end,
+        },
+        sort_keys=True,
+    )
+    digest = hashlib.sha256(canonical.encode()).hexdigest()[:16]
+    return f"query__{text}__{digest}"
+
+
+def pack_cache_key(
+    case_key: str,
+    queries: list[QuerySpec],
+    *,
+    exclude_domains: list[str] | None = None,
+    assembler_version: int | None = None,
+) -> str:
+    """Pack key suffixed with a digest of the query slice the pack is built from.
+
+    Editing an intake (posture, coverage issues, policy type) changes the
+    slice and therefore the key, so a stale pack is never served; queries
+    that did not change are still answered from the per-query tier. The
+    key is namespaced by the slice's module version (see versioned_key).
+    """
+    parts = [
+        f"{query.category}:{query_cache_key(query, exclude_domains=exclude_domains)}"
+        for query in queries
+    ]
+    digest = hashlib.sha256("\n".join(parts).encode()).hexdigest()[:12]
+    key = f"{case_key}__plan_{digest}"
+    if not queries:
+        return key
+    return versioned_key(queries[0].module, key, assembler_version=assembler_version)
+
+
+def lookup_cached_pack(
+    case_key: str,
+    pack_key: str,
+    *,
+    cache_dir: str | Path,
+    cache_samples_dir: str | Path,
+    ttl: float | None = None,
+    queries: list[QuerySpec] | None = None,
+    exclude_domains: list[str] | None = None,
+) -> Any | None:
+    """Find a cached pack without fetching.
+
+    Committed fixtures in cache_samples/ are keyed by the plain case key and
+    still win; runtime entries are looked up by the plan-aware pack key.
+    Given the pack's `queries`, entries stored under an older assembler
+    version are upgraded on the way. A runtime entry older than `ttl` is
+    not returned, leaving the caller's cached_call to serve it stale and
+    refresh it.
+    """
+    for key in (case_key, pack_key):
+        cached = cache_get(key, cache_samples_dir)
+        if cached is not None:
+            count("cache_samples")
+            return cached
+    entry = cache_get_entry(pack_key, cache_dir)
+    counter = "cache_fresh"
+    if entry is None and queries:
+        upgraded = _upgrade_entry(
+            queries[0].module,
+            pack_cache_key(case_key, queries, exclude_domains=exclude_domains, assembler_version=0),
+            cache_dir=cache_dir,
+            cache_samples_dir=cache_samples_dir,
+        )
+        if upgraded is not None:
+            entry, counter = upgraded
+    if entry is not None and entry.is_fresh(ttl):
+        count(counter)
+        return entry.value
+    return None
+
+
+def search_failure_reason(exc: BaseException) -> str | None:
+    """Negative-cache reason for a failed search, or None if it says nothing about the query."""
+    if isinstance(exc, (BudgetExhausted, CircuitOpenError, CassetteMiss)):
+        return None
+    return "error"
+
+
+def _negative_if_empty(hits: list[dict[str, Any]]) -> Any:
+    return hits if hits else NegativeResult("empty", [])
+
+
+def _tag(hits: list[dict[str, Any]], query: QuerySpec) -> list[dict[str, Any]]:
+    for hit in hits:
+        hit["category"] = query.category
+    return hits
+
+
+def run_query(
+    client: ExaClient,
+    query: QuerySpec,
+    *,
+    exclude_domains: list[str] | None = None,
+    use_cache: bool = True,
+    cache_dir: str | Path | None = None,
+    cache_samples_dir: str | Path = "cache_samples",
+    ttl: float | None = None,
+    plan: RunPlan | None = None,
+) -> list[dict[str, Any]]:
+    """Run one query spec and tag each hit with its category.
+
+    With `cache_dir` set, raw hits go through the per-query cache tier,
+    expiring after `ttl` seconds; empty and failed searches are cached
+    under the shorter NEGATIVE_TTLS. With `plan` set, the query's hits,
+    latency and source are recorded on it.
+    """
+    if plan is not None:
+        with plan.track(query) as tracked:
+            tracked.extend(run_query(
+                client,
+                query,
+                exclude_domains=exclude_domains,
+                use_cache=use_cache,
+                cache_dir=cache_dir,
+                cache_samples_dir=cache_samples_dir,
+                ttl=ttl,
+            ))
+        return tracked
+
+    def _search() -> list[dict[str, Any]]:
+        return client.search(
+            query.query,
+            k=HITS_PER_QUERY,
+            include_domains=query.preferred_domains or None,
+            exclude_domains=exclude_domains,
+            max_chars=SEARCH_MAX_CHARS,
+        )
+
+    if cache_dir is None:
+        return _tag(_search(), query)
+
+    hits = cached_call(
+        query_cache_key(query, exclude_domains=exclude_domains),
+        lambda: _negative_if_empty(_search()),
+        cache_samples_dir=cache_samples_dir,
+        cache_dir=cache_dir,
+        use_cache=use_cache,
+        ttl=ttl,
+        classify_error=search_failure_reason,
+    )
+    # Copy before tagging so the cached payload stays category-free.
+    return _tag([dict(hit) for hit in hits], query)
+
+
+def run_queries(
+    client: ExaClient,
+    queries: list[QuerySpec],
+    *,
+    exclude_domains: list[str] | None = None,
+    use_cache: bool = True,
+    cache_dir: str | Path | None = None,
+    cache_samples_dir: str | Path = "cache_samples",
+    ttl: float | None = None,
+    plan: RunPlan | None = None,
+) -> list[dict[str, Any]]:
+    """Run query specs one after another and return the flattened hits."""
+    all_results: list[dict[str, Any]] = []
+    for query in queries:
+        all_results.extend(run_query(
+            client,
+            query,
+            exclude_domains=exclude_domains,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            cache_samples_dir=cache_samples_dir,
+            ttl=ttl,
+            plan=plan,
+        ))
+    return all_results
+
+
+async def run_query_async(
+    client: AsyncExaClient,
+    query: QuerySpec,
+    *,
+    exclude_domains: list[str] | None = None,
+    use_cache: bool = True,
+    cache_dir: str | Path | None = None,
+    cache_samples_dir: str | Path = "cache_samples",
+    ttl: float | None = None,
+    plan: RunPlan | None = None,
+) -> list[dict[str, Any]]:
+    """Async variant of run_query."""
+    if plan is not None:
+        with plan.track(query) as tracked:
+            tracked.extend(await run_query_async(
+                client,
+                query,
+                exclude_domains=exclude_domains,
+                use_cache=use_cache,
+                cache_dir=cache_dir,
+                cache_samples_dir=cache_samples_dir,
+                ttl=ttl,
+            ))
+        return tracked
+
+    async def _search() -> list[dict[str, Any]]:
+        return await client.search(
+            query.query,
+            k=HITS_PER_QUERY,
+            include_domains=query.preferred_domains or None,
+            exclude_domains=exclude_domains,
+            max_chars=SEARCH_MAX_CHARS,
+        )
+
+    if cache_dir is None:
+        return _tag(await _search(), query)
+
+    async def _search_cached() -> Any:
+        return _negative_if_empty(await _search())
+
+    hits = await cached_call_async(
+        query_cache_key(query, exclude_domains=exclude_domains),
+        _search_cached,
+        cache_samples_dir=cache_samples_dir,
+        cache_dir=cache_dir,
+        use_cache=use_cache,
+        ttl=ttl,
+        classify_error=search_failure_reason,
+    )
+    return _tag([dict(hit) for hit in hits], query)
+
+
+async def run_queries_async(
+    client: AsyncExaClient,
+    queries: list[QuerySpec],
+    *,
+    exclude_domains: list[str] | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    use_cache: bool = True,
+    cache_dir: str | Path | None = None,
+    cache_samples_dir: str | Path = "cache_samples",
+    ttl: float | None = None,
+    plan: RunPlan | None = None,
+) -> list[dict[str, Any]]:
+    """Run query specs concurrently, at most `max_concurrency` at a time.
+
+    Hits are returned in query-plan order regardless of completion order,
+    so assembled packs match the sequential path.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _bounded(query: QuerySpec) -> list[dict[str, Any]]:
+        async with semaphore:
+            return await run_query_async(
+                client,
+                query,
+                exclude_domains=exclude_domains,
+                use_cache=use_cache,
+                cache_dir=cache_dir,
+                cache_samples_dir=cache_samples_dir,
+                ttl=ttl,
+                plan=plan,
+            )
+
+    batches = await asyncio.gather(*(_bounded(query) for query in queries))
+    return [hit for batch in batches for hit in batch]
+
+
+def stream_queries(
+    client: ExaClient,
+    queries: list[QuerySpec],
+    assemble: Callable[[list[dict[str, Any]]], dict[str, Any]],
+    *,
+    exclude_domains: list[str] | None = None,
+    snapshot_every: int = 1,
+    on_final: Callable[[dict[str, Any]], None] | None = None,
+    use_cache: bool = True,
+    cache_dir: str | Path | None = None,
+    cache_samples_dir: str | Path = "cache_samples",
+    ttl: float | None = None,
+    plan: RunPlan | None = None,
+) -> Iterator[PackSnapshot]:
+    """Run queries in order, yielding a re-assembled pack every `snapshot_every` queries.
+
+    The last snapshot is final; `on_final` sees its payload before it is
+    yielded, so the pack is cached even if the consumer stops right there.
+    """
+    if snapshot_every < 1:
+        raise ValueError("snapshot_every must be at least 1")
+
+    total = len(queries)
+    results: list[dict[str, Any]] = []
+    for index, query in enumerate(queries, 1):
+        results.extend(run_query(
+            client,
+            query,
+            exclude_domains=exclude_domains,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            cache_samples_dir=cache_samples_dir,
+            ttl=ttl,
+            plan=plan,
+        ))
+        if index < total and index % snapshot_every == 0:
+            yield PackSnapshot(assemble(list(results)), index, total)
+
+    payload = assemble(results)
+    if on_final is not None:
+        on_final(payload)
+    yield PackSnapshot(payload, total, total, final=True)
+
+
+async def stream_queries_async(
+    client: AsyncExaClient,
+    queries: list[QuerySpec],
+    assemble: Callable[[list[dict[str, Any]]], dict[str, Any]],
+    *,
+    exclude_domains: list[str] | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    snapshot_every: int = 1,
+    on_final: Callable[[dict[str, Any]], None] | None = None,
+    use_cache: bool = True,
+    cache_dir: str | Path | None = None,
+    cache_samples_dir: str | Path = "cache_samples",
+    ttl: float | None = None,
+    plan: RunPlan | None = None,
+) -> AsyncIterator[PackSnapshot]:
+    """Run queries concurrently, yielding a snapshot as each batch of queries lands.
+
+    Snapshots always assemble hits in query-plan order, so the final payload
+    matches build_*_async exactly.
+    """
+    if max_concurrency < 1:
+        raise ValueError("max_concurrency must be at least 1")
+    if snapshot_every < 1:
+        raise ValueError("snapshot_every must be at least 1")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _bounded(index: int, query: QuerySpec) -> tuple[int, list[dict[str, Any]]]:
+        async with semaphore:
+            hits = await run_query_async(
+                client,
+                query,
+                exclude_domains=exclude_domains,
+                use_cache=use_cache,
+                cache_dir=cache_dir,
+                cache_samples_dir=cache_samples_dir,
+                ttl=ttl,
+                plan=plan,
+            )
+        return index, hits
+
+    total = len(queries)
+    by_index: dict[int, list[dict[str, Any]]] = {}
+
+    def _ordered() -> list[dict[str, Any]]:
+        return [hit for index in sorted(by_index) for hit in by_index[index]]
+
+    tasks = [asyncio.ensure_future(_bounded(i, q)) for i, q in enumerate(queries)]
+    try:
+        for completed in asyncio.as_completed(tasks):
+            index, hits = await completed
+            by_index[index] = hits
+            done = len(by_index)
+            if done < total and done % snapshot_every == 0:
+                yield PackSnapshot(assemble(_ordered()), done, total)
+    finally:
+        for task in tasks:
+            task.cancel()
+
+    payload = assemble(_ordered())
+    if on_final is not None:
+        on_final(payload)
+    yield PackSnapshot(payload, total, total, final=True)
+
+
+@dataclass(frozen=True)
+class ModulePack:
+    """What a module contributes to the shared pack pipeline (build_pack and friends).
+
+    `module` is the query-plan module name, which also keys MODULE_TTLS;
+    `label` names the pack in fallback warnings ("weather brief").
+    """
+
+    module: str
+    label: str
+    case_key: str
+    pack_key: str
+    queries: list[QuerySpec]
+    assemble: Callable[[list[dict[str, Any]]], dict[str, Any]]
+    empty: Callable[[str], dict[str, Any]]
+    exclude_domains: list[str] | None = None
+
+    @property
+    def ttl(self) -> float:
+        return MODULE_TTLS[self.module]
+
+    def lookup(self, *, cache_dir: str | Path, cache_samples_dir: str | Path, ttl: float | None) -> Any | None:
+        return lookup_cached_pack(
+            self.case_key,
+            self.pack_key,
+            cache_dir=cache_dir,
+            cache_samples_dir=cache_samples_dir,
+            queries=self.queries,
+            exclude_domains=self.exclude_domains,
+            ttl=ttl,
+        )
+
+    def no_client(self) -> dict[str, Any]:
+        return self.empty(f"No Exa client available and no cached {self.label} found.")
+
+    def circuit_open(self) -> dict[str, Any]:
+        return self.empty(f"Exa provider unavailable (circuit open) and no cached {self.label} found.")
+
+
+def _fetch_plan(client: Any, plan: RunPlan | None) -> RunPlan | None:
+    """The plan a pack fetch records on.
+
+    A background refresh can outlive the run that scheduled it, so it
+    records on no plan, and is skipped once the client's budget is spent.
+    """
+    if not in_background_refresh():
+        return plan
+    if getattr(client, "budget_remaining", None) == 0:
+        raise BudgetExhausted("search budget spent; background refresh skipped")
+    return None
+
+
+def build_pack(
+    spec: ModulePack,
+    client: ExaClient | None,
+    *,
+    use_cache: bool = True,
+    cache_dir: str = "cache",
+    cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
+) -> dict[str, Any]:
+    """Cached pack, else fetch and assemble it; an empty payload without a provider."""
+    queries = spec.queries
+    if use_cache:
+        # Offline, a stale pack beats an empty one: only expire it with a client.
+        ttl = spec.ttl if client is not None else None
+        cached = spec.lookup(cache_dir=cache_dir, cache_samples_dir=cache_samples_dir, ttl=ttl)
+        if cached is not None:
+            settle(plan, queries, "pack")
+            return cached
+
+    # Graceful fallback: no client available and nothing cached. Return a safe empty payload.
+    if client is None:
+        settle(plan, queries, "skipped")
+        return spec.no_client()
+
+    def _fetch() -> dict[str, Any]:
+        results = run_queries(
+            client,
+            queries,
+            exclude_domains=spec.exclude_domains,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            cache_samples_dir=cache_samples_dir,
+            plan=_fetch_plan(client, plan),
+            ttl=spec.ttl,
+        )
+        return spec.assemble(results)
+
+    try:
+        pack = cached_call(
+            spec.pack_key,
+            _fetch,
+            cache_samples_dir=cache_samples_dir,
+            cache_dir=cache_dir,
+            use_cache=use_cache,
+            ttl=spec.ttl,
+        )
+    except CircuitOpenError:
+        # Provider is down and the cache missed: degrade instead of stalling.
+        settle(plan, queries, "skipped")
+        return spec.circuit_open()
+    settle(plan, queries, "pack")
+    return pack
+
+
+async def build_pack_async(
+    spec: ModulePack,
+    client: AsyncExaClient | None,
+    *,
+    use_cache: bool = True,
+    cache_dir: str = "cache",
+    cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> dict[str, Any]:
+    """Async variant of build_pack; runs the module's queries concurrently."""
+    if client is None:
+        return build_pack(
+            spec, None, use_cache=use_cache, cache_dir=cache_dir, cache_samples_dir=cache_samples_dir, plan=plan
+        )
+
+    queries = spec.queries
+    if use_cache:
+        cached = spec.lookup(cache_dir=cache_dir, cache_samples_dir=cache_samples_dir, ttl=spec.ttl)
+        if cached is not None:
+            settle(plan, queries, "pack")
+            return cached
+
+    async def _fetch() -> dict[str, Any]:
+        results = await run_queries_async(
+            client,
+            queries,
+            exclude_domains=spec.exclude_domains,
+            max_concurrency=max_concurrency,
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            cache_samples_dir=cache_samples_dir,
+            plan=_fetch_plan(client, plan),
+            ttl=spec.ttl,
+        )
+        return spec.assemble(results)
+
+    try:
+        pack = await cached_call_async(
+            spec.pack_key,
+            _fetch,
+            cache_samples_dir=cache_samples_dir,
+            cache_dir=cache_dir,
+            use_cache=use_cache,
+            ttl=spec.ttl,
+        )
+    except CircuitOpenError:
+        settle(plan, queries, "skipped")
+        return spec.circuit_open()
+    settle(plan, queries, "pack")
+    return pack
+
+
+def stream_pack(
+    spec: ModulePack,
+    client: ExaClient | None,
+    *,
+    use_cache: bool = True,
+    cache_dir: str = "cache",
+    cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
+    snapshot_every: int = 1,
+) -> Iterator[PackSnapshot]:
+    """Streaming variant of build_pack.
+
+    Yields a partial pack after every `snapshot_every` queries, then the
+    final pack, which is cached exactly as build_pack would cache it.
+    Cache hits and fallbacks yield a single final snapshot.
+    """
+    queries = spec.queries
+    total = len(queries)
+    if use_cache:
+        ttl = spec.ttl if client is not None else None
+        cached = spec.lookup(cache_dir=cache_dir, cache_samples_dir=cache_samples_dir, ttl=ttl)
+        if cached is not None:
+            settle(plan, queries, "pack")
+            yield PackSnapshot(cached, total, total, final=True)
+            return
+
+    if client is None:
+        settle(plan, queries, "skipped")
+        yield PackSnapshot(spec.no_client(), 0, total, final=True)
+        return
+
+    try:
+        yield from stream_queries(
+            client,
+            queries,
+            spec.assemble,
+            exclude_domains=spec.exclude_domains,
+            snapshot_every=snapshot_every,
+            on_final=lambda payload: cache_set(spec.pack_key, payload, cache_dir),
+            use_cache=use_cache,
+            cache_dir=cache_dir,
+            cache_samples_dir=cache_samples_dir,
+            plan=plan,
+            ttl=spec.ttl,
+        )
+    except CircuitOpenError:
+        settle(plan, queries, "skipped")
+        yield PackSnapshot(spec.circuit_open(), 0, total, final=True)
+
+
+async def stream_pack_async(
+    spec: ModulePack,
+    client: AsyncExaClient | None,
+    *,
+    use_cache: bool = True,
+    cache_dir: str = "cache",
+    cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    snapshot_every: int = 1,
+) -> AsyncIterator[PackSnapshot]:
+    """Async variant of stream_pack; snapshots arrive as queries complete."""
+    if client is None:
+        for snapshot in stream_pack(
+            spec, None, use_cache=use_cache, cache_dir=cache_dir, cache_samples_dir=cache_samples_dir, plan=plan
+        ):
+            yield snapshot
+        return
+
+    queries = spec.queries
+    total = len(queries)
+    if use_cache:
+        cached = spec.lookup(cache_dir=cache_dir, cache_samples_dir=cache_samples_dir, ttl=spec.ttl)
+        if cached is not None:
+            settle(plan, queries, "pack")
+            yield PackSnapshot(cached, total, total, final=True)
+            return
+
+    snapshots = stream_queries_async(
+        client,
+        queries,
+        spec.assemble,
+        exclude_domains=spec.exclude_domains,
+        max_concurrency=max_concurrency,
+        snapshot_every=snapshot_every,
+        on_final=lambda payload: cache_set(spec.pack_key, payload, cache_dir),
+        use_cache=use_cache,
+        cache_dir=cache_dir,
+        cache_samples_dir=cache_samples_dir,
+        plan=plan,
+        ttl=spec.ttl,
+    )
+    try:
+        async with aclosing(snapshots):
+            async for snapshot in snapshots:
+                yield snapshot
+    except CircuitOpenError:
+        settle(plan, queries, "skipped")
+        yield PackSnapshot(spec.circuit_open(), 0, total, final=True)
@@ -0,0 +1,344 @@
+"""Retry policy and circuit breaker for provider calls.
+
+`RetryPolicy` decides whether and how long to wait before retrying a failed
+call: decorrelated jitter between attempts, Retry-After hints honored, and a
+total deadline across all attempts. Only transient failures are retried:
+429 and 5xx responses, and connection and timeout errors. Anything else,
+client errors and programming errors alike, fails on the first attempt and
+does not count toward tripping the breaker. `CircuitBreaker` fails fast once
+the provider looks down so runs fall back to cache instead of stalling on
+every query.
+
+Both record what they do (`RetryStats`, `CircuitBreaker.transitions`) so a
+run can report retry counts and breaker trips.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import re
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable
+
+try:  # Optional: exa-py's sync transport.
+    import requests
+except ImportError:
+    requests = None
+
+try:  # Optional: exa-py's async transport.
+    import httpx
+except ImportError:
+    httpx = None
+
+_STATUS_RE = re.compile(r"status code (\d{3})")
+_RETRY_AFTER_RE = re.compile(r"retry[-_ ]after[\"':= ]+(\d+(?:\.\d+)?)", re.IGNORECASE)
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker is open and the call was not attempted."""
+
+
+# Network failures that carry no HTTP status but are worth another attempt.
+TRANSIENT_ERRORS: tuple[type[BaseException], ...] = (
+    ConnectionError,
+    TimeoutError,
+    *((requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) if requests else ()),
+    *((httpx.TransportError,) if httpx else ()),
+)
+
+
+def error_status_code(exc: BaseException) -> int | None:
+    """Best-effort HTTP status for an exception raised by exa-py or its transport."""
+    response = getattr(exc, "response", None)
+    status = getattr(response, "status_code", None) or getattr(exc, "status_code", None)
+    if isinstance(status, int):
+        return status
+    match = _STATUS_RE.search(str(exc))
+    if match:
+        return int(match.group(1))
+    return None
+
+
+def retry_after_seconds(exc: BaseException) -> float | None:
+    """Extract a Retry-After hint (seconds) from an exception, if it carries one."""
+    hint = getattr(exc, "retry_after", None)
+    if hint is None:
+        headers = getattr(getattr(exc, "response", None), "headers", None) or {}
+        hint = headers.get("Retry-After") if hasattr(headers, "get") else None
+    if hint is None:
+        match = _RETRY_AFTER_RE.search(str(exc))
+        hint = match.group(1) if match else None
+    try:
+        return max(0.0, float(hint)) if hint is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+@dataclass(frozen=True)
+class RetryPolicy:
+    """How failed provider calls are retried."""
+
+    max_attempts: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 8.0
+    deadline: float | None = 20.0
+    max_retry_after: float = 30.0
+    never_retry: tuple[type[BaseException], ...] = ()
+
+    def is_retryable(self, exc: BaseException) -> bool:
+        """Transient errors (429, 5xx, TRANSIENT_ERRORS) retry; everything else does not."""
+        if isinstance(exc, (CircuitOpenError, *self.never_retry)):
+            return False
+        status = error_status_code(exc)
+        if status is not None:
+            return status == 429 or status >= 500
+        return isinstance(exc, TRANSIENT_ERRORS)
+
+    def next_delay(self, previous: float, exc: BaseException, rng: random.Random) -> float:
+        """Decorrelated jitter, raised to any Retry-After hint the provider sent."""
+        ceiling = max(self.base_delay, previous * 3)
+        delay = min(self.max_delay, rng.uniform(self.base_delay, ceiling))
+        hint = retry_after_seconds(exc)
+        if hint is not None:
+            delay = max(delay, min(hint, self.max_retry_after))
+        return delay
+
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+
+@dataclass
+class RetryStats:
+    """Thread-safe counters describing retry behavior for one client."""
+
+    calls: int = 0
+    attempts: int = 0
+    retries: int = 0
+    failures: int = 0
+    short_circuited: int = 0
+    errors_by_type: dict[str, int] = field(default_factory=dict)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def _bump(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            setattr(self, name, getattr(self, name) + amount)
+
+    def _record_error(self, exc: BaseException) -> None:
+        with self._lock:
+            key = type(exc).__name__
+            self.errors_by_type[key] = self.errors_by_type.get(key, 0) + 1
+
+    def as_dict(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "calls": self.calls,
+                "attempts": self.attempts,
+                "retries": self.retries,
+                "failures": self.failures,
+                "short_circuited": self.short_circuited,
+                "errors_by_type": dict(self.errors_by_type),
+            }
+
+
+class CircuitBreaker:
+    """Closed -> open after `failure_threshold` consecutive failures.
+
+    While open, calls fail fast with CircuitOpenError. After `reset_timeout`
+    seconds one trial call is let through (half-open); its outcome closes or
+    re-opens the circuit. Every state change is appended to `transitions`.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if failure_threshold < 1:
+            raise ValueError("failure_threshold must be at least 1")
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+        self.transitions: list[dict[str, Any]] = []
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._state
+
+    def _transition(self, new_state: str) -> None:
+        self.transitions.append({
+            "from": self._state,
+            "to": new_state,
+            "at": time.time(),
+            "failures": self._failures,
+        })
+        self._state = new_state
+
+    def before_call(self) -> None:
+        """Raise CircuitOpenError unless a call may proceed now."""
+        with self._lock:
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    raise CircuitOpenError("Circuit open - provider marked unavailable")
+                self._transition(self.HALF_OPEN)
+            if self._state == self.HALF_OPEN:
+                if self._trial_in_flight:
+                    raise CircuitOpenError("Circuit half-open - trial call in flight")
+                self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._trial_in_flight = False
+            if self._state != self.CLOSED:
+                self._transition(self.CLOSED)
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or (
+                self._state == self.CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = self._clock()
+                self._transition(self.OPEN)
+
+    def record_ignored(self) -> None:
+        """A non-provider failure (e.g. a 4xx): release a trial without judging health."""
+        with self._lock:
+            self._trial_in_flight = False
+
+
+class _RetryRun:
+    """Per-call bookkeeping shared by the sync and async retry loops."""
+
+    def __init__(
+        self,
+        policy: RetryPolicy,
+        breaker: CircuitBreaker | None,
+        stats: RetryStats | None,
+        rng: random.Random,
+    ):
+        self.policy = policy
+        self.breaker = breaker
+        self.stats = stats
+        self.rng = rng
+        self.started = time.monotonic()
+        self.delay = policy.base_delay
+        if stats is not None:
+            stats._bump("calls")
+
+    def before_attempt(self) -> None:
+        if self.breaker is not None:
+            try:
+                self.breaker.before_call()
+            except CircuitOpenError:
+                if self.stats is not None:
+                    self.stats._bump("short_circuited")
+                raise
+        if self.stats is not None:
+            self.stats._bump("attempts")
+
+    def on_success(self) -> None:
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+    def on_failure(self, exc: BaseException, attempt: int) -> float | None:
+        """Record a failed attempt; return the wait before retrying, or None to give up."""
+        retryable = self.policy.is_retryable(exc)
+        if self.stats is not None:
+            self.stats._record_error(exc)
+        if self.breaker is not None:
+            if retryable:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_ignored()
+
+        give_up = not retryable or attempt >= self.policy.max_attempts
+        if not give_up:
+            self.delay = self.policy.next_delay(self.delay, exc, self.rng)
+            if self.policy.deadline is not None:
+                elapsed = time.monotonic() - self.started
+                give_up = elapsed + self.delay > self.policy.deadline
+
+        if give_up:
+            if self.stats is not None:
+                self.stats._bump("failures")
+            return None
+        if self.stats is not None:
+            self.stats._bump("retries")
+        return self.delay
+
+
+def call_with_retry(
+    fn: Callable[[], Any],
+    *,
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    breaker: CircuitBreaker | None = None,
+    stats: RetryStats | None = None,
+    before_attempt: Callable[[], None] | None = None,
+    sleep: Callable[[float], None] | None = None,
+    rng: random.Random | None = None,
+) -> Any:
+    """Call fn() under `policy`, consulting `breaker` before every attempt."""
+    run = _RetryRun(policy, breaker, stats, rng or random.Random())
+    sleep = sleep or time.sleep
+    attempt = 0
+    while True:
+        attempt += 1
+        run.before_attempt()
+        try:
+            if before_attempt is not None:
+                before_attempt()
+            result = fn()
+        except Exception as exc:
+            wait = run.on_failure(exc, attempt)
+            if wait is None:
+                raise
+            sleep(wait)
+            continue
+        run.on_success()
+        return result
+
+
+async def call_with_retry_async(
+    fn: Callable[[], Awaitable[Any]],
+    *,
+    policy: RetryPolicy = DEFAULT_RETRY_POLICY,
+    breaker: CircuitBreaker | None = None,
+    stats: RetryStats | None = None,
+    before_attempt: Callable[[], Awaitable[None]] | None = None,
+    rng: random.Random | None = None,
+) -> Any:
+    """Async variant of call_with_retry; waits with asyncio.sleep."""
+    run = _RetryRun(policy, breaker, stats, rng or random.Random())
+    attempt = 0
+    while True:
+        attempt += 1
+        run.before_attempt()
+        try:
+            if before_attempt is not None:
+                await before_attempt()
+            result = await fn()
+        except Exception as exc:
+            wait = run.on_failure(exc, attempt)
+            if wait is None:
+                raise
+            await asyncio.sleep(wait)
+            continue
+        run.on_success()
+        return result
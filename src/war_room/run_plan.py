@@ -0,0 +1,175 @@
+"""The canonical query plan of one run, and what each query returned.
+
+A RunPlan is built once per run from the intake (generate_query_plan) and
+handed to every module and to the memo. Modules take their slice from it
+instead of regenerating the plan, and retrieval records each query's
+outcome on it:
+
+- hits: how many results the query returned
+- seconds: wall time of the lookup, cache included
+- source: where the hits came from, from the metrics the lookup produced:
+  "samples", "cache", "stale", "negative" (a cached empty or failed
+  search), "workspace" (shared by an EventWorkspace), "live", or "error";
+  modules mark queries they never had to run as "pack" (served from a
+  cached pack) or "skipped" (no client and nothing cached)
+
+Query ids are derived from the query itself (module, text, domains, dates),
+so the same query has the same id in every run and every intake; a repeat
+within one plan gets a `-2` suffix.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass
+from typing import Any, Iterator
+
+from war_room.metrics import collect
+from war_room.models import QuerySpec
+from war_room.query_plan import CaseIntake, generate_query_plan
+
+# Checked in order: the first counter a lookup produced names its source.
+_SOURCE_COUNTERS = (
+    ("cache_samples", "samples"),
+    ("cache_fresh", "cache"),
+    ("cache_stale", "stale"),
+    ("cache_negative", "negative"),
+    ("workspace_reused", "workspace"),
+)
+
+
+def query_id(query: QuerySpec) -> str:
+    """Stable id for a query spec, e.g. `weather-3f2a9c1d`."""
+    canonical = json.dumps(
+        [
+            query.module,
+            " ".join(query.query.lower().split()),
+            sorted(domain.lower() for domain in query.preferred_domains),
+            query.date_start,
+            query.date_end,
+        ]
+    )
+    return f"{query.module}-{hashlib.sha256(canonical.encode()).hexdigest()[:8]}"
+
+
+@dataclass
+class QueryOutcome:
+    """What one query returned in this run."""
+
+    source: str
+    hits: int | None = None
+    seconds: float | None = None
+    error: str | None = None
+
+
+class RunPlan:
+    """One run's queries, with stable ids and per-query outcomes.
+
+    Thread-safe: modules running concurrently record into the same plan.
+    """
+
+    def __init__(self, queries: list[QuerySpec]):
+        self.queries = list(queries)
+        self._ids: dict[int, str] = {}
+        seen: dict[str, int] = {}
+        for query in self.queries:
+            base = query_id(query)
+            seen[base] = seen.get(base, 0) + 1
+            self._ids[id(query)] = base if seen[base] == 1 else f"{base}-{seen[base]}"
+        self._outcomes: dict[str, QueryOutcome] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, intake: CaseIntake) -> RunPlan:
+        return cls(generate_query_plan(intake))
+
+    def __len__(self) -> int:
+        return len(self.queries)
+
+    def __iter__(self) -> Iterator[QuerySpec]:
+        return iter(self.queries)
+
+    def for_module(self, module: str) -> list[QuerySpec]:
+        """The module's slice, in plan order."""
+        return [query for query in self.queries if query.module == module]
+
+    def id_of(self, query: QuerySpec) -> str:
+        """The id of a query in this plan; an equal spec from elsewhere gets its content id."""
+        return self._ids.get(id(query)) or query_id(query)
+
+    def outcome(self, query: QuerySpec) -> QueryOutcome | None:
+        with self._lock:
+            return self._outcomes.get(self.id_of(query))
+
+    def record(self, query: QuerySpec, outcome: QueryOutcome) -> None:
+        with self._lock:
+            self._outcomes[self.id_of(query)] = outcome
+
+    def settle(self, queries: list[QuerySpec], source: str) -> None:
+        """Mark queries that have no outcome yet, e.g. because a cached pack answered for them."""
+        with self._lock:
+            for query in queries:
+                self._outcomes.setdefault(self.id_of(query), QueryOutcome(source=source))
+
+    @contextmanager
+    def track(self, query: QuerySpec) -> Iterator[list[dict[str, Any]]]:
+        """Time a lookup and record its outcome; append the hits to the yielded list.
+
+        Used by retrieval around each query; an exception is recorded and re-raised.
+        """
+        hits: list[dict[str, Any]] = []
+        started = time.perf_counter()
+        with collect() as tally:
+            try:
+                yield hits
+            except BaseException as exc:
+                self.record(query, QueryOutcome(
+                    source="error",
+                    seconds=round(time.perf_counter() - started, 4),
+                    error=type(exc).__name__,
+                ))
+                raise
+        counts = tally.as_dict()
+        source = next((name for counter, name in _SOURCE_COUNTERS if counts[counter]), "live")
+        self.record(query, QueryOutcome(source=source, hits=len(hits), seconds=round(time.perf_counter() - started, 4)))
+
+    def rows(self) -> list[dict[str, Any]]:
+        """One row per query in plan order: id, module, category, query, and its outcome."""
+        with self._lock:
+            outcomes = dict(self._outcomes)
+        rows = []
+        for query in self.queries:
+            qid = self.id_of(query)
+            outcome = outcomes.get(qid) or QueryOutcome(source="not_run")
+            rows.append({
+                "id": qid,
+                "module": query.module,
+                "category": query.category,
+                "query": query.query,
+                **asdict(outcome),
+            })
+        return rows
+
+    def summary(self) -> dict[str, int]:
+        """Queries per source."""
+        counts: dict[str, int] = {}
+        for row in self.rows():
+            counts[row["source"]] = counts.get(row["source"], 0) + 1
+        return counts
+
+
+def settle(plan: RunPlan | None, queries: list[QuerySpec], source: str) -> None:
+    """RunPlan.settle, for callers whose plan is optional."""
+    if plan is not None:
+        plan.settle(queries, source)
+
+
+def module_queries(intake: CaseIntake, module: str, plan: RunPlan | None = None) -> list[QuerySpec]:
+    """A module's queries: its slice of `plan`, or of a freshly generated plan without one."""
+    if plan is not None:
+        return plan.for_module(module)
+    return [query for query in generate_query_plan(intake) if query.module == module]
@@ -0,0 +1,184 @@
+"""End-to-end run of one intake, with a run record.
+
+    python -m war_room run eval/intakes/milton.json [--case-key milton] [--offline]
+
+Validates the intake (load_case_intake), runs the pipeline - query plan,
+weather / carrier / caselaw, citation spot-check, memo - and writes the
+memo to OUTPUT_DIR. A JSON run record goes to RUNS_DIR with per-stage wall
+time, cache lookups by outcome, and Exa calls and bytes (war_room.metrics),
+plus run totals, the client's budget and retry counters, and one row per
+planned query with its id, hits, latency and source (war_room.run_plan). A run that
+fails still leaves a record with the error, and exits 1.
+
+Without an Exa key, with live retrieval disabled by settings, or with
+--offline, modules answer from cache_samples/ and the runtime cache only.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import time
+import uuid
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+from war_room.cache_io import normalize_key
+from war_room.export_md import write_markdown
+from war_room.pipeline import STAGES, run_pipeline, run_stage
+from war_room.query_plan import CaseIntake, load_case_intake
+from war_room.rate_limit import BudgetLedger
+from war_room.run_plan import RunPlan
+from war_room.settings import WarRoomSettings
+from war_room.workspace import EventWorkspace
+
+DEFAULT_MAX_SEARCH_CALLS = 30
+
+
+def new_run_id(case_key: str) -> str:
+    """Sortable, collision-safe id: case key, UTC start time, random suffix."""
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    return f"{case_key}_{stamp}_{uuid.uuid4().hex[:6]}"
+
+
+def run_intake(
+    intake: CaseIntake,
+    client: Any | None,
+    *,
+    settings: WarRoomSettings,
+    case_key: str,
+    intake_path: str | Path | None = None,
+    workspace: EventWorkspace | None = None,
+) -> dict[str, Any]:
+    """Run the pipeline and write the memo; returns the run record.
+
+    Exceptions are caught and recorded, not raised: check record["status"].
+    """
+    run_id = new_run_id(case_key)
+    started_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+    started = time.perf_counter()
+    stages: dict[str, dict[str, Any]] = {}
+    memo_path: Path | None = None
+    plan: RunPlan | None = None
+    error: str | None = None
+    try:
+        plan = run_stage(stages, "query_plan", RunPlan.build, intake)
+        result = run_pipeline(
+            intake,
+            client,
+            use_cache=settings.use_cache,
+            cache_dir=str(settings.cache_dir),
+            cache_samples_dir=str(settings.cache_samples_dir),
+            stages=stages,
+            workspace=workspace,
+            plan=plan,
+        )
+        memo_path = run_stage(stages, "write", write_markdown, settings.output_dir, case_key, result.memo_md)
+    except Exception as exc:
+        error = f"{type(exc).__name__}: {exc}"
+    # Module stages finish in any order; list them in pipeline order.
+    stages = {name: stages[name] for name in (*STAGES, "write") if name in stages}
+
+    return {
+        "run_id": run_id,
+        "case_key": case_key,
+        "status": "ok" if error is None else "error",
+        "error": error,
+        "mode": "live" if client is not None else "offline",
+        "started_at": started_at,
+        "wall_seconds": round(time.perf_counter() - started, 4),
+        "intake_path": str(intake_path) if intake_path is not None else None,
+        "intake": intake.model_dump(),
+        "query_count": len(plan) if plan is not None else None,
+        "query_sources": plan.summary() if plan is not None else None,
+        "queries": plan.rows() if plan is not None else None,
+        "memo_path": str(memo_path) if memo_path is not None else None,
+        "stages": stages,
+        "totals": _totals(stages),
+        "exa": _client_summary(client),
+    }
+
+
+def _totals(stages: dict[str, dict[str, Any]]) -> dict[str, int]:
+    totals: dict[str, int] = {}
+    for stage in stages.values():
+        for name, value in stage.items():
+            if name not in ("seconds", "error"):
+                totals[name] = totals.get(name, 0) + value
+    return totals
+
+
+def _client_summary(client: Any | None) -> dict[str, Any] | None:
+    if client is None:
+        return None
+    summary: dict[str, Any] = {
+        "search_count": getattr(client, "search_count", None),
+        "contents_count": getattr(client, "contents_count", None),
+        "budget_remaining": getattr(client, "budget_remaining", None),
+    }
+    retry_stats = getattr(client, "retry_stats", None)
+    if retry_stats is not None:
+        summary["retries"] = retry_stats.as_dict()
+    return summary
+
+
+def write_run_record(runs_dir: str | Path, record: dict[str, Any]) -> Path:
+    """Write a run record as runs_dir/<run_id>.json."""
+    out = Path(runs_dir)
+    out.mkdir(parents=True, exist_ok=True)
+    path = out / f"{record['run_id']}.json"
+    path.write_text(json.dumps(record, indent=2, default=str), encoding="utf-8")
+    return path
+
+
+def make_client(
+    settings: WarRoomSettings,
+    *,
+    offline: bool,
+    max_search_calls: int,
+    budget_ledger: BudgetLedger | None = None,
+) -> Any | None:
+    """A live ExaClient, or None when the run should stay on cached data."""
+    if offline or not settings.live_retrieval_enabled or not settings.exa_api_key_value:
+        return None
+    from war_room.exa_client import ExaClient
+
+    return ExaClient(
+        api_key=settings.exa_api_key_value,
+        max_search_calls=max_search_calls,
+        budget_ledger=budget_ledger,
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m war_room run", description="Run one intake end to end.")
+    parser.add_argument("intake", type=Path, help="Case intake JSON file.")
+    parser.add_argument("--case-key", help="Memo and run-record name (default: the intake file name).")
+    parser.add_argument("--offline", action="store_true", help="Never call Exa; answer from caches only.")
+    parser.add_argument("--max-search-calls", type=int, default=DEFAULT_MAX_SEARCH_CALLS)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    from war_room.bootstrap import bootstrap_runtime
+
+    settings = bootstrap_runtime().settings
+    try:
+        intake = load_case_intake(args.intake)
+    except ValueError as exc:
+        print(f"error: {exc}")
+        return 2
+
+    case_key = normalize_key(args.case_key or args.intake.stem)
+    client = make_client(settings, offline=args.offline, max_search_calls=args.max_search_calls)
+    record = run_intake(intake, client, settings=settings, case_key=case_key, intake_path=args.intake)
+    record_path = write_run_record(settings.runs_dir, record)
+
+    for name, stage in record["stages"].items():
+        print(f"{name:<11} {stage['seconds']:8.3f}s  exa {stage['exa_searches']:>3}  cache miss {stage['cache_miss']:>3}")
+    print(f"{record['status']}: {record['wall_seconds']:.3f}s, memo {record['memo_path']}, record {record_path}")
+    if record["error"]:
+        print(f"error: {record['error']}")
+    return 0 if record["status"] == "ok" else 1
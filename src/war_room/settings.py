@@ -41,6 +41,8 @@ class WarRoomSettings(BaseModel):
     cache_samples_dir: Path
     output_dir: Path
     runs_dir: Path
+    cache_max_bytes: int | None = 1024 * 1024 * 1024
+    cache_max_age_days: float | None = None
     feature_flags: FeatureFlags = Field(default_factory=FeatureFlags)
 
     @field_validator("schema_version")
@@ -75,6 +77,8 @@ class WarRoomSettings(BaseModel):
             "cache_samples_dir": str(self.cache_samples_dir),
             "output_dir": str(self.output_dir),
             "runs_dir": str(self.runs_dir),
+            "cache_max_bytes": self.cache_max_bytes,
+            "cache_max_age_days": self.cache_max_age_days,
             "offline_demo": self.offline_demo,
             "live_retrieval_enabled": self.live_retrieval_enabled,
             "exa_api_key_set": bool(self.exa_api_key_value),
@@ -97,6 +101,8 @@ def load_settings(*, repo_root: Path, env_file: Path | None = None) -> WarRoomSe
     if app_env == RuntimeEnvironment.DEMO:
         allow_live_retrieval = False
 
+    cache_max_mb = _parse_limit(values.get("CACHE_MAX_MB"), default=1024)
+
     return WarRoomSettings(
         app_env=app_env,
         use_cache=use_cache,
@@ -106,6 +112,8 @@ def load_settings(*, repo_root: Path, env_file: Path | None = None) -> WarRoomSe
         cache_samples_dir=_resolve_path(repo_root, values.get("CACHE_SAMPLES_DIR", "cache_samples")),
         output_dir=_resolve_path(repo_root, values.get("OUTPUT_DIR", "output")),
         runs_dir=_resolve_path(repo_root, values.get("RUNS_DIR", "runs")),
+        cache_max_bytes=None if cache_max_mb is None else int(cache_max_mb * 1024 * 1024),
+        cache_max_age_days=_parse_limit(values.get("CACHE_MAX_AGE_DAYS"), default=None),
         feature_flags=FeatureFlags(
             allow_live_retrieval=allow_live_retrieval,
             enable_notebook_surface=_parse_bool(values.get("ENABLE_NOTEBOOK_SURFACE"), default=True),
@@ -143,6 +151,19 @@ def _parse_bool(raw_value: str | None, *, default: bool) -> bool:
     raise ValueError(f"Invalid boolean value: {raw_value!r}")
 
 
+def _parse_limit(raw_value: str | None, *, default: float | None) -> float | None:
+    """Parse an optional positive limit; 0 or an empty value means unlimited."""
+    if raw_value is None:
+        return default
+
+    cleaned = raw_value.strip()
+    try:
+        value = float(cleaned) if cleaned else 0.0
+    except ValueError:
+        raise ValueError(f"Invalid numeric limit: {raw_value!r}") from None
+    return value if value > 0 else None
+
+
 def _secret_or_none(raw_value: str | None) -> SecretStr | None:
     if raw_value is None:
         return None
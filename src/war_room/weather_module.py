@@ -7,12 +7,22 @@ Extracts metrics only when present in retrieved content.
 from __future__ import annotations
 
 import re
-from typing import Any
+from typing import Any, AsyncIterator, Iterator
 
-from war_room.cache_io import cache_get, cached_call
-from war_room.exa_client import ExaClient
+from war_room.exa_client import AsyncExaClient, ExaClient
 from war_room.models import weather_brief_to_payload
-from war_room.query_plan import CaseIntake, generate_query_plan
+from war_room.query_plan import CaseIntake, QuerySpec
+from war_room.retrieval import (
+    DEFAULT_MAX_CONCURRENCY,
+    ModulePack,
+    PackSnapshot,
+    build_pack,
+    build_pack_async,
+    pack_cache_key,
+    stream_pack,
+    stream_pack_async,
+)
+from war_room.run_plan import RunPlan, module_queries
 from war_room.source_scoring import score_url
 
 GOV_WEATHER_DOMAINS = [
@@ -21,6 +31,29 @@ GOV_WEATHER_DOMAINS = [
 ]
 
 
+def weather_case_key(intake: CaseIntake) -> str:
+    """Plain cache key of the weather brief, as committed in cache_samples/."""
+    return f"weather__{intake.event_name}__{intake.county}_{intake.state}"
+
+
+def weather_pack_key(intake: CaseIntake, queries: list[QuerySpec]) -> str:
+    """Runtime cache key of the weather brief built from `queries`."""
+    return pack_cache_key(weather_case_key(intake), queries)
+
+
+def _module_pack(intake: CaseIntake, plan: RunPlan | None) -> ModulePack:
+    queries = module_queries(intake, "weather", plan)
+    return ModulePack(
+        module="weather",
+        label="weather brief",
+        case_key=weather_case_key(intake),
+        pack_key=weather_pack_key(intake, queries),
+        queries=queries,
+        assemble=lambda results: _assemble_brief(intake, results),
+        empty=lambda reason: _empty_weather_brief(intake, reason),
+    )
+
+
 def build_weather_brief(
     intake: CaseIntake,
     client: ExaClient | None,
@@ -28,48 +61,92 @@ def build_weather_brief(
     use_cache: bool = True,
     cache_dir: str = "cache",
     cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
 ) -> dict[str, Any]:
     """Build a structured weather brief for the case.
 
     Returns dict with: module, event_summary, key_observations, metrics, sources.
     """
-    case_key = f"weather__{intake.event_name}__{intake.county}_{intake.state}"
-
-    # Graceful fallback: no client available. Prefer cache, then return a safe empty payload.
-    if client is None:
-        if use_cache:
-            cached = cache_get(case_key, cache_samples_dir)
-            if cached is None:
-                cached = cache_get(case_key, cache_dir)
-            if cached is not None:
-                return cached
-        return _empty_weather_brief(
-            intake,
-            "No Exa client available and no cached weather brief found.",
-        )
-
-    def _fetch() -> dict[str, Any]:
-        queries = [q for q in generate_query_plan(intake) if q.module == "weather"]
-        all_results: list[dict] = []
-
-        for q in queries:
-            hits = client.search(
-                q.query,
-                k=5,
-                include_domains=q.preferred_domains or None,
-            )
-            for h in hits:
-                h["category"] = q.category
-            all_results.extend(hits)
-
-        return _assemble_brief(intake, all_results)
-
-    return cached_call(
-        case_key,
-        _fetch,
+    return build_pack(
+        _module_pack(intake, plan),
+        client,
+        use_cache=use_cache,
+        cache_dir=cache_dir,
+        cache_samples_dir=cache_samples_dir,
+        plan=plan,
+    )
+
+
+async def build_weather_brief_async(
+    intake: CaseIntake,
+    client: AsyncExaClient | None,
+    *,
+    use_cache: bool = True,
+    cache_dir: str = "cache",
+    cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+) -> dict[str, Any]:
+    """Async variant of build_weather_brief; runs weather queries concurrently."""
+    return await build_pack_async(
+        _module_pack(intake, plan),
+        client,
+        use_cache=use_cache,
+        cache_dir=cache_dir,
         cache_samples_dir=cache_samples_dir,
+        plan=plan,
+        max_concurrency=max_concurrency,
+    )
+
+
+def stream_weather_brief(
+    intake: CaseIntake,
+    client: ExaClient | None,
+    *,
+    use_cache: bool = True,
+    cache_dir: str = "cache",
+    cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
+    snapshot_every: int = 1,
+) -> Iterator[PackSnapshot]:
+    """Streaming variant of build_weather_brief.
+
+    Yields a partial brief after every `snapshot_every` queries, then the
+    final brief, which is cached exactly as build_weather_brief would cache it.
+    Cache hits and fallbacks yield a single final snapshot.
+    """
+    return stream_pack(
+        _module_pack(intake, plan),
+        client,
+        use_cache=use_cache,
         cache_dir=cache_dir,
+        cache_samples_dir=cache_samples_dir,
+        plan=plan,
+        snapshot_every=snapshot_every,
+    )
+
+
+def stream_weather_brief_async(
+    intake: CaseIntake,
+    client: AsyncExaClient | None,
+    *,
+    use_cache: bool = True,
+    cache_dir: str = "cache",
+    cache_samples_dir: str = "cache_samples",
+    plan: RunPlan | None = None,
+    max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+    snapshot_every: int = 1,
+) -> AsyncIterator[PackSnapshot]:
+    """Async variant of stream_weather_brief; snapshots arrive as queries complete."""
+    return stream_pack_async(
+        _module_pack(intake, plan),
+        client,
         use_cache=use_cache,
+        cache_dir=cache_dir,
+        cache_samples_dir=cache_samples_dir,
+        plan=plan,
+        max_concurrency=max_concurrency,
+        snapshot_every=snapshot_every,
     )
 
 
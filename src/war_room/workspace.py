@@ -0,0 +1,148 @@
+"""Event workspace: evidence shared by every claimant of one catastrophe.
+
+Weather evidence depends only on the event, its date, and the county and
+state; carrier evidence on the carrier, event and state (the claims-manual
+search also on the policy type). A workspace computes each once and hands
+it to every claimant run in the same scope:
+
+- weather briefs are built once per weather_scope() and reused whole;
+- carrier packs read the claimant's facts and posture, so each claimant
+  gets its own assembly, but every carrier search runs once per workspace.
+
+Caselaw, coverage-issue queries and citation checks stay claimant-specific
+and are not routed through the workspace.
+
+The runtime cache already shares packs and per-query hits between runs.
+The workspace adds what it cannot: one fetch for claimants running at the
+same time, reuse with the cache off, and a `workspace_reused` counter in
+run metrics. It lives in one process; a batch keeps one per worker.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import threading
+from typing import Any, Callable
+
+from war_room.cache_io import normalize_key, single_flight
+from war_room.carrier_module import build_carrier_doc_pack
+from war_room.metrics import count
+from war_room.query_plan import CaseIntake
+from war_room.run_plan import RunPlan, settle
+from war_room.weather_module import build_weather_brief
+
+
+def weather_scope(intake: CaseIntake) -> tuple[str, ...]:
+    """Everything a weather brief depends on."""
+    return tuple(normalize_key(part) for part in (intake.event_name, intake.event_date, intake.county, intake.state))
+
+
+def carrier_scope(intake: CaseIntake) -> tuple[str, ...]:
+    """The carrier-level scope claimants share carrier searches within."""
+    return tuple(normalize_key(part) for part in (intake.carrier, intake.event_name, intake.state))
+
+
+def _is_complete(pack: dict[str, Any]) -> bool:
+    """False for the fallback payloads modules return when retrieval was unavailable."""
+    return not pack.get("warnings")
+
+
+class _SharedSearchClient:
+    """Client proxy whose searches are answered once per workspace."""
+
+    def __init__(self, workspace: EventWorkspace, client: Any):
+        self._workspace = workspace
+        self._client = client
+
+    def search(self, query: str, **kwargs: Any) -> list[dict[str, Any]]:
+        key = ("carrier_search", query, json.dumps(kwargs, sort_keys=True, default=str))
+        # No hits may be a passing provider hiccup; let the next claimant ask again.
+        return self._workspace._shared(
+            "carrier_search", key, lambda: self._client.search(query, **kwargs), keep=bool
+        )
+
+    def __getattr__(self, name: str) -> Any:
+        # Budget and retry counters, contents fetches: the real client's.
+        return getattr(self._client, name)
+
+
+class EventWorkspace:
+    """Thread-safe store of event- and carrier-level evidence for many claimants.
+
+    Failures are not stored: the next claimant in the scope tries again.
+    That covers exceptions and fallback payloads alike, such as the empty
+    brief a module returns when the provider's circuit is open.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values: dict[tuple[str, ...], Any] = {}
+        self._scopes: dict[str, set[tuple[str, ...]]] = {"weather": set(), "carrier": set()}
+        self._built: dict[str, int] = {}
+        self._reused: dict[str, int] = {}
+
+    def _shared(
+        self,
+        kind: str,
+        key: tuple[str, ...],
+        fn: Callable[[], Any],
+        *,
+        keep: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        with self._lock:
+            if key in self._values:
+                self._reused[kind] = self._reused.get(kind, 0) + 1
+                count("workspace_reused")
+                return copy.deepcopy(self._values[key])
+        # Claimants asking at the same time wait for one fetch.
+        value = single_flight(f"workspace:{id(self)}:{key!r}", fn)
+        if keep is not None and not keep(value):
+            return copy.deepcopy(value)
+        with self._lock:
+            if key in self._values:
+                self._reused[kind] = self._reused.get(kind, 0) + 1
+                count("workspace_reused")
+            else:
+                self._values[key] = value
+                self._built[kind] = self._built.get(kind, 0) + 1
+        return copy.deepcopy(value)
+
+    def weather_brief(
+        self, intake: CaseIntake, client: Any | None, *, plan: RunPlan | None = None, **cache_kwargs: Any
+    ) -> dict[str, Any]:
+        """build_weather_brief, once per weather scope.
+
+        Claimants reusing the brief see its queries as "workspace" in their plan.
+        """
+        scope = weather_scope(intake)
+        with self._lock:
+            self._scopes["weather"].add(scope)
+        brief = self._shared(
+            "weather",
+            ("weather", *scope),
+            lambda: build_weather_brief(intake, client, plan=plan, **cache_kwargs),
+            keep=_is_complete,
+        )
+        if plan is not None:
+            settle(plan, plan.for_module("weather"), "workspace")
+        return brief
+
+    def carrier_pack(
+        self, intake: CaseIntake, client: Any | None, *, plan: RunPlan | None = None, **cache_kwargs: Any
+    ) -> dict[str, Any]:
+        """build_carrier_doc_pack for this claimant, on shared carrier searches."""
+        with self._lock:
+            self._scopes["carrier"].add(carrier_scope(intake))
+        shared = _SharedSearchClient(self, client) if client is not None else None
+        return build_carrier_doc_pack(intake, shared, plan=plan, **cache_kwargs)
+
+    def stats(self) -> dict[str, Any]:
+        """Scopes seen, plus fetches built and reused per kind."""
+        with self._lock:
+            kinds = sorted(set(self._built) | set(self._reused))
+            return {
+                "weather_scopes": len(self._scopes["weather"]),
+                "carrier_scopes": len(self._scopes["carrier"]),
+                **{kind: {"built": self._built.get(kind, 0), "reused": self._reused.get(kind, 0)} for kind in kinds},
+            }
@@ -0,0 +1,147 @@
+"""Tests for batch runs - worker processes, loopback HTTP only."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+
+from war_room.batch import load_batch_items, main, read_results, run_batch
+from war_room.bootstrap import bootstrap_runtime
+from war_room.fake_exa import FakeExaCorpus, FakeExaServer
+from war_room.query_plan import CaseIntake
+
+
+def _bootstrap(tmp_path: Path, *extra: str):
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "\n".join(
+            [
+                "CACHE_DIR=.runtime/cache",
+                "CACHE_SAMPLES_DIR=.runtime/cache_samples",
+                "OUTPUT_DIR=.runtime/output",
+                "RUNS_DIR=.runtime/runs",
+                *extra,
+            ]
+        ),
+        encoding="utf-8",
+    )
+    (tmp_path / "pyproject.toml").write_text("[project]\nname='test'\nversion='0.0.0'\n", encoding="utf-8")
+    return bootstrap_runtime(start_path=tmp_path, env_file=env_file)
+
+
+def _intake(county: str, carrier: str = "Citizens") -> dict:
+    return CaseIntake(
+        event_name="Hurricane Milton", event_date="2024-10-09", state="FL", county=county,
+        carrier=carrier, policy_type="HO-3", posture=["denial"],
+    ).model_dump()
+
+
+def _intake_dir(tmp_path: Path) -> Path:
+    intakes = tmp_path / "intakes"
+    intakes.mkdir()
+    (intakes / "pinellas.json").write_text(json.dumps(_intake("Pinellas")), encoding="utf-8")
+    (intakes / "sarasota.json").write_text(json.dumps(_intake("Sarasota")), encoding="utf-8")
+    (intakes / "broken.json").write_text(json.dumps({"event_name": "Hurricane Milton"}), encoding="utf-8")
+    (intakes / "_template.json").write_text("{}", encoding="utf-8")
+    return intakes
+
+
+def test_load_batch_items_from_directory_and_jsonl(tmp_path: Path) -> None:
+    items = load_batch_items(_intake_dir(tmp_path))
+    assert [item.case_key for item in items] == ["broken", "pinellas", "sarasota"]
+
+    jsonl = tmp_path / "claims.jsonl"
+    jsonl.write_text(
+        json.dumps({"case_key": "Smith Roof", **_intake("Lee")}) + "\n\n{not json\n" + json.dumps(_intake("Lee")) + "\n",
+        encoding="utf-8",
+    )
+    items = load_batch_items(jsonl)
+    assert [item.case_key for item in items] == ["smith_roof", "claims_3", "claims_4"]
+    assert "case_key" not in items[0].payload
+    assert items[1].error.startswith("Invalid JSON")
+
+    jsonl.write_text(json.dumps({"case_key": "a", **_intake("Lee")}) + "\n" + json.dumps({"case_key": "A"}) + "\n")
+    with pytest.raises(ValueError, match="Duplicate"):
+        load_batch_items(jsonl)
+    with pytest.raises(ValueError, match="not found"):
+        load_batch_items(tmp_path / "missing")
+
+
+def test_failures_do_not_abort_and_reruns_resume(tmp_path: Path) -> None:
+    settings = _bootstrap(tmp_path).settings
+    items = load_batch_items(_intake_dir(tmp_path))
+    batch_dir = settings.runs_dir / "batch_intakes"
+
+    summary = run_batch(items, settings=settings, batch_dir=batch_dir, workers=2, offline=True)
+    assert (summary["total"], summary["ok"], summary["failed"], summary["ran"]) == (3, 2, 1, 3)
+    rows = {row["case_key"]: row for row in summary["intakes"]}
+    assert rows["broken"]["status"] == "invalid"
+    assert "Missing required field" in rows["broken"]["error"]
+    assert Path(rows["pinellas"]["memo_path"]).exists()
+    assert json.loads(Path(rows["pinellas"]["record_path"]).read_text())["case_key"] == "pinellas"
+    assert json.loads((batch_dir / "summary.json").read_text())["ok"] == 2
+
+    # Only the failed intake runs again; fixing it completes the batch.
+    (tmp_path / "intakes" / "broken.json").write_text(json.dumps(_intake("Lee")), encoding="utf-8")
+    summary = run_batch(items, settings=settings, batch_dir=batch_dir, workers=2, offline=True)
+    assert (summary["ok"], summary["ran"], summary["skipped"]) == (3, 1, 2)
+    assert len((batch_dir / "results.jsonl").read_text().splitlines()) == 4
+
+    summary = run_batch(items, settings=settings, batch_dir=batch_dir, offline=True, restart=True)
+    assert summary["ran"] == 3
+    assert len(read_results(batch_dir / "results.jsonl")) == 3
+
+
+def test_workers_share_one_budget_and_the_cache(tmp_path: Path, monkeypatch, capsys) -> None:
+    context = _bootstrap(tmp_path, "EXA_API_KEY=test-key", "ALLOW_LIVE_RETRIEVAL=true")
+    jsonl = tmp_path / "milton.jsonl"
+    jsonl.write_text("".join(json.dumps(_intake(county)) + "\n" for county in ("Pinellas", "Sarasota", "Lee")))
+    docs = [{"id": f"https://www.noaa.gov/{i}", "url": f"https://www.noaa.gov/{i}", "title": "NOAA", "text": "Gusts 120 mph"}
+            for i in range(3)]
+
+    with FakeExaServer(FakeExaCorpus(docs=docs)) as server:
+        monkeypatch.setenv("EXA_BASE_URL", server.base_url)
+        summary_path = context.settings.runs_dir / "batch_milton" / "summary.json"
+        with patch("war_room.bootstrap.bootstrap_runtime", return_value=context):
+            # Too small a budget fails every intake, but only after spending it all.
+            assert main([str(jsonl), "--workers", "3", "--budget", "10", "--max-search-calls", "50"]) == 1
+            summary = json.loads(summary_path.read_text())
+            assert summary["failed"] == 3
+            assert all("BudgetExhausted" in row["error"] for row in summary["intakes"])
+            assert summary["budget"] == {"limit": 10, "spent": 10, "remaining": 0}
+            assert server.stats()["search"] == 10
+
+            # Resuming with a larger budget finishes the batch; cached searches are not repeated.
+            assert main([str(jsonl), "--workers", "3", "--budget", "200", "--max-search-calls", "50"]) == 0
+            summary = json.loads(summary_path.read_text())
+        assert summary["ok"] == 3
+        assert summary["budget"]["spent"] == server.stats()["search"]
+        assert summary["spend"]["exa_searches"] == server.stats()["search"] - 10
+        assert "3/3 ok" in capsys.readouterr().out
+
+
+def test_portfolio_batch_prefetches_shared_queries_once(tmp_path: Path, monkeypatch, capsys) -> None:
+    context = _bootstrap(tmp_path, "EXA_API_KEY=test-key", "ALLOW_LIVE_RETRIEVAL=true")
+    jsonl = tmp_path / "book.jsonl"
+    jsonl.write_text("".join(json.dumps(_intake(county)) + "\n" for county in ("Pinellas", "Pinellas", "Lee")))
+    docs = [{"id": "https://www.noaa.gov/1", "url": "https://www.noaa.gov/1", "title": "NOAA", "text": "Gusts 120 mph"}]
+
+    with patch("war_room.bootstrap.bootstrap_runtime", return_value=context):
+        assert main([str(jsonl), "--plan-only"]) == 0
+        report = json.loads(capsys.readouterr().out)
+        assert report["intakes"] == 3
+        assert report["dedup_ratio"] > 2
+
+        with FakeExaServer(FakeExaCorpus(docs=docs)) as server:
+            monkeypatch.setenv("EXA_BASE_URL", server.base_url)
+            assert main([str(jsonl), "--workers", "2", "--portfolio"]) == 0
+            searches = server.stats()["search"]
+
+    summary = json.loads((context.settings.runs_dir / "batch_book" / "summary.json").read_text())
+    portfolio = summary["portfolio"]
+    assert portfolio["unique_queries"] == report["unique_queries"]
+    assert portfolio["executed"] == portfolio["exa_searches"] == report["unique_queries"]
+    # Workers found every planned query in the cache; only follow-ups (citation checks) went out.
+    assert summary["spend"]["exa_searches"] == searches - portfolio["exa_searches"]
+    assert "dedup" in capsys.readouterr().out
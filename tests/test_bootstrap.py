@@ -35,3 +35,14 @@ def test_bootstrap_runtime_creates_runtime_directories(tmp_path: Path):
     assert context.settings.cache_samples_dir.exists()
     assert context.settings.output_dir.exists()
     assert context.settings.runs_dir.exists()
+
+
+def test_bootstrap_runtime_leaves_sqlite_cache_path_as_a_file(tmp_path: Path):
+    env_file = tmp_path / ".env"
+    env_file.write_text("CACHE_DIR=.runtime/cache/war_room.sqlite\n", encoding="utf-8")
+    (tmp_path / "pyproject.toml").write_text("[project]\nname='test'\nversion='0.0.0'\n", encoding="utf-8")
+
+    context = bootstrap_runtime(start_path=tmp_path, env_file=env_file)
+
+    assert context.settings.cache_dir.parent.is_dir()
+    assert not context.settings.cache_dir.exists()
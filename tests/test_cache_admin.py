@@ -0,0 +1,83 @@
+"""Tests for the cache maintenance CLI."""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from war_room.bootstrap import bootstrap_runtime
+from war_room.cache_admin import cache_stats, gc_cache, list_entries, main
+from war_room.cache_io import cache_get, cache_set, clear_memory_cache
+
+
+def _set(cache_dir, key: str, size: int, *, fetched_ago: float = 0, read_ago: float = 0) -> Path:
+    path = cache_set(key, {"text": "x" * size}, cache_dir)
+    now = time.time()
+    os.utime(path, (now - read_ago, now - fetched_ago))
+    return path
+
+
+def test_stats_and_ls_group_by_module(tmp_path: Path) -> None:
+    _set(tmp_path, "weather__Milton__Pinellas_FL", 100, read_ago=50)
+    _set(tmp_path, "carrier__Citizens__Milton__FL", 200, read_ago=10)
+    _set(tmp_path, "query__nws milton__abc", 300, read_ago=30)
+
+    stats = cache_stats(tmp_path)
+    assert stats["entries"] == 3
+    assert set(stats["modules"]) == {"weather", "carrier", "query"}
+    assert stats["modules"]["carrier"]["bytes"] > stats["modules"]["weather"]["bytes"]
+    assert [entry.module for entry in list_entries(tmp_path)] == ["carrier", "query", "weather"]
+    assert [entry.module for entry in list_entries(tmp_path, module="weather")] == ["weather"]
+
+
+def test_gc_evicts_expired_then_least_recently_read(tmp_path: Path) -> None:
+    old = _set(tmp_path, "weather__old", 100, fetched_ago=40 * 86400)
+    cold = _set(tmp_path, "caselaw__cold", 1000, read_ago=3600)
+    warm = _set(tmp_path, "caselaw__warm", 1000, read_ago=60)
+    hot = _set(tmp_path, "citecheck__hot", 1000)
+
+    report = gc_cache(tmp_path, max_bytes=warm.stat().st_size * 2 + 10, max_age=30 * 86400)
+
+    assert report["evicted"] == 2
+    assert not old.exists() and not cold.exists()
+    assert warm.exists() and hot.exists()
+    clear_memory_cache()
+    assert cache_get("caselaw__cold", tmp_path) is None
+
+
+def test_gc_dry_run_and_sqlite(tmp_path: Path) -> None:
+    db_path = tmp_path / "cache.sqlite"
+    for i in range(5):
+        cache_set(f"query__{i}", {"text": "x" * 500}, db_path)
+
+    assert gc_cache(db_path, max_bytes=1200, dry_run=True)["evicted"] == 3
+    assert cache_stats(db_path)["entries"] == 5
+    report = gc_cache(db_path, max_bytes=1200)
+    assert report["evicted"] == 3 and cache_stats(db_path)["entries"] == 2
+
+
+def test_gc_never_touches_cache_samples(tmp_path: Path) -> None:
+    samples = tmp_path / "cache_samples"
+    _set(samples, "weather__fixture", 100, fetched_ago=400 * 86400)
+
+    with pytest.raises(ValueError, match="samples"):
+        gc_cache(samples, max_bytes=1, max_age=1, cache_samples_dir=samples)
+    assert cache_stats(samples)["entries"] == 1
+
+    committed = bootstrap_runtime(ensure_dirs=False).settings.cache_samples_dir
+    assert main(["gc", "--cache-dir", str(committed), "--max-mb", "0.001"]) == 2
+
+
+def test_migrate_command_compresses_cache_dir(tmp_path: Path, capsys) -> None:
+    path = cache_set("k", {"text": "storm surge " * 500}, tmp_path)
+    size = path.stat().st_size
+
+    assert main(["migrate", "--cache-dir", str(tmp_path), "--compact", "--compression", "gzip"]) == 0
+
+    report = json.loads(capsys.readouterr().out)
+    assert report["rewritten"] == 1
+    assert path.stat().st_size < size
+    clear_memory_cache()
+    assert cache_get("k", tmp_path) == {"text": "storm surge " * 500}
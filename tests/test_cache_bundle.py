@@ -0,0 +1,167 @@
+"""Tests for cache bundle export/import - local files only."""
+
+import io
+import json
+import os
+import tarfile
+import time
+from pathlib import Path
+
+import pytest
+
+from war_room import retrieval
+from war_room.bootstrap import bootstrap_runtime
+from war_room.cache_admin import main
+from war_room.cache_bundle import (
+    export_bundle,
+    import_bundle,
+    intake_cache_keys,
+    read_bundle_manifest,
+    select_entries,
+)
+from war_room.cache_io import cache_get, cache_get_entry, cache_set, clear_memory_cache
+from war_room.carrier_module import build_carrier_doc_pack, carrier_pack_key
+from war_room.caselaw_module import CASELAW_EXCLUDE_DOMAINS, build_caselaw_pack, caselaw_pack_key
+from war_room.query_plan import CaseIntake, generate_query_plan
+from war_room.retrieval import query_cache_key
+from war_room.weather_module import build_weather_brief, weather_pack_key
+
+
+def _seed(cache_dir) -> None:
+    cache_set("weather__Hurricane Milton__Pinellas_FL", {"v": "milton"}, cache_dir)
+    cache_set("carrier__Citizens__Hurricane Milton__FL", {"v": "citizens"}, cache_dir)
+    cache_set("weather__Hurricane Ian__Lee_FL", {"v": "ian"}, cache_dir)
+
+
+def test_export_selected_entries_and_import_keeps_fetched_at(tmp_path: Path) -> None:
+    source, target = tmp_path / "source", tmp_path / "target"
+    _seed(source)
+    old = time.time() - 3 * 86400
+    path = cache_set("weather__Hurricane Milton__old", {"v": "old"}, source)
+    os.utime(path, (old, old))
+
+    entries = select_entries(source, event="Hurricane Milton", max_age=86400)
+    assert sorted(entry.module for entry in entries) == ["carrier", "weather"]
+    assert [e.module for e in select_entries(source, modules=["weather"], event="milton", max_age=86400)] == ["weather"]
+
+    manifest = export_bundle(source, tmp_path / "milton.tgz", entries, selection={"event": "Hurricane Milton"})
+    assert read_bundle_manifest(tmp_path / "milton.tgz") == manifest
+    assert all(len(record["sha256"]) == 64 for record in manifest["entries"])
+
+    assert import_bundle(tmp_path / "milton.tgz", target) == {"imported": 2, "kept_newer": 0, "corrupt": 0}
+    key = "weather__Hurricane Milton__Pinellas_FL"
+    assert cache_get(key, target) == {"v": "milton"}
+    assert cache_get_entry(key, target).fetched_at == cache_get_entry(key, source).fetched_at
+    assert cache_get("weather__Hurricane Ian__Lee_FL", target) is None
+
+    # Merging again keeps the target's copies; overwrite replaces them.
+    cache_set(key, {"v": "newer"}, target)
+    assert import_bundle(tmp_path / "milton.tgz", target)["kept_newer"] == 2
+    assert cache_get(key, target) == {"v": "newer"}
+    assert import_bundle(tmp_path / "milton.tgz", target, overwrite=True)["imported"] == 2
+    assert cache_get(key, target) == {"v": "milton"}
+
+
+def test_damaged_entries_are_skipped_and_layouts_checked(tmp_path: Path) -> None:
+    _seed(tmp_path / "source")
+    bundle = tmp_path / "all.tgz"
+    manifest = export_bundle(tmp_path / "source", bundle, select_entries(tmp_path / "source"))
+
+    # Rebuild the bundle with one entry's bytes altered.
+    tampered = tmp_path / "tampered.tgz"
+    with tarfile.open(bundle, "r:gz") as src, tarfile.open(tampered, "w:gz") as dst:
+        for member in src.getmembers():
+            data = src.extractfile(member).read()
+            if member.name == "entries/" + manifest["entries"][0]["name"]:
+                data += b" "
+            member.size = len(data)
+            dst.addfile(member, io.BytesIO(data))
+
+    counts = import_bundle(tampered, tmp_path / "target")
+    assert counts == {"imported": 2, "kept_newer": 0, "corrupt": 1}
+
+    with pytest.raises(ValueError, match="json entries"):
+        import_bundle(bundle, tmp_path / "cache.sqlite")
+    (tmp_path / "junk.tgz").write_bytes(b"not a bundle")
+    with pytest.raises(ValueError):
+        import_bundle(tmp_path / "junk.tgz", tmp_path / "target")
+
+
+def test_sqlite_bundle_roundtrip(tmp_path: Path) -> None:
+    _seed(tmp_path / "source.sqlite")
+    export_bundle(tmp_path / "source.sqlite", tmp_path / "db.tgz", select_entries(tmp_path / "source.sqlite"))
+    assert import_bundle(tmp_path / "db.tgz", tmp_path / "target.sqlite")["imported"] == 3
+    clear_memory_cache()
+    assert cache_get("weather__Hurricane Ian__Lee_FL", tmp_path / "target.sqlite") == {"v": "ian"}
+
+
+class _FakeClient:
+    def search(self, query, **kwargs):
+        return [{"url": f"https://weather.gov/{query.replace(' ', '_')}", "title": query}]
+
+
+def _milton() -> CaseIntake:
+    return CaseIntake(
+        event_name="Hurricane Milton", event_date="2024-10-09", state="FL", county="Pinellas",
+        carrier="Citizens", policy_type="HO-3", posture=["denial"],
+    )
+
+
+def test_intake_keys_cover_every_module() -> None:
+    intake = _milton()
+    plan = generate_query_plan(intake)
+    keys = set(intake_cache_keys(intake))
+
+    for module, pack_key_of in (
+        ("weather", weather_pack_key), ("carrier_docs", carrier_pack_key), ("caselaw", caselaw_pack_key),
+    ):
+        queries = [query for query in plan if query.module == module]
+        exclude = CASELAW_EXCLUDE_DOMAINS if module == "caselaw" else None
+        assert queries
+        assert pack_key_of(intake, queries) in keys
+        assert {query_cache_key(query, exclude_domains=exclude) for query in queries} <= keys
+
+
+def test_cli_exports_an_intake_and_warms_an_offline_cache(tmp_path: Path, capsys) -> None:
+    intake = _milton()
+    intake_path = tmp_path / "intake.json"
+    intake_path.write_text(intake.model_dump_json(), encoding="utf-8")
+    source, laptop = tmp_path / "source", tmp_path / "laptop"
+    samples = tmp_path / "no_samples"
+    brief = build_weather_brief(intake, _FakeClient(), cache_dir=str(source), cache_samples_dir=str(samples))
+    carrier = build_carrier_doc_pack(intake, _FakeClient(), cache_dir=str(source), cache_samples_dir=str(samples))
+    caselaw = build_caselaw_pack(intake, _FakeClient(), cache_dir=str(source), cache_samples_dir=str(samples))
+    cache_set("weather__Hurricane Ian__Lee_FL", {"v": "ian"}, source)
+
+    bundle = tmp_path / "intake.tgz"
+    assert main(["export", str(bundle), "--cache-dir", str(source), "--intake", str(intake_path)]) == 0
+    exported = json.loads(capsys.readouterr().out)
+    # Each module's pack plus its per-query hits; nothing from other events.
+    assert exported["entries"] > 1
+    assert all("ian" not in record["name"] for record in read_bundle_manifest(bundle)["entries"])
+
+    assert main(["import", str(bundle), "--cache-dir", str(laptop)]) == 0
+    assert json.loads(capsys.readouterr().out)["imported"] == exported["entries"]
+    clear_memory_cache()
+    offline = {"cache_dir": str(laptop), "cache_samples_dir": str(samples)}
+    assert build_weather_brief(intake, None, **offline) == brief
+    assert build_carrier_doc_pack(intake, None, **offline) == carrier
+    assert build_caselaw_pack(intake, None, **offline) == caselaw
+
+    assert main(["import", str(tmp_path / "missing.tgz"), "--cache-dir", str(laptop)]) == 2
+
+
+def test_cli_export_uses_the_configured_schema_version(tmp_path: Path, capsys, monkeypatch) -> None:
+    intake = _milton()
+    intake_path = tmp_path / "intake.json"
+    intake_path.write_text(intake.model_dump_json(), encoding="utf-8")
+    bootstrap_runtime(ensure_dirs=False)
+    build_weather_brief(intake, _FakeClient(), cache_dir=str(tmp_path / "source"), cache_samples_dir=str(tmp_path / "s"))
+    args = ["--cache-dir", str(tmp_path / "source"), "--intake", str(intake_path)]
+
+    assert main(["export", str(tmp_path / "a.tgz"), *args]) == 0
+    expected = json.loads(capsys.readouterr().out)["entries"]
+    # Left over from another caller; --cache-dir must not skip loading settings.
+    monkeypatch.setattr(retrieval, "_schema_version", "stale")
+    assert main(["export", str(tmp_path / "b.tgz"), *args]) == 0
+    assert json.loads(capsys.readouterr().out)["entries"] == expected
@@ -1,9 +1,49 @@
 """Tests for cache_io module."""
 
+import asyncio
+import os
+import sqlite3
 import tempfile
+import threading
+import time
 from pathlib import Path
+from unittest.mock import patch
 
-from war_room.cache_io import normalize_key, cache_get, cache_set, cached_call
+import pytest
+
+from war_room.cache_io import (
+    COMPACT_ENCODING,
+    LEGACY_ENCODING,
+    MANIFEST_NAME,
+    NEGATIVE_TTLS,
+    CacheEncoding,
+    CachedFailure,
+    JsonFileBackend,
+    MemoryLRU,
+    NegativeResult,
+    SQLiteCacheBackend,
+    _cache_path,
+    _entry_name,
+    _file_lock,
+    _shard_path,
+    cache_get,
+    cache_get_entry,
+    cache_set,
+    cached_call,
+    cached_call_async,
+    clear_memory_cache,
+    configure_cache_writes,
+    configure_memory_cache,
+    decode_payload,
+    encode_payload,
+    get_backend,
+    memory_cache_stats,
+    migrate_cache,
+    normalize_key,
+    refresh_stats,
+    single_flight,
+    wait_for_refreshes,
+)
 
 
 def test_normalize_key_basic():
@@ -82,3 +122,598 @@ def test_cached_call_prefers_samples():
             cache_dir=cache_dir,
         )
         assert result["source"] == "samples"
+
+
+def test_cached_call_coalesces_concurrent_misses(tmp_path: Path):
+    tmpdir = str(tmp_path)
+    call_count = 0
+    release = threading.Event()
+
+    def slow_fn():
+        nonlocal call_count
+        call_count += 1
+        release.wait(timeout=5)
+        return {"value": "live"}
+
+    results = []
+
+    def worker():
+        results.append(cached_call("shared", slow_fn, cache_dir=tmpdir, cache_samples_dir=tmpdir))
+
+    threads = [threading.Thread(target=worker) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert call_count == 1
+    assert results == [{"value": "live"}] * 6
+    # Followers get their own copy, so mutating one result is isolated.
+    results[0]["value"] = "mutated"
+    assert results[1]["value"] == "live"
+
+
+def test_single_flight_propagates_errors_to_waiters():
+    release = threading.Event()
+    errors = []
+
+    def failing_fn():
+        release.wait(timeout=5)
+        raise RuntimeError("provider down")
+
+    def worker():
+        try:
+            single_flight("failing", failing_fn)
+        except RuntimeError as exc:
+            errors.append(str(exc))
+
+    threads = [threading.Thread(target=worker) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert errors == ["provider down"] * 3
+
+
+def test_cached_call_cross_process_waits_for_lock_holder(tmp_path: Path):
+    tmpdir = str(tmp_path)
+    # Simulate another process mid-fetch holding the lock file.
+    lock_path = _cache_path(tmpdir, "locked_key").with_suffix(".lock")
+    lock_path.write_text("12345", encoding="utf-8")
+    results = []
+
+    def worker():
+        results.append(cached_call(
+            "locked_key",
+            lambda: {"source": "live"},
+            cache_dir=tmpdir,
+            cache_samples_dir=tmpdir,
+            cross_process=True,
+        ))
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    time.sleep(0.1)
+    cache_set("locked_key", {"source": "other_process"}, tmpdir)
+    lock_path.unlink()
+    thread.join(timeout=5)
+
+    assert results == [{"source": "other_process"}]
+    assert not lock_path.exists()
+
+
+def test_file_lock_breaks_stale_lock(tmp_path: Path):
+    lock_path = tmp_path / "entry.lock"
+    lock_path.write_text("999", encoding="utf-8")
+    old = time.time() - 3600
+    os.utime(lock_path, (old, old))
+
+    with _file_lock(lock_path, timeout=1, stale_after=60) as acquired:
+        assert acquired
+    assert not lock_path.exists()
+
+
+def test_cached_call_async_coalesces_concurrent_misses(tmp_path: Path):
+    tmpdir = str(tmp_path)
+    call_count = 0
+
+    async def slow_fn():
+        nonlocal call_count
+        call_count += 1
+        await asyncio.sleep(0.01)
+        return {"value": 7}
+
+    async def run():
+        return await asyncio.gather(*(
+            cached_call_async("async_key", slow_fn, cache_dir=tmpdir, cache_samples_dir=tmpdir)
+            for _ in range(5)
+        ))
+
+    results = asyncio.run(run())
+    assert call_count == 1
+    assert results == [{"value": 7}] * 5
+
+
+def test_sqlite_backend_roundtrip_and_metadata(tmp_path: Path):
+    db_path = tmp_path / "cache.sqlite"
+    cache_set("Milton Key", {"hits": [1, 2]}, db_path)
+
+    assert cache_get("Milton Key", db_path) == {"hits": [1, 2]}
+    assert cache_get("milton key", db_path) is None
+    assert not list(tmp_path.glob("*.json"))
+
+    conn = sqlite3.connect(db_path)
+    try:
+        journal_mode = conn.execute("PRAGMA journal_mode").fetchone()[0]
+        row = conn.execute(
+            "SELECT key, created_at, accessed_at FROM cache_entries"
+        ).fetchone()
+    finally:
+        conn.close()
+    assert journal_mode == "wal"
+    assert row[0] == "Milton Key" and row[1] <= row[2]
+
+
+def test_cached_call_with_sqlite_cache_and_json_samples(tmp_path: Path):
+    samples_dir = tmp_path / "samples"
+    db_path = tmp_path / "runtime.db"
+    cache_set("fixture", {"from": "samples"}, samples_dir)
+    calls = 0
+
+    def fetch():
+        nonlocal calls
+        calls += 1
+        return {"from": "live"}
+
+    assert cached_call("fixture", fetch, cache_samples_dir=samples_dir, cache_dir=db_path) == {"from": "samples"}
+    assert cached_call("live_key", fetch, cache_samples_dir=samples_dir, cache_dir=db_path) == {"from": "live"}
+    assert cached_call("live_key", fetch, cache_samples_dir=samples_dir, cache_dir=db_path) == {"from": "live"}
+    assert calls == 1
+    assert isinstance(get_backend(db_path), SQLiteCacheBackend)
+    assert isinstance(get_backend(samples_dir), JsonFileBackend)
+
+
+def test_sqlite_backend_is_safe_across_threads(tmp_path: Path):
+    backend = SQLiteCacheBackend(tmp_path / "cache.sqlite3", schema_version="v-test")
+
+    def worker(n: int) -> None:
+        for i in range(20):
+            backend.set(f"k{n}_{i}", {"n": n, "i": i})
+            assert backend.get(f"k{n}_{i}") == {"n": n, "i": i}
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    # A backend instance works anywhere a cache directory does.
+    assert cache_get("k5_19", backend) == {"n": 5, "i": 19}
+
+
+def test_memory_cache_serves_hot_reads_without_disk(tmp_path: Path):
+    clear_memory_cache()
+    path = cache_set("hot", {"v": 1}, tmp_path)
+
+    assert cache_get("hot", tmp_path) == {"v": 1}
+    path.unlink()
+    # Second read is a memory hit: the file is gone but the value is served.
+    assert cache_get("hot", tmp_path) == {"v": 1}
+    # Same entry through a different spelling of the directory.
+    assert cache_get("hot", tmp_path / "sub" / "..") == {"v": 1}
+
+    stats = memory_cache_stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1 and stats["entries"] == 1
+
+
+def test_memory_cache_invalidated_on_set(tmp_path: Path):
+    clear_memory_cache()
+    cache_set("k", {"v": 1}, tmp_path)
+    assert cache_get("k", tmp_path) == {"v": 1}
+
+    cache_set("k", {"v": 2}, tmp_path)
+    assert cache_get("k", tmp_path) == {"v": 2}
+
+
+def test_memory_cache_hands_out_copies(tmp_path: Path):
+    clear_memory_cache()
+    cache_set("k", {"v": [1]}, tmp_path)
+    cache_get("k", tmp_path)["v"].append(2)
+    cache_get_entry("k", tmp_path).value["v"].append(3)
+
+    assert cache_get("k", tmp_path) == {"v": [1]}
+    assert memory_cache_stats()["hits"] == 2
+
+
+def test_memory_lru_bounds_entries_and_bytes():
+    lru = MemoryLRU(max_entries=2, max_bytes=100)
+    lru.put("a", 1, 10)
+    lru.put("b", 2, 10)
+    assert lru.get("a") == (True, 1)  # a is now most recent
+    lru.put("c", 3, 10)
+    assert lru.get("b") == (False, None)
+
+    lru.put("big", 4, 95)
+    assert lru.stats()["entries"] == 1 and lru.stats()["bytes"] == 95
+    lru.put("too_big", 5, 101)
+    assert lru.get("too_big") == (False, None)
+    assert lru.stats()["evictions"] == 3
+
+
+def test_memory_cache_can_be_disabled(tmp_path: Path):
+    configure_memory_cache(max_entries=0)
+    try:
+        path = cache_set("cold", {"v": 1}, tmp_path)
+        assert cache_get("cold", tmp_path) == {"v": 1}
+        path.unlink()
+        assert cache_get("cold", tmp_path) is None
+    finally:
+        configure_memory_cache()
+
+
+def _age(path: Path, seconds: float) -> None:
+    old = time.time() - seconds
+    os.utime(path, (old, old))
+    clear_memory_cache()
+
+
+def test_cache_entry_records_fetched_at(tmp_path: Path):
+    before = time.time()
+    cache_set("k", {"v": 1}, tmp_path)
+    entry = cache_get_entry("k", tmp_path)
+
+    assert entry.value == {"v": 1}
+    assert entry.fetched_at >= before - 1
+    assert entry.is_fresh(60) and entry.is_fresh(None)
+
+
+def test_stale_entry_served_then_refreshed_in_background(tmp_path: Path):
+    _age(cache_set("k", {"v": "old"}, tmp_path), 120)
+    started = refresh_stats()["completed"]
+    refreshed = threading.Event()
+
+    def fetch():
+        refreshed.wait(5)
+        return {"v": "new"}
+
+    # Served immediately even though fetch() is still blocked.
+    assert cached_call("k", fetch, cache_dir=tmp_path, cache_samples_dir=tmp_path / "s", ttl=60) == {"v": "old"}
+    refreshed.set()
+    assert wait_for_refreshes(timeout=5)
+
+    assert cache_get("k", tmp_path) == {"v": "new"}
+    assert cache_get_entry("k", tmp_path).is_fresh(60)
+    assert refresh_stats()["completed"] == started + 1
+
+
+def test_entry_past_max_stale_is_refetched_inline(tmp_path: Path):
+    _age(cache_set("k", {"v": "old"}, tmp_path), 120)
+
+    result = cached_call(
+        "k", lambda: {"v": "new"}, cache_dir=tmp_path, cache_samples_dir=tmp_path / "s", ttl=60, max_stale=30,
+    )
+    assert result == {"v": "new"}
+    assert refresh_stats()["pending"] == 0
+
+
+def test_samples_never_expire(tmp_path: Path):
+    samples = tmp_path / "samples"
+    _age(cache_set("k", {"from": "samples"}, samples), 10 * 365 * 24 * 3600)
+
+    def fetch():
+        raise AssertionError("samples must not be refetched")
+
+    assert cached_call("k", fetch, cache_dir=tmp_path / "rt", cache_samples_dir=samples, ttl=1) == {"from": "samples"}
+
+
+def test_cached_call_async_serves_stale_and_refreshes(tmp_path: Path):
+    _age(cache_set("k", {"v": "old"}, tmp_path), 120)
+
+    async def fetch():
+        await asyncio.sleep(0.01)
+        return {"v": "new"}
+
+    async def run():
+        first = await cached_call_async("k", fetch, cache_dir=tmp_path, cache_samples_dir=tmp_path / "s", ttl=60)
+        await asyncio.sleep(0.05)
+        second = await cached_call_async("k", fetch, cache_dir=tmp_path, cache_samples_dir=tmp_path / "s", ttl=60)
+        return first, second
+
+    assert asyncio.run(run()) == ({"v": "old"}, {"v": "new"})
+
+
+def test_cache_set_is_atomic_and_leaves_no_temp_files(tmp_path: Path):
+    cache_set("k", {"v": 1}, tmp_path)
+
+    with patch("war_room.cache_io.os.replace", side_effect=OSError("disk full")):
+        try:
+            cache_set("k", {"v": 2}, tmp_path)
+        except OSError:
+            pass
+
+    clear_memory_cache()
+    # The failed write never touched the live entry.
+    assert cache_get("k", tmp_path) == {"v": 1}
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_cache_set_fsync_option(tmp_path: Path):
+    configure_cache_writes(fsync=True)
+    try:
+        with patch("war_room.cache_io.os.fsync", wraps=os.fsync) as fsync:
+            cache_set("k", {"v": 1}, tmp_path)
+    finally:
+        configure_cache_writes()
+    # The file, then the directory entry.
+    assert fsync.call_count == 2
+    assert cache_get("k", tmp_path) == {"v": 1}
+
+
+def test_concurrent_writers_never_expose_partial_json(tmp_path: Path):
+    stop = threading.Event()
+    bad_reads = []
+    payloads = [{"writer": n, "blob": "x" * 50_000} for n in range(4)]
+
+    def writer(payload):
+        for _ in range(25):
+            cache_set("shared", payload, tmp_path)
+
+    def reader():
+        backend = JsonFileBackend(tmp_path)
+        while not stop.is_set():
+            if backend.get("shared") not in (None, *payloads):
+                bad_reads.append(True)
+        bad_reads.extend([True] * backend.quarantined)
+
+    readers = [threading.Thread(target=reader) for _ in range(2)]
+    writers = [threading.Thread(target=writer, args=(p,)) for p in payloads]
+    for thread in readers + writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    stop.set()
+    for thread in readers:
+        thread.join()
+
+    assert not bad_reads
+    assert not list(tmp_path.glob("*.wlock"))
+
+
+def test_corrupt_json_entry_is_a_miss_and_quarantined(tmp_path: Path):
+    path = cache_set("k", {"v": 1}, tmp_path)
+    path.write_text('{"v": 1, "trunc', encoding="utf-8")
+    clear_memory_cache()
+
+    assert cache_get("k", tmp_path) is None
+    assert not path.exists()
+    quarantined = list((tmp_path / "_quarantine").iterdir())
+    assert len(quarantined) == 1 and quarantined[0].name.startswith(path.name)
+
+    # The next live call repopulates the entry.
+    assert cached_call("k", lambda: {"v": 2}, cache_dir=tmp_path, cache_samples_dir=tmp_path / "s") == {"v": 2}
+
+
+def test_corrupt_sqlite_row_is_a_miss_and_quarantined(tmp_path: Path):
+    db_path = tmp_path / "cache.sqlite"
+    backend = SQLiteCacheBackend(db_path)
+    backend.set("k", {"v": 1})
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("UPDATE cache_entries SET payload = ? WHERE key = 'k'", (b"{not json",))
+    rows = conn.execute("SELECT key, payload FROM cache_quarantine").fetchall()
+    assert rows == []
+
+    assert backend.get("k") is None
+    assert backend.quarantined == 1
+    assert conn.execute("SELECT key, payload FROM cache_quarantine").fetchall() == [("k", b"{not json")]
+    conn.close()
+
+
+_HIT = {"title": "NWS Milton", "text": "gusts 120 mph " * 200, "snippet": "gusts 120 mph " * 30, "score": None}
+
+
+def test_encodings_roundtrip_and_compact_is_smaller():
+    legacy = encode_payload(_HIT)
+    for encoding in (
+        CacheEncoding(compact=True),
+        CacheEncoding(compact=True, fast_json=True),
+        CacheEncoding(compression="gzip"),
+        COMPACT_ENCODING,
+    ):
+        data = encode_payload(_HIT, encoding)
+        assert decode_payload(data) == _HIT
+        assert len(data) < len(legacy)
+    assert len(encode_payload(_HIT, COMPACT_ENCODING)) < len(legacy) // 10
+
+
+def test_cache_reads_mixed_encodings(tmp_path: Path):
+    cache_set("old", _HIT, tmp_path)
+    configure_cache_writes(encoding=COMPACT_ENCODING)
+    try:
+        path = cache_set("new", _HIT, tmp_path)
+    finally:
+        configure_cache_writes()
+    clear_memory_cache()
+
+    assert path.read_bytes()[:2] == b"\x1f\x8b"
+    assert cache_get("old", tmp_path) == cache_get("new", tmp_path) == _HIT
+
+
+def test_damaged_compressed_entry_is_quarantined(tmp_path: Path):
+    path = JsonFileBackend(tmp_path, encoding=COMPACT_ENCODING).set("k", _HIT)
+    path.write_bytes(path.read_bytes()[:20])
+    clear_memory_cache()
+
+    assert cache_get("k", tmp_path) is None
+    assert len(list((tmp_path / "_quarantine").iterdir())) == 1
+
+
+def test_migrate_cache_rewrites_in_place_and_keeps_fetched_at(tmp_path: Path):
+    path = cache_set("k", _HIT, tmp_path)
+    _age(path, 3600)
+    before = path.stat()
+    (tmp_path / "broken_0123456789abcdef.json").write_text("{", encoding="utf-8")
+
+    counts = migrate_cache(tmp_path, COMPACT_ENCODING)
+
+    assert counts == {"rewritten": 1, "unchanged": 0, "unreadable": 1}
+    assert path.stat().st_size < before.st_size
+    assert path.stat().st_mtime == before.st_mtime
+    assert cache_get("k", tmp_path) == _HIT
+    assert migrate_cache(tmp_path, COMPACT_ENCODING)["unchanged"] == 1
+
+
+def test_migrate_sqlite_cache(tmp_path: Path):
+    db_path = tmp_path / "cache.sqlite"
+    cache_set("k", _HIT, db_path)
+
+    assert migrate_cache(db_path, COMPACT_ENCODING)["rewritten"] == 1
+    clear_memory_cache()
+    assert cache_get("k", db_path) == _HIT
+
+
+def test_entries_are_sharded_and_legacy_flat_entries_still_read(tmp_path: Path):
+    flat = _cache_path(tmp_path, "old")
+    flat.write_text('{"v": 1}', encoding="utf-8")
+    path = cache_set("k", _HIT, tmp_path)
+    assert path.parent.parent == tmp_path
+    assert path.parent.name == _entry_name("k")[-21:-19]
+
+    clear_memory_cache()
+    fresh = JsonFileBackend(tmp_path)
+    assert fresh.get("old") == {"v": 1}
+
+    # Rewriting a legacy entry moves it into its shard.
+    fresh.set("old", {"v": 2})
+    assert not flat.exists()
+    assert JsonFileBackend(tmp_path).get("old") == {"v": 2}
+
+
+def test_manifest_answers_misses_without_probing_files(tmp_path: Path):
+    backend = JsonFileBackend(tmp_path)
+    backend.set("k", _HIT)
+    assert (tmp_path / MANIFEST_NAME).exists()
+
+    # An entry that appeared behind the manifest's back is invisible to lookups...
+    _cache_path(tmp_path, "sneaky").write_text('{"v": 1}', encoding="utf-8")
+    with patch("war_room.cache_io.open", side_effect=AssertionError("probed")):
+        assert backend.get("sneaky") is None
+    # ...unless the caller asks for a real check.
+    assert backend.get_entry("sneaky", probe=True).value == {"v": 1}
+    assert backend.get("sneaky") == {"v": 1}
+
+
+def test_files_added_beside_a_manifest_are_found_on_rescan(tmp_path: Path):
+    backend = JsonFileBackend(tmp_path)
+    backend.set("k", _HIT)
+    assert backend.get("pulled") is None
+
+    # E.g. a sample copied in by hand, or arriving with a git pull.
+    name = _entry_name("pulled")
+    pulled = _shard_path(tmp_path, name)
+    pulled.parent.mkdir(exist_ok=True)
+    pulled.write_text('{"v": 1}', encoding="utf-8")
+    (tmp_path / _entry_name("copied")).write_text('{"v": 2}', encoding="utf-8")
+    # A new process sees them as soon as it loads the manifest...
+    assert JsonFileBackend(tmp_path).get("pulled") == {"v": 1}
+    # ...a running one on its next rescan, which only lists changed directories.
+    assert backend.get("pulled") is None
+    with patch("war_room.cache_io.MANIFEST_RESCAN_SECONDS", 0):
+        assert backend.get("pulled") == {"v": 1}
+        assert backend.get("copied") == {"v": 2}
+        assert backend.get("missing") is None
+
+
+def test_equivalent_locations_share_one_backend(tmp_path: Path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "cache").mkdir()
+    assert get_backend("cache") is get_backend("./cache") is get_backend(tmp_path / "cache")
+
+    # The shared backend keeps pointing at the directory it was first given.
+    (tmp_path / "elsewhere").mkdir()
+    monkeypatch.chdir(tmp_path / "elsewhere")
+    path = get_backend(tmp_path / "cache").set("k", _HIT)
+    assert path.is_relative_to(tmp_path / "cache")
+    assert not (tmp_path / "elsewhere" / "cache").exists()
+
+
+def test_manifest_journal_shares_writes_across_processes(tmp_path: Path):
+    reader = JsonFileBackend(tmp_path)
+    assert reader.get("k") is None
+
+    # A second backend has its own manifest, like another process.
+    writer = JsonFileBackend(tmp_path)
+    writer.set("k", _HIT)
+    with patch("war_room.cache_io.MANIFEST_REFRESH_SECONDS", 0):
+        assert reader.get("k") == _HIT
+        writer.evict(next(writer.iter_entries()))
+        writer.compact_manifest()
+        assert JsonFileBackend(tmp_path).get("k") is None
+        assert reader.get("k") is None
+
+
+def test_migrate_moves_flat_entries_into_shards(tmp_path: Path):
+    flat = _cache_path(tmp_path, "old")
+    flat.write_text('{"v": 1}', encoding="utf-8")
+    _age(flat, 3600)
+    mtime = flat.stat().st_mtime
+
+    assert migrate_cache(tmp_path, LEGACY_ENCODING)["rewritten"] == 1
+    assert not flat.exists()
+    [moved] = tmp_path.glob("*/*.json")
+    assert moved.stat().st_mtime == mtime
+    assert (tmp_path / MANIFEST_NAME).exists()
+    clear_memory_cache()
+    assert cache_get("old", tmp_path) == {"v": 1}
+
+
+def test_negative_entries_use_their_own_ttl_and_never_serve_stale(tmp_path: Path):
+    calls = []
+
+    def fn():
+        calls.append(1)
+        return NegativeResult("empty", [], detail="no hits")
+
+    # The negative TTL applies even though the call's TTL is unbounded.
+    assert cached_call("k", fn, cache_dir=tmp_path, cache_samples_dir=tmp_path / "s") == []
+    assert cached_call("k", fn, cache_dir=tmp_path, cache_samples_dir=tmp_path / "s") == []
+    assert len(calls) == 1
+    assert cache_get_entry("k", tmp_path).negative.detail == "no hits"
+
+    with patch.dict(NEGATIVE_TTLS, {"empty": 0}):
+        assert cached_call("k", lambda: {"v": 1}, cache_dir=tmp_path, cache_samples_dir=tmp_path / "s") == {"v": 1}
+    assert cache_get_entry("k", tmp_path).negative is None
+
+
+def test_cached_call_async_records_classified_failures(tmp_path: Path):
+    calls = []
+
+    async def fn():
+        calls.append(1)
+        raise ConnectionError("network down")
+
+    async def run():
+        return await cached_call_async(
+            "k", fn, cache_dir=tmp_path, cache_samples_dir=tmp_path / "s",
+            classify_error=lambda exc: "error",
+        )
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(run())
+    with pytest.raises(CachedFailure, match="network down"):
+        asyncio.run(run())
+    assert len(calls) == 1
+
+    # Without a classifier failures stay uncached.
+    async def unclassified():
+        return await cached_call_async("other", fn, cache_dir=tmp_path, cache_samples_dir=tmp_path / "s")
+
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            asyncio.run(unclassified())
+    assert len(calls) == 3
@@ -0,0 +1,107 @@
+"""Tests for record/replay cassette providers - no network calls."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from war_room.cassette import (
+    AsyncReplayExa,
+    Cassette,
+    CassetteMiss,
+    RecordingExa,
+    ReplayExa,
+)
+from war_room.exa_client import AsyncExaClient, ExaClient
+from war_room.retry_policy import RetryPolicy
+
+
+class _FakeExa:
+    """Stands in for exa-py: deterministic results, one flaky call."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def search(self, query, **kwargs):
+        self.calls += 1
+        if query == "flaky":
+            raise ValueError("Request failed with status code 503: unavailable")
+        return SimpleNamespace(results=[
+            SimpleNamespace(id=f"https://noaa.gov/{query}", url=f"https://noaa.gov/{query}",
+                            title=query.title(), text=f"{query} 120 mph", published_date="2024-10-09",
+                            author=None, score=0.5),
+        ])
+
+    def get_contents(self, urls, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(
+            results=[SimpleNamespace(id=url, url=url, title="", text="full body",
+                                     published_date=None, author=None, score=None) for url in urls],
+            statuses=[SimpleNamespace(id=url, status="success", source="cached") for url in urls],
+        )
+
+
+def _record(path) -> tuple[Cassette, list, list]:
+    cassette = Cassette(path)
+    client = ExaClient(provider=RecordingExa(_FakeExa(), cassette), retry_policy=RetryPolicy(max_attempts=1))
+    hits = client.search("milton wind", k=3)
+    contents = client.get_contents(["https://noaa.gov/a", "https://noaa.gov/b"])
+    with pytest.raises(ValueError):
+        client.search("flaky")
+    cassette.save()
+    return cassette, hits, contents
+
+
+@pytest.mark.parametrize("name", ["run.cassette.jsonl", "run.cassette.jsonl.gz"])
+def test_replay_reproduces_recorded_run(tmp_path, name) -> None:
+    cassette, hits, contents = _record(tmp_path / name)
+    assert len(cassette) == 3
+
+    replayed = Cassette.load(tmp_path / name)
+    provider = ReplayExa(replayed)
+    client = ExaClient(provider=provider, retry_policy=RetryPolicy(max_attempts=1))
+
+    assert client.search("milton wind", k=3) == hits
+    assert client.get_contents(["https://noaa.gov/a", "https://noaa.gov/b"]) == contents
+    with pytest.raises(ValueError, match="503"):
+        client.search("flaky")
+    assert provider.replayed == 3
+
+
+def test_unrecorded_request_is_a_miss_and_not_retried(tmp_path) -> None:
+    cassette, _, _ = _record(tmp_path / "run.jsonl")
+    provider = ReplayExa(cassette)
+    client = ExaClient(provider=provider)
+
+    with pytest.raises(CassetteMiss):
+        client.search("milton wind", k=7)
+    assert client.retry_stats.retries == 0
+    assert provider.misses == 1
+
+
+@patch("war_room.cassette.time.sleep")
+def test_replay_latency_fixed_or_scaled(mock_sleep, tmp_path) -> None:
+    cassette, _, _ = _record(tmp_path / "run.jsonl")
+    cassette.interactions[0]["elapsed"] = 2.0
+
+    ExaClient(provider=ReplayExa(cassette, latency=0.25)).search("milton wind", k=3)
+    ExaClient(provider=ReplayExa(cassette, time_scale=0.5)).search("milton wind", k=3)
+
+    assert [c.args[0] for c in mock_sleep.call_args_list] == [0.25, 1.0]
+
+
+def test_async_replay_matches_sync(tmp_path) -> None:
+    cassette, hits, _ = _record(tmp_path / "run.jsonl")
+    client = AsyncExaClient(provider=AsyncReplayExa(cassette, latency=0.01))
+
+    async def _search_all() -> list:
+        return await asyncio.gather(*(client.search("milton wind", k=3) for _ in range(5)))
+
+    started = time.monotonic()
+    results = asyncio.run(_search_all())
+
+    assert all(result == hits for result in results)
+    # Replayed latency overlaps across concurrent calls.
+    assert time.monotonic() - started < 0.05 * 5
@@ -2,10 +2,15 @@
 
 import tempfile
 from pathlib import Path
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
+import pytest
+
+from war_room.cache_io import NEGATIVE_TTLS, clear_memory_cache, wait_for_refreshes
 from war_room.citation_verify import MAX_CHECKS, _do_check, spot_check_citations
 from war_room.exa_client import BudgetExhausted
+from war_room.retrieval import MODULE_TTLS
+from war_room.retry_policy import CircuitOpenError
 
 
 def _mock_client_with_hits(hits_list):
@@ -100,8 +105,9 @@ def test_no_hits_is_not_found():
     """Zero hits -> not_found."""
     client = _mock_client_with_hits([])
     result = _do_check("Nonexistent v. Case", client)
-    assert result["status"] == "not_found"
-    assert result["badge"] == "not_found"
+    assert result.reason == "empty"
+    assert result.value["status"] == "not_found"
+    assert result.value["badge"] == "not_found"
 
 
 def test_budget_exhausted_is_uncertain():
@@ -110,8 +116,9 @@ def test_budget_exhausted_is_uncertain():
     client.search.side_effect = BudgetExhausted("out of budget")
 
     result = _do_check("Smith v. Jones", client)
-    assert result["status"] == "uncertain"
-    assert "Budget" in result["note"]
+    assert result.reason == "skipped"
+    assert result.value["status"] == "uncertain"
+    assert "Budget" in result.value["note"]
 
 
 def test_search_error_is_uncertain():
@@ -120,5 +127,71 @@ def test_search_error_is_uncertain():
     client.search.side_effect = ConnectionError("network down")
 
     result = _do_check("Smith v. Jones", client)
-    assert result["status"] == "uncertain"
-    assert "ConnectionError" in result["note"]
+    assert result.reason == "error"
+    assert result.value["status"] == "uncertain"
+    assert "ConnectionError" in result.value["note"]
+
+
+def test_provider_error_is_uncertain_and_bugs_propagate():
+    client = MagicMock()
+    client.search.side_effect = ValueError("Request failed with status code 503: unavailable")
+    assert _do_check("Smith v. Jones", client).reason == "error"
+
+    client.search.side_effect = TypeError("search() got an unexpected keyword argument 'k'")
+    with pytest.raises(TypeError):
+        _do_check("Smith v. Jones", client)
+
+
+def test_missing_client_is_skipped_without_searching():
+    result = _do_check("Smith v. Jones", None)
+    assert result.reason == "skipped"
+    assert result.value["status"] == "uncertain"
+    assert "No Exa client" in result.value["note"]
+
+
+def test_open_circuit_is_skipped_and_not_cached(tmp_path: Path):
+    pack = {"issues": [{"issue": "Coverage", "cases": [{"name": "Smith v. Jones", "citation": "123 So. 3d 456"}]}]}
+    client = MagicMock()
+    client.search.side_effect = CircuitOpenError("circuit open")
+
+    assert _do_check("Smith v. Jones", client).reason == "skipped"
+    def _check() -> dict:
+        return spot_check_citations(pack, client, cache_dir=str(tmp_path), cache_samples_dir=str(tmp_path / "s"))
+
+    assert _check()["checks"][0]["status"] == "uncertain"
+    # Once the breaker closes, the citation is checked right away.
+    client.search.side_effect = None
+    client.search.return_value = [{"url": "https://www.flcourts.gov/case/123", "title": "FL"}]
+    assert _check()["checks"][0]["status"] == "verified"
+
+
+def test_failed_check_is_cached_briefly_and_never_replaces_a_good_one(tmp_path: Path):
+    pack = {"issues": [{"issue": "Coverage", "cases": [{"name": "Smith v. Jones", "citation": "123 So. 3d 456"}]}]}
+    client = MagicMock()
+    client.search.side_effect = ConnectionError("network down")
+
+    def _check() -> dict:
+        return spot_check_citations(pack, client, cache_dir=str(tmp_path), cache_samples_dir=str(tmp_path / "s"))
+
+    assert _check()["checks"][0]["status"] == "uncertain"
+    assert _check()["checks"][0]["status"] == "uncertain"
+    # The error was remembered, not retried...
+    assert client.search.call_count == 1
+
+    # ...but only for its short TTL.
+    clear_memory_cache()
+    with patch.dict(NEGATIVE_TTLS, {"error": 0}):
+        client.search.side_effect = None
+        client.search.return_value = [{"url": "https://www.flcourts.gov/case/123", "title": "FL"}]
+        assert _check()["checks"][0]["status"] == "verified"
+
+        client.search.side_effect = ConnectionError("network down again")
+        with patch.dict(MODULE_TTLS, {"citecheck": 0}):
+            # Stale: served while a background re-check fails...
+            assert _check()["checks"][0]["status"] == "verified"
+            assert wait_for_refreshes(timeout=5)
+            clear_memory_cache()
+            # ...and the failure did not overwrite the verified result.
+            assert _check()["checks"][0]["status"] == "verified"
+            assert wait_for_refreshes(timeout=5)
+        assert client.search.call_count == 4
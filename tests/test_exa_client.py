@@ -1,11 +1,14 @@
 """Tests for exa_client module — no network calls."""
 
+import asyncio
+import threading
+import time
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 
-from war_room.exa_client import BudgetExhausted, ExaClient, _build_contents_options
+from war_room.exa_client import AsyncExaClient, BudgetExhausted, ExaClient, _build_contents_options
 
 
 def _mock_result(url="https://example.com", title="Test", text="body"):
@@ -74,8 +77,8 @@ def test_retry_on_failure(MockExa):
     instance = MockExa.return_value
     # Fail twice, succeed on third
     instance.search.side_effect = [
-        Exception("rate limit"),
-        Exception("rate limit"),
+        ValueError("Request failed with status code 429: rate limit"),
+        ValueError("Request failed with status code 429: rate limit"),
         _mock_search_response([_mock_result()]),
     ]
 
@@ -130,3 +133,220 @@ def test_exa_client_falls_back_to_shared_settings(MockExa, mock_discover_root, m
 
     MockExa.assert_called_once_with("settings-key")
     assert client.budget_remaining == client.max_search_calls
+
+
+def _async_mock_exa(MockAsyncExa, response):
+    instance = MockAsyncExa.return_value
+    instance.search = AsyncMock(return_value=response)
+    return instance
+
+
+@patch("war_room.exa_client.AsyncExa")
+def test_async_search_normalizes_results(MockAsyncExa):
+    _async_mock_exa(
+        MockAsyncExa,
+        _mock_search_response([_mock_result("https://noaa.gov/report", "NOAA Report")]),
+    )
+
+    client = AsyncExaClient(api_key="test-key")
+    results = asyncio.run(client.search("test query"))
+
+    assert results[0]["url"] == "https://noaa.gov/report"
+    assert results[0]["title"] == "NOAA Report"
+    assert client.search_count == 1
+
+
+@patch("war_room.exa_client.AsyncExa")
+def test_async_budget_counts_in_flight_searches(MockAsyncExa):
+    instance = MockAsyncExa.return_value
+    release = None
+
+    async def _slow_search(query, **kwargs):
+        await release.wait()
+        return _mock_search_response([])
+
+    instance.search = AsyncMock(side_effect=_slow_search)
+    client = AsyncExaClient(api_key="test-key", max_search_calls=2)
+
+    async def _run():
+        nonlocal release
+        release = asyncio.Event()
+        first = asyncio.create_task(client.search("q1"))
+        second = asyncio.create_task(client.search("q2"))
+        await asyncio.sleep(0)
+        assert client.budget_remaining == 0
+        with pytest.raises(BudgetExhausted):
+            await client.search("q3")
+        release.set()
+        await asyncio.gather(first, second)
+
+    asyncio.run(_run())
+    assert client.search_count == 2
+    assert instance.search.call_count == 2
+
+
+@patch("war_room.exa_client.Exa")
+def test_budget_guard_is_thread_safe(MockExa):
+    instance = MockExa.return_value
+
+    def _slow_search(query, **kwargs):
+        time.sleep(0.005)
+        return _mock_search_response([])
+
+    instance.search.side_effect = _slow_search
+    client = ExaClient(api_key="test-key", max_search_calls=10)
+    exhausted = []
+
+    def _worker():
+        for _ in range(5):
+            try:
+                client.search("q")
+            except BudgetExhausted:
+                exhausted.append(1)
+
+    threads = [threading.Thread(target=_worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert client.search_count == 10
+    assert instance.search.call_count == 10
+    assert len(exhausted) == 30
+    assert client.budget_remaining == 0
+
+
+def _contents_response(urls, failed=()):
+    resp = MagicMock()
+    resp.results = [_mock_result(url, text=f"body of {url}") for url in urls if url not in failed]
+    resp.statuses = [
+        MagicMock(id=url, status="error" if url in failed else "success", source="crawl")
+        for url in urls
+    ]
+    return resp
+
+
+@patch("war_room.exa_client.Exa")
+def test_fetch_contents_chunks_dedupes_and_keeps_order(MockExa):
+    calls: list[list[str]] = []
+
+    def _get_contents(urls, **kwargs):
+        calls.append(list(urls))
+        return _contents_response(urls)
+
+    MockExa.return_value.get_contents.side_effect = _get_contents
+    urls = [f"https://example.com/{i}" for i in range(7)] + ["https://example.com/0", ""]
+
+    client = ExaClient(api_key="test-key")
+    batch = client.fetch_contents(urls, chunk_size=3)
+
+    assert sorted(len(chunk) for chunk in calls) == [1, 3, 3]
+    assert [r["url"] for r in batch.results] == [f"https://example.com/{i}" for i in range(7)]
+    assert batch.counts() == {"fetched": 7}
+    assert client.contents_count == 3
+
+
+@patch("war_room.exa_client.Exa")
+def test_fetch_contents_retries_only_failed_urls(MockExa):
+    calls: list[list[str]] = []
+
+    def _get_contents(urls, **kwargs):
+        calls.append(list(urls))
+        # The flaky page fails on its first fetch only.
+        failed = {"https://example.com/flaky"} if len(calls) == 1 else set()
+        return _contents_response(urls, failed=failed)
+
+    MockExa.return_value.get_contents.side_effect = _get_contents
+    urls = ["https://example.com/a", "https://example.com/flaky", "https://example.com/b"]
+
+    batch = ExaClient(api_key="test-key").fetch_contents(urls)
+
+    assert calls == [urls, ["https://example.com/flaky"]]
+    assert batch.counts() == {"fetched": 3}
+    assert batch.errors == {}
+
+
+@patch("war_room.exa_client.Exa")
+def test_fetch_contents_bisects_chunk_rejected_by_one_bad_url(MockExa):
+    bad = "https://example.com/bad"
+
+    def _get_contents(urls, **kwargs):
+        if bad in urls:
+            raise ValueError("Request failed with status code 400: invalid url")
+        return _contents_response(urls)
+
+    MockExa.return_value.get_contents.side_effect = _get_contents
+    urls = ["https://example.com/a", "https://example.com/b", bad, "https://example.com/c"]
+
+    client = ExaClient(api_key="test-key")
+    batch = client.fetch_contents(urls, chunk_size=4)
+
+    assert batch.failed == [bad]
+    assert [r["url"] for r in batch.results] == [
+        "https://example.com/a", "https://example.com/b", "https://example.com/c",
+    ]
+    assert "400" in batch.errors[bad]
+    assert client.last_contents_error == batch.errors[bad]
+
+
+@patch("war_room.exa_client.Exa")
+def test_fetch_contents_skips_cached_urls(MockExa, tmp_path):
+    MockExa.return_value.get_contents.side_effect = lambda urls, **kwargs: _contents_response(urls)
+    client = ExaClient(api_key="test-key")
+
+    client.fetch_contents(["https://example.com/a"], cache_dir=tmp_path, cache_samples_dir=tmp_path)
+    batch = client.fetch_contents(
+        ["https://example.com/a", "https://example.com/b"],
+        cache_dir=tmp_path,
+        cache_samples_dir=tmp_path,
+    )
+
+    assert batch.status == {"https://example.com/a": "cached", "https://example.com/b": "fetched"}
+    assert MockExa.return_value.get_contents.call_args[0][0] == ["https://example.com/b"]
+
+
+@patch("war_room.exa_client.Exa")
+def test_fetch_contents_caches_urls_longer_than_a_file_name(MockExa, tmp_path):
+    MockExa.return_value.get_contents.side_effect = lambda urls, **kwargs: _contents_response(urls)
+    client = ExaClient(api_key="test-key")
+    urls = ["https://example.com/a", "https://b.com/" + "a" * 260]
+
+    first = client.fetch_contents(urls, cache_dir=tmp_path, cache_samples_dir=tmp_path)
+    second = client.fetch_contents(urls, cache_dir=tmp_path, cache_samples_dir=tmp_path)
+
+    assert first.counts() == {"fetched": 2}
+    assert second.counts() == {"cached": 2}
+
+
+@patch("war_room.exa_client.Exa")
+def test_fetch_contents_keeps_results_when_the_cache_write_fails(MockExa, tmp_path):
+    MockExa.return_value.get_contents.side_effect = lambda urls, **kwargs: _contents_response(urls)
+    urls = ["https://example.com/a", "https://example.com/b"]
+
+    with patch("war_room.contents.cache_set", side_effect=OSError(36, "File name too long")):
+        batch = ExaClient(api_key="test-key").fetch_contents(urls, cache_dir=tmp_path, cache_samples_dir=tmp_path)
+
+    assert [r["url"] for r in batch.results] == urls
+
+
+@patch("war_room.exa_client.AsyncExa")
+def test_async_fetch_contents_runs_chunks_concurrently(MockAsyncExa):
+    active = 0
+    peak = 0
+
+    async def _get_contents(urls, **kwargs):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return _contents_response(urls)
+
+    MockAsyncExa.return_value.get_contents = AsyncMock(side_effect=_get_contents)
+    urls = [f"https://example.com/{i}" for i in range(10)]
+
+    client = AsyncExaClient(api_key="test-key")
+    batch = asyncio.run(client.fetch_contents(urls, chunk_size=2, max_workers=3))
+
+    assert peak == 3
+    assert [r["url"] for r in batch.results] == urls
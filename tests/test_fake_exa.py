@@ -0,0 +1,105 @@
+"""Tests for the local fake Exa server - loopback HTTP only, no Exa calls."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pytest
+
+from war_room.cassette import Cassette, RecordingExa
+from war_room.exa_client import AsyncExaClient, ExaClient
+from war_room.fake_exa import FakeExaCorpus, FakeExaServer, FaultProfile
+from war_room.retry_policy import RetryPolicy
+
+_DOCS = [
+    {"id": f"https://www.noaa.gov/milton/{i}", "url": f"https://www.noaa.gov/milton/{i}",
+     "title": f"NOAA {i}", "text": f"Milton gusts {100 + i} mph " * 50}
+    for i in range(4)
+] + [
+    {"id": "https://news.example.com/milton", "url": "https://news.example.com/milton",
+     "title": "News", "text": "Storm surge 9 feet"},
+]
+
+
+def _client(server: FakeExaServer, **kwargs) -> ExaClient:
+    return ExaClient(api_key="test-key", base_url=server.base_url, **kwargs)
+
+
+def test_search_and_contents_over_the_wire() -> None:
+    with FakeExaServer(FakeExaCorpus(docs=_DOCS)) as server:
+        client = _client(server)
+        hits = client.search("milton wind", k=3, include_domains=["noaa.gov"], max_chars=40)
+        contents = client.get_contents(["https://news.example.com/milton", "https://unknown.example.org/x"])
+
+        assert len(hits) == 3
+        assert all(hit["url"].startswith("https://www.noaa.gov/") for hit in hits)
+        assert all(len(hit["text"]) == 40 for hit in hits)
+        # Same query, same hits: load tests are repeatable.
+        assert client.search("milton wind", k=3, include_domains=["noaa.gov"], max_chars=40) == hits
+        assert [c["url"] for c in contents] == ["https://news.example.com/milton", "https://unknown.example.org/x"]
+        assert server.stats()["search"] == 2
+
+
+def test_recorded_cassette_answers_are_replayed_exactly() -> None:
+    class _Inner:
+        def search(self, query, **kwargs):
+            return SimpleNamespace(results=[SimpleNamespace(
+                id="https://fema.gov/recorded", url="https://fema.gov/recorded", title="Recorded",
+                text="recorded body", published_date="2024-10-10", author=None, score=0.7,
+            )])
+
+    cassette = Cassette()
+    recorded = ExaClient(provider=RecordingExa(_Inner(), cassette)).search("milton fema", k=2)
+
+    with FakeExaServer(FakeExaCorpus(cassette, docs=_DOCS)) as server:
+        assert _client(server).search("milton fema", k=2) == recorded
+
+
+@patch("war_room.exa_client.time.sleep")
+def test_injected_429s_are_retried_then_surface(_sleep) -> None:
+    profile = FaultProfile(rate_limit_rate=1.0, retry_after=2, seed=1)
+    with FakeExaServer(FakeExaCorpus(docs=_DOCS), profile) as server:
+        client = _client(server, retry_policy=RetryPolicy(max_attempts=2, deadline=None))
+        with pytest.raises(ValueError, match="429"):
+            client.search("milton")
+
+        assert server.stats()["rate_limited"] == 2
+        assert client.retry_stats.retries == 1
+        # Retry-After from the fake server is honored by the retry policy.
+        assert _sleep.call_args.args[0] >= 2
+
+
+def test_injected_errors_and_auth() -> None:
+    with FakeExaServer(FakeExaCorpus(docs=_DOCS), FaultProfile(error_rate=1.0)) as server:
+        client = _client(server, retry_policy=RetryPolicy(max_attempts=1))
+        with pytest.raises(ValueError, match="500"):
+            client.search("milton")
+
+    with FakeExaServer(FakeExaCorpus(docs=_DOCS), api_key="right-key") as server:
+        client = _client(server, retry_policy=RetryPolicy(max_attempts=1))
+        with pytest.raises(ValueError, match="401"):
+            client.search("milton")
+        assert server.stats()["unauthorized"] == 1
+
+
+def test_async_client_runs_concurrently_against_server() -> None:
+    profile = FaultProfile(latency=0.05)
+    with FakeExaServer(FakeExaCorpus(docs=_DOCS), profile) as server:
+        client = AsyncExaClient(api_key="test-key", base_url=server.base_url)
+
+        async def _search_all() -> list:
+            return await asyncio.gather(*(client.search(f"milton {i}", k=2) for i in range(6)))
+
+        results = asyncio.run(_search_all())
+
+        assert [len(hits) for hits in results] == [2] * 6
+        assert server.stats()["search"] == 6
+
+
+def test_corpus_reads_documents_from_cache_dirs(tmp_path) -> None:
+    (tmp_path / "pack.json").write_text(
+        '{"sources": [{"title": "CourtListener", "url": "https://www.courtlistener.com/opinion/1/"}]}',
+        encoding="utf-8",
+    )
+    corpus = FakeExaCorpus.from_paths(cache_dirs=[tmp_path])
+    assert list(corpus.docs) == ["https://www.courtlistener.com/opinion/1/"]
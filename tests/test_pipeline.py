@@ -0,0 +1,105 @@
+"""Tests for the parallel module pipeline - no network calls."""
+import threading
+import time
+
+import pytest
+
+from war_room.pipeline import STAGES, run_pipeline
+from war_room.query_plan import CaseIntake
+
+
+def _sample_intake() -> CaseIntake:
+    return CaseIntake(
+        event_name="Hurricane Milton",
+        event_date="2024-10-09",
+        state="FL",
+        county="Pinellas",
+        carrier="Citizens Property Insurance",
+        policy_type="HO-3 Dwelling",
+        posture=["denial", "bad_faith"],
+    )
+
+
+class _ThreadedFakeClient:
+    """Records peak concurrent searches across worker threads."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.active = 0
+        self.peak = 0
+        self.queries: list[str] = []
+
+    def search(self, query, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.queries.append(query)
+        time.sleep(0.01)
+        with self._lock:
+            self.active -= 1
+        return [{
+            "url": "https://www.flcourts.gov/case/1",
+            "title": "Smith v. Citizens Property Insurance",
+            "snippet": "Court held coverage applied",
+            "text": "Smith v. Citizens, 123 So. 3d 456 (Fla. App. 2020). Wind 120 mph.",
+        }]
+
+
+def test_run_pipeline_runs_modules_concurrently_and_renders_memo(tmp_path) -> None:
+    client = _ThreadedFakeClient()
+    cache_dir = str(tmp_path)
+    result = run_pipeline(
+        _sample_intake(),
+        client,
+        use_cache=False,
+        cache_dir=cache_dir,
+        cache_samples_dir=cache_dir,
+    )
+
+    assert client.peak > 1
+    assert result.weather["module"] == "weather"
+    assert result.carrier["module"] == "carrier"
+    assert result.caselaw["module"] == "caselaw"
+    assert result.citecheck["summary"]["total"] >= 1
+    assert "# CAT-Loss War Room - Research Memo" in result.memo_md
+    assert any(query.startswith("Smith v. Citizens") for query in client.queries)
+
+
+def test_run_pipeline_without_client_uses_fallbacks(tmp_path) -> None:
+    cache_dir = str(tmp_path)
+    result = run_pipeline(
+        _sample_intake(),
+        None,
+        use_cache=False,
+        cache_dir=cache_dir,
+        cache_samples_dir=cache_dir,
+    )
+
+    assert result.caselaw["issues"] == []
+    assert result.citecheck["summary"]["total"] == 0
+    assert len(result.query_plan) >= 12
+
+
+def test_run_pipeline_rejects_zero_workers() -> None:
+    with pytest.raises(ValueError):
+        run_pipeline(_sample_intake(), None, max_workers=0)
+
+
+def test_run_pipeline_records_stage_timings_and_counters(tmp_path) -> None:
+    client = _ThreadedFakeClient()
+    stages: dict = {}
+    cache_dir = str(tmp_path)
+    result = run_pipeline(
+        _sample_intake(),
+        client,
+        cache_dir=cache_dir,
+        cache_samples_dir=cache_dir,
+        stages=stages,
+    )
+
+    assert set(stages) == set(STAGES)
+    assert result.stages == stages
+    assert all(stage["seconds"] >= 0 for stage in stages.values())
+    assert stages["weather"]["cache_miss"] >= 1
+    assert stages["citecheck"]["cache_miss"] >= 1
+    assert stages["render"]["cache_miss"] == 0
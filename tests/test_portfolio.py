@@ -0,0 +1,89 @@
+"""Tests for the portfolio query planner - no network calls."""
+
+import threading
+
+from war_room.pipeline import run_pipeline
+from war_room.portfolio import PortfolioClient, execute_portfolio, plan_portfolio
+from war_room.query_plan import CaseIntake, generate_query_plan
+
+
+def _intake(county: str, carrier: str = "Citizens", posture=("denial",)) -> CaseIntake:
+    return CaseIntake(
+        event_name="Hurricane Milton", event_date="2024-10-09", state="FL", county=county,
+        carrier=carrier, policy_type="HO-3", posture=list(posture),
+    )
+
+
+class _CountingClient:
+    def __init__(self, fail_on: str | None = None) -> None:
+        self._lock = threading.Lock()
+        self.fail_on = fail_on
+        self.queries: list[str] = []
+
+    def search(self, query, **kwargs):
+        with self._lock:
+            self.queries.append(query)
+        if self.fail_on and self.fail_on in query:
+            raise RuntimeError("provider error")
+        return [{"url": f"https://www.weather.gov/{abs(hash(query))}", "title": query, "snippet": query, "text": "Wind 120 mph"}]
+
+
+def _portfolio() -> dict[str, CaseIntake]:
+    return {
+        "pinellas_1": _intake("Pinellas"),
+        "pinellas_2": _intake("Pinellas", posture=("denial", "bad_faith")),
+        "sarasota": _intake("Sarasota", carrier="Universal"),
+    }
+
+
+def test_plan_merges_overlapping_queries_and_reports_dedup() -> None:
+    intakes = _portfolio()
+    plan = plan_portfolio(intakes)
+    per_intake = {key: len(generate_query_plan(intake)) for key, intake in intakes.items()}
+
+    assert plan.total_queries == sum(per_intake.values())
+    assert len(plan.queries) < plan.total_queries
+    by_text = {query.spec.query: query for query in plan.queries}
+    assert by_text["concurrent causation wind water damage insurance FL"].serves == list(intakes)
+    assert by_text["NWS Hurricane Milton wind speed Pinellas FL"].serves == ["pinellas_1", "pinellas_2"]
+    assert by_text["Universal department of insurance complaints FL"].serves == ["sarasota"]
+
+    report = plan.report(top=1)
+    assert report["dedup_ratio"] == round(plan.total_queries / len(plan.queries), 2)
+    assert report["saved_queries"] == plan.total_queries - len(plan.queries)
+    # Five weather queries each; FEMA's is event-wide, the rest per county.
+    assert report["by_module"]["weather"] == {"total": 15, "unique": 9}
+    assert len(report["most_shared"]) == 1
+    assert report["most_shared"][0]["intakes"] == 3
+
+
+def test_each_unique_query_runs_once_and_fans_out_in_process(tmp_path) -> None:
+    intakes = _portfolio()
+    plan = plan_portfolio(intakes)
+    client = _CountingClient(fail_on="regulatory action")
+    cache_dir = str(tmp_path)
+    hits = execute_portfolio(plan, client, use_cache=False, cache_dir=cache_dir, cache_samples_dir=cache_dir)
+    assert sorted(client.queries) == sorted(query.spec.query for query in plan.queries)
+    assert len(hits.errors) == 2
+
+    shared = PortfolioClient(hits, client)
+    client.fail_on = None
+    client.queries.clear()
+    for intake in intakes.values():
+        run_pipeline(intake, shared, use_cache=False, cache_dir=cache_dir, cache_samples_dir=cache_dir)
+
+    # Only the failed queries and the citation checks reach the real client again.
+    assert sum("regulatory action" in query for query in client.queries) == 3
+    assert not any("wind speed" in query or "concurrent causation" in query for query in client.queries)
+    assert shared.served == plan.total_queries - 3
+
+
+def test_execution_warms_the_per_query_cache_for_the_modules(tmp_path) -> None:
+    intakes = _portfolio()
+    client = _CountingClient()
+    cache_dir = str(tmp_path)
+    execute_portfolio(plan_portfolio(intakes), client, cache_dir=cache_dir, cache_samples_dir=cache_dir)
+    prefetched = len(client.queries)
+    run_pipeline(intakes["pinellas_2"], client, cache_dir=cache_dir, cache_samples_dir=cache_dir)
+
+    assert all(not query.startswith(("NWS", "FEMA")) for query in client.queries[prefetched:])
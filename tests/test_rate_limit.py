@@ -0,0 +1,115 @@
+"""Tests for rate limiting and shared budget ledgers - no network calls."""
+
+import threading
+from pathlib import Path
+from unittest.mock import MagicMock, patch
+
+import pytest
+
+from war_room.exa_client import BudgetExhausted, ExaClient
+from war_room.rate_limit import InMemoryBudgetLedger, SQLiteBudgetLedger, TokenBucket
+
+
+def _mock_response(results):
+    response = MagicMock()
+    response.results = results
+    return response
+
+
+def test_token_bucket_allows_burst_then_paces() -> None:
+    bucket = TokenBucket(rate=10, burst=3)
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+
+    wait = bucket.reserve()
+    assert 0.05 < wait <= 0.1
+    # The debt is queued, so the next caller waits behind it.
+    assert bucket.wait_time() > wait
+
+
+def test_token_bucket_rejects_bad_config() -> None:
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0)
+    with pytest.raises(ValueError):
+        TokenBucket(rate=1, burst=0.5)
+
+
+def test_in_memory_ledger_spend_and_refund() -> None:
+    ledger = InMemoryBudgetLedger(limit=2)
+    assert ledger.try_spend()
+    assert ledger.try_spend()
+    assert not ledger.try_spend()
+    ledger.refund()
+    assert ledger.remaining() == 1
+    assert ledger.spent() == 1
+
+
+def test_sqlite_ledger_is_shared_across_instances(tmp_path: Path) -> None:
+    db_path = tmp_path / "budget.sqlite3"
+    first = SQLiteBudgetLedger(db_path, limit=5, scope="milton")
+    second = SQLiteBudgetLedger(db_path, limit=999, scope="milton")
+
+    assert second.limit == 5
+    results = []
+
+    def worker(ledger):
+        for _ in range(4):
+            results.append(ledger.try_spend())
+
+    threads = [threading.Thread(target=worker, args=(ledger,)) for ledger in (first, second)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert results.count(True) == 5
+    assert first.remaining() == 0
+    assert SQLiteBudgetLedger(db_path, limit=10, scope="other").remaining() == 10
+
+    second.set_limit(8)
+    assert (first.limit, first.spent(), first.remaining()) == (8, 5, 3)
+
+
+@patch("war_room.exa_client.Exa")
+def test_clients_share_ledger_budget(MockExa) -> None:
+    MockExa.return_value.search.return_value = _mock_response([])
+    ledger = InMemoryBudgetLedger(limit=3)
+
+    first = ExaClient(api_key="test-key", budget_ledger=ledger)
+    second = ExaClient(api_key="test-key", budget_ledger=ledger)
+
+    first.search("q1")
+    second.search("q2")
+    first.get_contents(["https://example.com"])
+
+    with pytest.raises(BudgetExhausted):
+        second.search("q3")
+    assert first.budget_remaining == 0
+    assert first.contents_count == 1
+
+
+@patch("war_room.exa_client.time.sleep")
+@patch("war_room.exa_client.Exa")
+def test_failed_search_refunds_ledger(MockExa, _sleep) -> None:
+    MockExa.return_value.search.side_effect = Exception("boom")
+    ledger = InMemoryBudgetLedger(limit=3)
+    client = ExaClient(api_key="test-key", budget_ledger=ledger)
+
+    with pytest.raises(Exception):
+        client.search("q1")
+    assert ledger.remaining() == 3
+    assert client.search_count == 0
+
+
+@patch("war_room.exa_client.Exa")
+def test_rate_limiter_paces_each_call(MockExa) -> None:
+    MockExa.return_value.search.return_value = _mock_response([])
+    limiter = MagicMock()
+    limiter.reserve.return_value = 0.0
+    limiter.wait_time.return_value = 0.25
+
+    client = ExaClient(api_key="test-key", rate_limiter=limiter)
+    client.search("q1")
+    client.search("q2")
+
+    assert limiter.reserve.call_count == 2
+    assert client.rate_limit_wait == 0.25
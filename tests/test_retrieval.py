@@ -0,0 +1,376 @@
+"""Tests for shared query execution helpers - no network calls."""
+
+import asyncio
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from war_room import retrieval
+from war_room.cache_io import (
+    CachedFailure,
+    cache_get_entry,
+    cache_set,
+    clear_memory_cache,
+    wait_for_refreshes,
+)
+from war_room.exa_client import BudgetExhausted
+from war_room.metrics import collect
+from war_room.models import QuerySpec
+from war_room.query_plan import CaseIntake, generate_query_plan
+from war_room.retrieval import (
+    cached_versioned_call,
+    configure_schema_version,
+    pack_cache_key,
+    query_cache_key,
+    register_payload_upgrade,
+    run_queries,
+    run_queries_async,
+    stream_queries,
+)
+from war_room.weather_module import (
+    build_weather_brief,
+    build_weather_brief_async,
+    stream_weather_brief,
+    stream_weather_brief_async,
+)
+
+
+def _sample_intake() -> CaseIntake:
+    return CaseIntake(
+        event_name="Hurricane Milton",
+        event_date="2024-10-09",
+        state="FL",
+        county="Pinellas",
+        carrier="Citizens Property Insurance",
+        policy_type="HO-3 Dwelling",
+    )
+
+
+def _specs(count: int) -> list[QuerySpec]:
+    return [
+        QuerySpec(module="weather", query=f"query {i}", category=f"cat_{i}")
+        for i in range(count)
+    ]
+
+
+class _FakeSyncClient:
+    def __init__(self) -> None:
+        self.queries: list[str] = []
+
+    def search(self, query, **kwargs):
+        self.queries.append(query)
+        return [{"url": f"https://weather.gov/{query.replace(' ', '_')}", "title": query}]
+
+
+class _FakeAsyncClient:
+    def __init__(self) -> None:
+        self.active = 0
+        self.peak = 0
+
+    async def search(self, query, **kwargs):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        # Later queries finish first to prove output order is plan order.
+        await asyncio.sleep(0.01 / (int(query.split()[-1]) + 1))
+        self.active -= 1
+        return [{"url": f"https://weather.gov/{query.replace(' ', '_')}", "title": query}]
+
+
+def test_run_queries_tags_category() -> None:
+    hits = run_queries(_FakeSyncClient(), _specs(2))
+    assert [hit["category"] for hit in hits] == ["cat_0", "cat_1"]
+
+
+def test_run_queries_async_respects_concurrency_and_order() -> None:
+    client = _FakeAsyncClient()
+    hits = asyncio.run(run_queries_async(client, _specs(8), max_concurrency=3))
+
+    assert client.peak == 3
+    assert [hit["title"] for hit in hits] == [f"query {i}" for i in range(8)]
+    assert all(hit["category"].startswith("cat_") for hit in hits)
+
+
+def test_async_builder_matches_sync_builder(tmp_path: Path) -> None:
+    intake = _sample_intake()
+    cache_dir = str(tmp_path / "sync")
+    sync_brief = build_weather_brief(
+        intake,
+        _FakeSyncClient(),
+        use_cache=False,
+        cache_dir=cache_dir,
+        cache_samples_dir=cache_dir,
+    )
+
+    class _AsyncWrapper:
+        def __init__(self) -> None:
+            self._sync = _FakeSyncClient()
+
+        async def search(self, query, **kwargs):
+            return self._sync.search(query, **kwargs)
+
+    cache_dir = str(tmp_path / "async")
+    async_brief = asyncio.run(
+        build_weather_brief_async(
+            intake,
+            _AsyncWrapper(),
+            use_cache=False,
+            cache_dir=cache_dir,
+            cache_samples_dir=cache_dir,
+        )
+    )
+
+    assert async_brief == sync_brief
+
+
+def test_query_cache_key_ignores_category_and_whitespace() -> None:
+    first = QuerySpec(module="weather", query="Milton  wind FL", category="a", preferred_domains=["b.gov", "a.gov"])
+    second = QuerySpec(module="caselaw", query="milton wind fl", category="b", preferred_domains=["a.gov", "b.gov"])
+    assert query_cache_key(first) == query_cache_key(second)
+
+    dated = QuerySpec(module="weather", query="milton wind fl", category="a", date_start="2024-10-09")
+    assert query_cache_key(dated) != query_cache_key(QuerySpec(module="weather", query="milton wind fl", category="a"))
+
+
+def test_changed_coverage_issue_only_refetches_new_query(tmp_path: Path) -> None:
+    from war_room.caselaw_module import build_caselaw_pack
+
+    intake = _sample_intake()
+    edited = intake.model_copy(update={"coverage_issues": ["roof matching"]})
+    client = _FakeSyncClient()
+
+    cache_dir = str(tmp_path)
+    build_caselaw_pack(intake, client, cache_dir=cache_dir, cache_samples_dir=cache_dir)
+    assert len(client.queries) == 4
+
+    # The edit changes the pack key, but only the new issue query goes live.
+    build_caselaw_pack(edited, client, cache_dir=cache_dir, cache_samples_dir=cache_dir)
+    assert len(client.queries) == 5
+    assert client.queries[-1].startswith("roof matching")
+
+    # Re-running the original intake is a pure pack-cache hit.
+    build_caselaw_pack(intake, client, cache_dir=cache_dir, cache_samples_dir=cache_dir)
+    assert len(client.queries) == 5
+
+
+def test_committed_fixture_wins_under_legacy_case_key(tmp_path: Path) -> None:
+    from war_room.cache_io import cache_set
+    from war_room.caselaw_module import build_caselaw_pack
+
+    intake = _sample_intake()
+    fixture = {"module": "caselaw", "issues": [], "sources": [], "warnings": ["fixture"]}
+    samples_dir, cache_dir = str(tmp_path / "samples"), str(tmp_path / "cache")
+    cache_set(
+        f"caselaw__{intake.event_name}__{intake.carrier}__{intake.state}",
+        fixture,
+        samples_dir,
+    )
+    pack = build_caselaw_pack(intake, None, cache_dir=cache_dir, cache_samples_dir=samples_dir)
+
+    assert pack == fixture
+
+
+def test_stream_queries_yields_growing_snapshots_then_final() -> None:
+    finals: list[dict] = []
+    snapshots = list(stream_queries(
+        _FakeSyncClient(),
+        _specs(5),
+        lambda results: {"urls": [hit["url"] for hit in results]},
+        snapshot_every=2,
+        on_final=finals.append,
+    ))
+
+    assert [(s.completed_queries, s.final) for s in snapshots] == [(2, False), (4, False), (5, True)]
+    assert [len(s.payload["urls"]) for s in snapshots] == [2, 4, 5]
+    assert finals == [snapshots[-1].payload]
+
+
+def test_stream_builder_final_matches_builder_and_is_cached(tmp_path: Path) -> None:
+    intake = _sample_intake()
+    cache_dir = str(tmp_path / "built")
+    built = build_weather_brief(
+        intake, _FakeSyncClient(), use_cache=False, cache_dir=cache_dir, cache_samples_dir=cache_dir
+    )
+
+    client = _FakeSyncClient()
+    cache_dir = str(tmp_path / "stream")
+    snapshots = list(stream_weather_brief(
+        intake, client, cache_dir=cache_dir, cache_samples_dir=cache_dir
+    ))
+    assert len(snapshots) == len(client.queries)
+    assert [s.final for s in snapshots] == [False] * (len(snapshots) - 1) + [True]
+    assert snapshots[-1].payload == built
+
+    # The final pack landed in the pack cache, so a rebuild goes nowhere near Exa.
+    assert build_weather_brief(intake, None, cache_dir=cache_dir, cache_samples_dir=cache_dir) == built
+    replay = list(stream_weather_brief(intake, None, cache_dir=cache_dir, cache_samples_dir=cache_dir))
+    assert len(replay) == 1 and replay[0].final and replay[0].payload == built
+
+
+def test_stream_builder_async_snapshots_in_completion_order(tmp_path: Path) -> None:
+    intake = _sample_intake()
+    cache_dir = str(tmp_path / "built")
+    built = build_weather_brief(
+        intake, _FakeSyncClient(), use_cache=False, cache_dir=cache_dir, cache_samples_dir=cache_dir
+    )
+
+    class _SlowFirstClient:
+        def __init__(self) -> None:
+            self._sync = _FakeSyncClient()
+            self.calls = 0
+
+        async def search(self, query, **kwargs):
+            self.calls += 1
+            # The first query is the slowest, so partial snapshots cannot wait on it.
+            await asyncio.sleep(0.05 if self.calls == 1 else 0)
+            return self._sync.search(query, **kwargs)
+
+    async def _collect(cache_dir: str) -> list:
+        return [
+            snapshot
+            async for snapshot in stream_weather_brief_async(
+                intake, _SlowFirstClient(), use_cache=False, cache_dir=cache_dir, cache_samples_dir=cache_dir
+            )
+        ]
+
+    cache_dir = str(tmp_path / "stream")
+    snapshots = asyncio.run(_collect(cache_dir))
+
+    assert [s.completed_queries for s in snapshots] == list(range(1, len(snapshots) + 1))
+    assert snapshots[-1].final
+    assert snapshots[-1].payload == built
+    first_query_url = built["sources"][0]["url"]
+    assert all(
+        first_query_url not in [src["url"] for src in s.payload["sources"]] for s in snapshots[:-1]
+    )
+
+
+def test_expired_weather_pack_served_offline_and_refreshed_online(tmp_path: Path) -> None:
+    intake = _sample_intake()
+    cache_dir = str(tmp_path)
+    first = _FakeSyncClient()
+    brief = build_weather_brief(intake, first, cache_dir=cache_dir, cache_samples_dir=cache_dir + "/s")
+    two_days_ago = time.time() - 2 * 24 * 3600
+    for path in Path(cache_dir).rglob("*.json"):
+        os.utime(path, (two_days_ago, two_days_ago))
+    clear_memory_cache()
+
+    # Offline: the expired pack still beats an empty one.
+    assert build_weather_brief(intake, None, cache_dir=cache_dir, cache_samples_dir=cache_dir + "/s") == brief
+
+    # Online: served immediately, refreshed in the background.
+    second = _FakeSyncClient()
+    assert build_weather_brief(intake, second, cache_dir=cache_dir, cache_samples_dir=cache_dir + "/s") == brief
+    assert wait_for_refreshes(timeout=5)
+    assert sorted(second.queries) == sorted(first.queries)
+
+
+def _weather_keys(intake: CaseIntake, **kwargs) -> tuple[str, list[QuerySpec], str]:
+    case_key = f"weather__{intake.event_name}__{intake.county}_{intake.state}"
+    queries = [q for q in generate_query_plan(intake) if q.module == "weather"]
+    return case_key, queries, pack_cache_key(case_key, queries, **kwargs)
+
+
+def test_pack_keys_are_namespaced_by_schema_and_assembler_version() -> None:
+    _, queries, key = _weather_keys(_sample_intake())
+    assert key.endswith("__v0-demo_a1")
+    try:
+        configure_schema_version("v2-prod")
+        assert _weather_keys(_sample_intake())[2].endswith("__v2-prod_a1")
+    finally:
+        configure_schema_version("v0-demo")
+    assert "__plan_" in _weather_keys(_sample_intake(), assembler_version=0)[2]
+    assert not _weather_keys(_sample_intake(), assembler_version=0)[2].endswith("_a0")
+
+
+def test_unversioned_pack_is_upgraded_on_read_keeping_fetched_at(tmp_path: Path) -> None:
+    intake = _sample_intake()
+    cache_dir = str(tmp_path)
+    _, _, legacy_key = _weather_keys(intake, assembler_version=0)
+    legacy = cache_set(legacy_key, {"module": "weather", "event_summary": "legacy"}, cache_dir)
+    old = time.time() - 3600
+    os.utime(legacy, (old, old))
+    clear_memory_cache()
+
+    brief = build_weather_brief(intake, None, cache_dir=cache_dir, cache_samples_dir=cache_dir + "/s")
+
+    assert brief["event_summary"] == "legacy"
+    upgraded = cache_get_entry(_weather_keys(intake)[2], cache_dir)
+    assert upgraded.value["event_summary"] == "legacy"
+    assert abs(upgraded.fetched_at - old) < 1
+
+
+def test_upgraded_hits_are_counted_by_where_they_came_from(tmp_path) -> None:
+    samples, runtime = tmp_path / "samples", tmp_path / "cache"
+    cache_set("citecheck__smith_v_jones", {"status": "verified"}, samples)
+    cache_set("citecheck__doe_v_roe", {"status": "uncertain"}, runtime)
+    clear_memory_cache()
+
+    def _never() -> dict:
+        raise AssertionError("fetched")
+
+    with collect() as tally:
+        for key in ("citecheck__smith_v_jones", "citecheck__doe_v_roe"):
+            cached_versioned_call("citecheck", key, _never, cache_dir=runtime, cache_samples_dir=samples)
+    counts = tally.as_dict()
+    assert (counts["cache_samples"], counts["cache_fresh"], counts["cache_miss"]) == (1, 1, 0)
+
+
+def test_registered_upgrade_runs_when_assembler_version_bumps(monkeypatch, tmp_path: Path) -> None:
+    intake = _sample_intake()
+    cache_dir = str(tmp_path)
+    cache_set(_weather_keys(intake)[2], {"module": "weather", "event_summary": "v1"}, cache_dir)
+    monkeypatch.setitem(retrieval.ASSEMBLER_VERSIONS, "weather", 2)
+    monkeypatch.setattr(retrieval, "_PAYLOAD_UPGRADES", dict(retrieval._PAYLOAD_UPGRADES))
+    clear_memory_cache()
+
+    # No known migration from v1: the old pack is not served.
+    missing = build_weather_brief(intake, None, cache_dir=cache_dir, cache_samples_dir=cache_dir + "/s")
+    assert missing["event_summary"] != "v1"
+
+    @register_payload_upgrade("weather", 1)
+    def _add_version(payload):
+        return {**payload, "payload_version": 2}
+
+    brief = build_weather_brief(intake, None, cache_dir=cache_dir, cache_samples_dir=cache_dir + "/s")
+    assert brief == {"module": "weather", "event_summary": "v1", "payload_version": 2}
+    assert _weather_keys(intake)[2].endswith("_a2")
+
+
+class _FlakyClient:
+    def __init__(self, *errors: BaseException) -> None:
+        self.errors = list(errors)
+        self.calls = 0
+
+    def search(self, query, **kwargs):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return []
+
+
+def test_failed_and_empty_queries_are_negative_cached(tmp_path) -> None:
+    query = _specs(1)[0]
+    client = _FlakyClient(BudgetExhausted("out"), ValueError("status code 503"))
+
+    def _run() -> list:
+        return run_queries(client, [query], cache_dir=tmp_path, cache_samples_dir=tmp_path / "s", ttl=3600)
+
+    # Budget exhaustion says nothing about the query: not remembered.
+    with pytest.raises(BudgetExhausted):
+        _run()
+    with pytest.raises(ValueError):
+        _run()
+    # The provider failure is, briefly: no second call to Exa.
+    with pytest.raises(CachedFailure, match="error"):
+        _run()
+    assert client.calls == 2
+
+    entry = cache_get_entry(query_cache_key(query), tmp_path)
+    os.utime(next(tmp_path.rglob("query_*.json")), (entry.fetched_at - 3600,) * 2)
+    clear_memory_cache()
+    assert _run() == []
+    assert _run() == []
+    assert client.calls == 3
+    assert cache_get_entry(query_cache_key(query), tmp_path).negative.reason == "empty"
@@ -0,0 +1,175 @@
+"""Tests for retry policy and circuit breaker - no network calls."""
+
+import random
+from unittest.mock import patch
+
+import pytest
+
+from war_room.exa_client import ExaClient
+from war_room.retry_policy import (
+    CircuitBreaker,
+    CircuitOpenError,
+    RetryPolicy,
+    RetryStats,
+    call_with_retry,
+    error_status_code,
+    retry_after_seconds,
+)
+
+
+def _failing(*errors, result="ok"):
+    calls = {"count": 0}
+
+    def fn():
+        calls["count"] += 1
+        if calls["count"] <= len(errors):
+            raise errors[calls["count"] - 1]
+        return result
+
+    return fn, calls
+
+
+def test_status_and_retry_after_parsed_from_exa_errors() -> None:
+    exc = ValueError('Request failed with status code 429: {"retry_after": 7}')
+    assert error_status_code(exc) == 429
+    assert retry_after_seconds(exc) == 7.0
+    assert error_status_code(ConnectionError("reset")) is None
+
+
+def test_client_errors_are_not_retried() -> None:
+    fn, calls = _failing(ValueError("Request failed with status code 401: bad key"))
+    stats = RetryStats()
+
+    with pytest.raises(ValueError):
+        call_with_retry(fn, stats=stats, sleep=lambda _: None)
+
+    assert calls["count"] == 1
+    assert stats.failures == 1
+    assert stats.retries == 0
+
+
+def test_only_transient_errors_are_retryable() -> None:
+    policy = RetryPolicy()
+    assert policy.is_retryable(ConnectionError("reset"))
+    assert policy.is_retryable(TimeoutError("read timed out"))
+    assert policy.is_retryable(ValueError("Request failed with status code 502: bad gateway"))
+    assert not policy.is_retryable(ValueError("Request failed with status code 404: not found"))
+    for bug in (TypeError("bad operand"), AttributeError("no results"), KeyError("id"), Exception("?")):
+        assert not policy.is_retryable(bug)
+
+
+def test_programming_errors_fail_fast_without_tripping_the_breaker() -> None:
+    fn, calls = _failing(*[AttributeError("'NoneType' object has no attribute 'results'")] * 3)
+    breaker = CircuitBreaker(failure_threshold=1)
+    slept = []
+
+    with pytest.raises(AttributeError):
+        call_with_retry(fn, breaker=breaker, sleep=slept.append)
+
+    assert calls["count"] == 1
+    assert slept == []
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_decorrelated_jitter_stays_within_bounds_and_honors_retry_after() -> None:
+    policy = RetryPolicy(base_delay=0.5, max_delay=4.0, max_retry_after=10.0)
+    rng = random.Random(7)
+    delay = policy.base_delay
+    for _ in range(20):
+        delay = policy.next_delay(delay, ConnectionError("reset"), rng)
+        assert 0.5 <= delay <= 4.0
+
+    hinted = ValueError("Request failed with status code 429: Retry-After: 9")
+    assert policy.next_delay(0.5, hinted, rng) == 9.0
+
+
+def test_deadline_stops_retrying_early() -> None:
+    fn, calls = _failing(*[ConnectionError("reset")] * 5)
+    policy = RetryPolicy(max_attempts=5, base_delay=2.0, max_delay=2.0, deadline=1.0)
+    slept = []
+
+    with pytest.raises(ConnectionError):
+        call_with_retry(fn, policy=policy, sleep=slept.append)
+
+    assert calls["count"] == 1
+    assert slept == []
+
+
+def test_retries_transient_errors_then_succeeds() -> None:
+    fn, calls = _failing(ConnectionError("reset"), ValueError("Request failed with status code 503: x"))
+    stats = RetryStats()
+    slept = []
+
+    assert call_with_retry(fn, stats=stats, sleep=slept.append) == "ok"
+    assert calls["count"] == 3
+    assert len(slept) == 2
+    assert stats.as_dict()["retries"] == 2
+    assert stats.errors_by_type == {"ConnectionError": 1, "ValueError": 1}
+
+
+def test_circuit_breaker_opens_half_opens_and_closes() -> None:
+    now = [0.0]
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=lambda: now[0])
+
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    now[0] = 11.0
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()  # only one trial at a time
+
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert [t["to"] for t in breaker.transitions] == ["open", "half_open", "closed"]
+
+
+@patch("war_room.exa_client.Exa")
+def test_open_breaker_fails_fast_and_builders_degrade(MockExa, tmp_path) -> None:
+    from war_room.query_plan import CaseIntake
+    from war_room.weather_module import build_weather_brief
+
+    MockExa.return_value.search.side_effect = ConnectionError("provider down")
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=60)
+    client = ExaClient(
+        api_key="test-key",
+        retry_policy=RetryPolicy(max_attempts=1),
+        circuit_breaker=breaker,
+    )
+
+    with pytest.raises(ConnectionError):
+        client.search("q1")
+    with pytest.raises(CircuitOpenError):
+        client.search("q2")
+    assert MockExa.return_value.search.call_count == 1
+    assert client.retry_stats.short_circuited == 1
+    assert client.budget_remaining == client.max_search_calls
+
+    intake = CaseIntake(
+        event_name="Hurricane Milton",
+        event_date="2024-10-09",
+        state="FL",
+        county="Pinellas",
+        carrier="Citizens Property Insurance",
+        policy_type="HO-3 Dwelling",
+    )
+    cache_dir = str(tmp_path)
+    brief = build_weather_brief(
+        intake, client, use_cache=True, cache_dir=cache_dir, cache_samples_dir=cache_dir,
+    )
+    assert any("circuit open" in warning for warning in brief["warnings"])
+
+
+@patch("war_room.exa_client.time.sleep")
+@patch("war_room.exa_client.Exa")
+def test_get_contents_records_failures_instead_of_hiding_them(MockExa, _sleep) -> None:
+    MockExa.return_value.get_contents.side_effect = ConnectionError("reset")
+    client = ExaClient(api_key="test-key")
+
+    assert client.get_contents(["https://example.com"]) == []
+    assert client.last_contents_error == "ConnectionError: reset"
+    assert client.retry_stats.retries == 2
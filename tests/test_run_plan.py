@@ -0,0 +1,96 @@
+"""Tests for the run plan - no network calls."""
+
+from war_room import retrieval
+from war_room.cache_io import clear_memory_cache, wait_for_refreshes
+from war_room.pipeline import run_pipeline
+from war_room.query_plan import CaseIntake, generate_query_plan
+from war_room.run_plan import RunPlan, query_id
+from war_room.weather_module import build_weather_brief
+from war_room.workspace import EventWorkspace
+
+
+def _intake(posture=("denial",)) -> CaseIntake:
+    return CaseIntake(
+        event_name="Hurricane Milton", event_date="2024-10-09", state="FL", county="Pinellas",
+        carrier="Citizens", policy_type="HO-3", posture=list(posture),
+    )
+
+
+class _FakeClient:
+    def __init__(self) -> None:
+        self.queries: list[str] = []
+
+    def search(self, query, **kwargs):
+        self.queries.append(query)
+        return [{"url": f"https://www.weather.gov/{len(query)}", "title": query, "snippet": query, "text": "Wind 120 mph"}]
+
+
+def test_query_ids_are_stable_and_unique_within_a_plan() -> None:
+    first, second = RunPlan.build(_intake()), RunPlan.build(_intake(posture=("denial", "bad_faith")))
+    assert [first.id_of(query) for query in first] == [query_id(query) for query in generate_query_plan(_intake())]
+    # Another intake's plan gives its shared queries the same ids.
+    weather_ids = [first.id_of(query) for query in first.for_module("weather")]
+    assert weather_ids == [second.id_of(query) for query in second.for_module("weather")]
+
+    query = first.queries[0]
+    repeated = RunPlan([query, query.model_copy()])
+    assert [repeated.id_of(q) for q in repeated] == [query_id(query), f"{query_id(query)}-2"]
+
+
+def test_pipeline_records_each_query_once_and_sources_on_rerun(tmp_path) -> None:
+    client = _FakeClient()
+    cache_dir = str(tmp_path)
+    kwargs = {"cache_dir": cache_dir, "cache_samples_dir": cache_dir}
+    first = run_pipeline(_intake(), client, **kwargs)
+    searches = len(client.queries)
+    second = run_pipeline(_intake(), client, **kwargs)
+
+    rows = first.run_plan.rows()
+    assert first.query_plan == first.run_plan.queries
+    assert {row["source"] for row in rows} == {"live"}
+    assert all(row["hits"] == 1 and row["seconds"] >= 0 for row in rows)
+    # Planned queries ran exactly once; the rest were citation checks.
+    planned = {row["query"] for row in rows}
+    assert sorted(query for query in client.queries[:searches] if query in planned) == sorted(planned)
+
+    assert len(client.queries) == searches
+    assert second.run_plan.summary() == {"pack": len(rows)}
+    assert rows[0]["id"] in first.memo_md
+    assert "| ID | Module | Category | Query | Hits | Source | ms |" in second.memo_md
+
+
+def test_workspace_reuse_and_missing_client_are_marked(tmp_path) -> None:
+    workspace = EventWorkspace()
+    cache_dir = str(tmp_path)
+    kwargs = {"use_cache": False, "cache_dir": cache_dir, "cache_samples_dir": cache_dir, "workspace": workspace}
+    run_pipeline(_intake(), _FakeClient(), **kwargs)
+    reused = run_pipeline(_intake(), _FakeClient(), **kwargs)
+    offline = run_pipeline(_intake(), None, use_cache=False, cache_dir=cache_dir, cache_samples_dir=cache_dir)
+
+    sources = {row["module"]: row["source"] for row in reused.run_plan.rows()}
+    assert sources["weather"] == "workspace"
+    assert sources["caselaw"] == "live"
+    assert offline.run_plan.summary() == {"skipped": len(offline.run_plan)}
+
+
+def test_background_refresh_leaves_the_run_plan_and_spent_budget_alone(tmp_path, monkeypatch) -> None:
+    kwargs = {"cache_dir": str(tmp_path), "cache_samples_dir": str(tmp_path / "s")}
+    build_weather_brief(_intake(), _FakeClient(), **kwargs)
+    monkeypatch.setitem(retrieval.MODULE_TTLS, "weather", 0)
+    clear_memory_cache()
+
+    # Stale: served at once, refreshed in the background after the "run" ends.
+    plan = RunPlan.build(_intake())
+    client = _FakeClient()
+    build_weather_brief(_intake(), client, plan=plan, **kwargs)
+    rows = plan.rows()
+    assert wait_for_refreshes(timeout=5)
+    assert client.queries
+    assert plan.rows() == rows
+
+    spent = _FakeClient()
+    spent.budget_remaining = 0
+    clear_memory_cache()
+    build_weather_brief(_intake(), spent, **kwargs)
+    assert wait_for_refreshes(timeout=5)
+    assert spent.queries == []
@@ -0,0 +1,100 @@
+"""Tests for the end-to-end `run` command - no network calls."""
+
+import json
+from pathlib import Path
+from unittest.mock import patch
+
+from war_room.bootstrap import bootstrap_runtime
+from war_room.exa_client import ExaClient
+from war_room.fake_exa import FakeExaCorpus, FakeExaServer
+from war_room.query_plan import CaseIntake
+from war_room.runner import main, run_intake, write_run_record
+
+
+def _bootstrap(tmp_path: Path):
+    env_file = tmp_path / ".env"
+    env_file.write_text(
+        "\n".join(
+            [
+                "CACHE_DIR=.runtime/cache",
+                "CACHE_SAMPLES_DIR=.runtime/cache_samples",
+                "OUTPUT_DIR=.runtime/output",
+                "RUNS_DIR=.runtime/runs",
+            ]
+        ),
+        encoding="utf-8",
+    )
+    (tmp_path / "pyproject.toml").write_text("[project]\nname='test'\nversion='0.0.0'\n", encoding="utf-8")
+    return bootstrap_runtime(start_path=tmp_path, env_file=env_file)
+
+
+def _intake() -> CaseIntake:
+    return CaseIntake(
+        event_name="Hurricane Milton", event_date="2024-10-09", state="FL", county="Pinellas",
+        carrier="Citizens", policy_type="HO-3", posture=["denial"],
+    )
+
+
+_DOCS = [
+    {"id": f"https://www.noaa.gov/milton/{i}", "url": f"https://www.noaa.gov/milton/{i}",
+     "title": f"NOAA {i}", "text": f"Milton gusts {100 + i} mph"}
+    for i in range(3)
+]
+
+
+def test_run_intake_writes_memo_and_record(tmp_path: Path) -> None:
+    settings = _bootstrap(tmp_path).settings
+    with FakeExaServer(FakeExaCorpus(docs=_DOCS)) as server:
+        client = ExaClient(api_key="test-key", base_url=server.base_url, max_search_calls=50)
+        record = run_intake(_intake(), client, settings=settings, case_key="milton")
+
+        assert record["status"] == "ok"
+        assert record["mode"] == "live"
+        assert Path(record["memo_path"]).parent == settings.output_dir
+        assert list(record["stages"]) == ["query_plan", "weather", "carrier", "caselaw", "citecheck", "render", "write"]
+        assert record["totals"]["exa_searches"] == client.search_count == server.stats()["search"]
+        assert record["totals"]["exa_bytes"] > 0
+        assert record["stages"]["render"]["exa_searches"] == 0
+        assert record["exa"]["budget_remaining"] == 50 - client.search_count
+
+        # A rerun answers every module from the runtime cache.
+        rerun_client = ExaClient(api_key="test-key", base_url=server.base_url)
+        rerun = run_intake(_intake(), rerun_client, settings=settings, case_key="milton")
+    assert rerun["totals"]["exa_searches"] == 0
+    assert rerun["totals"]["cache_fresh"] >= 3
+    assert rerun["run_id"] != record["run_id"]
+
+    path = write_run_record(settings.runs_dir, record)
+    assert json.loads(path.read_text(encoding="utf-8"))["run_id"] == record["run_id"]
+
+
+def test_failed_run_still_records_completed_stages(tmp_path: Path) -> None:
+    settings = _bootstrap(tmp_path).settings
+    with patch("war_room.pipeline.render_markdown_memo", side_effect=RuntimeError("template broke")):
+        record = run_intake(_intake(), None, settings=settings, case_key="milton")
+
+    assert record["status"] == "error"
+    assert record["error"] == "RuntimeError: template broke"
+    assert record["memo_path"] is None
+    assert record["stages"]["render"]["error"] == "RuntimeError"
+    assert "write" not in record["stages"]
+
+
+def test_cli_runs_offline_and_rejects_bad_intakes(tmp_path: Path, capsys) -> None:
+    context = _bootstrap(tmp_path)
+    intake_path = tmp_path / "Milton Claim.json"
+    intake_path.write_text(_intake().model_dump_json(), encoding="utf-8")
+
+    with patch("war_room.bootstrap.bootstrap_runtime", return_value=context):
+        assert main([str(intake_path), "--offline"]) == 0
+        records = list(context.settings.runs_dir.glob("*.json"))
+        assert len(records) == 1
+        record = json.loads(records[0].read_text(encoding="utf-8"))
+        assert record["case_key"] == "milton_claim"
+        assert record["mode"] == "offline"
+        assert record["intake_path"] == str(intake_path)
+        assert "ok:" in capsys.readouterr().out
+
+        intake_path.write_text(json.dumps({"event_name": "Hurricane Milton"}), encoding="utf-8")
+        assert main([str(intake_path)]) == 2
+        assert len(list(context.settings.runs_dir.glob("*.json"))) == 1
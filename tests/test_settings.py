@@ -40,3 +40,15 @@ def test_invalid_boolean_rejected(tmp_path: Path):
 
     with pytest.raises(ValueError):
         load_settings(repo_root=tmp_path, env_file=env_file)
+
+
+def test_cache_limits(tmp_path: Path):
+    env_file = tmp_path / ".env"
+    env_file.write_text("CACHE_MAX_MB=0.5\nCACHE_MAX_AGE_DAYS=30\n", encoding="utf-8")
+    settings = load_settings(repo_root=tmp_path, env_file=env_file)
+    assert settings.cache_max_bytes == 512 * 1024
+    assert settings.cache_max_age_days == 30
+
+    env_file.write_text("CACHE_MAX_MB=0\n", encoding="utf-8")
+    assert load_settings(repo_root=tmp_path, env_file=env_file).cache_max_bytes is None
+    assert load_settings(repo_root=tmp_path, env_file=tmp_path / "missing.env").cache_max_bytes == 1024**3
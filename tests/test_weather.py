@@ -1,5 +1,6 @@
 ﻿"""Tests for weather_module - no network calls, uses mock/cache."""
 
+import copy
 import tempfile
 from pathlib import Path
 
@@ -86,3 +87,19 @@ def test_build_weather_brief_without_client_returns_structured_fallback() -> Non
     assert brief["key_observations"] == []
     assert "warnings" in brief
     assert any("No Exa client available" in warning for warning in brief["warnings"])
+
+
+def test_editing_a_returned_brief_does_not_change_the_next_one(tmp_path: Path) -> None:
+    class _Client:
+        def search(self, query, **kwargs):
+            return [{"url": "https://www.weather.gov/milton", "title": query, "text": "Wind 120 mph"}]
+
+    kwargs = {"cache_dir": str(tmp_path), "cache_samples_dir": str(tmp_path / "samples")}
+    build_weather_brief(_sample_intake(), _Client(), **kwargs)
+    # Read back from disk; this read also fills the memory cache.
+    brief = build_weather_brief(_sample_intake(), None, **kwargs)
+    expected = copy.deepcopy(brief)
+    brief["sources"].clear()
+    brief["metrics"]["edited"] = True
+
+    assert build_weather_brief(_sample_intake(), None, **kwargs) == expected
@@ -0,0 +1,112 @@
+"""Tests for the event workspace - no network calls."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from war_room.pipeline import run_pipeline
+from war_room.query_plan import CaseIntake
+from war_room.retry_policy import CircuitOpenError
+from war_room.workspace import EventWorkspace, carrier_scope, weather_scope
+
+
+def _claimant(policy_type: str = "HO-3", posture=("denial",), facts=()) -> CaseIntake:
+    return CaseIntake(
+        event_name="Hurricane Milton", event_date="2024-10-09", state="FL", county="Pinellas",
+        carrier="Citizens", policy_type=policy_type, posture=list(posture), key_facts=list(facts),
+    )
+
+
+class _CountingClient:
+    def __init__(self, delay: float = 0.0) -> None:
+        self._lock = threading.Lock()
+        self.delay = delay
+        self.queries: list[str] = []
+
+    def search(self, query, **kwargs):
+        with self._lock:
+            self.queries.append(query)
+        time.sleep(self.delay)
+        return [{"url": f"https://www.weather.gov/{len(query)}", "title": query, "snippet": query, "text": "Wind 120 mph"}]
+
+
+def test_claimants_share_event_and_carrier_evidence(tmp_path) -> None:
+    client = _CountingClient()
+    workspace = EventWorkspace()
+    claimants = [
+        _claimant(facts=["Roof damage within 48 hours"]),
+        _claimant(posture=("denial", "bad_faith")),
+        _claimant(policy_type="DP-3"),
+    ]
+    cache_dir = str(tmp_path)
+    results = [
+        run_pipeline(intake, client, use_cache=False, cache_dir=cache_dir, cache_samples_dir=cache_dir, workspace=workspace)
+        for intake in claimants
+    ]
+
+    assert weather_scope(claimants[0]) == weather_scope(claimants[2])
+    assert carrier_scope(claimants[0]) == carrier_scope(claimants[2])
+    # Weather once; carrier once, except the claims-manual search per policy type.
+    assert sum("wind speed" in query for query in client.queries) == 1
+    assert sum("department of insurance complaints" in query for query in client.queries) == 1
+    assert sum("claims handling guidelines" in query for query in client.queries) == 2
+    # Caselaw stays per claimant.
+    assert sum("concurrent causation" in query for query in client.queries) == 3
+
+    assert results[0].weather == results[1].weather == results[2].weather
+    assert results[0].carrier != results[1].carrier
+    assert results[1].stages["weather"]["workspace_reused"] == 1
+    assert results[1].stages["carrier"]["workspace_reused"] == 5
+    assert results[1].stages["caselaw"]["workspace_reused"] == 0
+    stats = workspace.stats()
+    assert (stats["weather_scopes"], stats["carrier_scopes"]) == (1, 1)
+    assert stats["weather"] == {"built": 1, "reused": 2}
+    assert stats["carrier_search"] == {"built": 6, "reused": 9}
+
+
+def test_concurrent_claimants_wait_for_one_fetch(tmp_path) -> None:
+    client = _CountingClient(delay=0.02)
+    workspace = EventWorkspace()
+    cache_dir = str(tmp_path)
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        briefs = list(pool.map(
+            lambda _: workspace.weather_brief(
+                _claimant(), client, use_cache=False, cache_dir=cache_dir, cache_samples_dir=cache_dir
+            ),
+            range(4),
+        ))
+
+    assert len(client.queries) == 5
+    assert all(brief == briefs[0] for brief in briefs)
+    assert workspace.stats()["weather"] == {"built": 1, "reused": 3}
+
+
+class _OpenCircuitClient:
+    def search(self, query, **kwargs):
+        raise CircuitOpenError("circuit open")
+
+
+def test_fallback_briefs_are_not_shared_with_later_claimants(tmp_path) -> None:
+    workspace = EventWorkspace()
+    client = _CountingClient()
+    cache_dir = str(tmp_path)
+    kwargs = {"use_cache": False, "cache_dir": cache_dir, "cache_samples_dir": cache_dir}
+    down = workspace.weather_brief(_claimant(), _OpenCircuitClient(), **kwargs)
+    workspace.carrier_pack(_claimant(), _OpenCircuitClient(), **kwargs)
+    brief = workspace.weather_brief(_claimant(), client, **kwargs)
+    pack = workspace.carrier_pack(_claimant(), client, **kwargs)
+
+    assert down["warnings"] and not down["sources"]
+    assert not brief.get("warnings") and brief["sources"]
+    assert pack["sources"]
+    assert sum("wind speed" in query for query in client.queries) == 1
+    assert sum("department of insurance complaints" in query for query in client.queries) == 1
+    assert workspace.stats()["weather"] == {"built": 1, "reused": 0}
+
+
+def test_without_a_client_nothing_is_fetched(tmp_path) -> None:
+    workspace = EventWorkspace()
+    cache_dir = str(tmp_path)
+    pack = workspace.carrier_pack(_claimant(), None, use_cache=False, cache_dir=cache_dir, cache_samples_dir=cache_dir)
+    assert pack["module"] == "carrier"
+    assert "carrier_search" not in workspace.stats()